@@ -0,0 +1,71 @@
+# agent/citations.py
+"""
+Corpus-derived citation index.
+
+`CitationIndex` knows which articles, paragraphs and points actually exist
+in the regulation. The citation grammar itself (parse_citations and
+friends) lives in retrieval/citations.py.
+"""
+import os
+from functools import lru_cache
+from typing import Iterable, Set, get_args
+
+from agent.schemas import GDPR_SUBSECTIONS
+from retrieval.citations import clause_citation_tokens, normalize_subsection, split_subsection
+from retrieval.corpus import load_corpus
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CORPUS_PATH = os.path.join(PROJECT_ROOT, "data", "processed", "gdpr_corpus.bin")
+DEFAULT_CLAUSES_PATH = os.path.join(PROJECT_ROOT, "data", "processed", "gdpr_clauses.jsonl")
+
+
+class CitationIndex:
+    """
+    Precomputed lookup of the articles, paragraphs and points that exist in
+    the structured corpus (plus the schema whitelist).
+
+    Only articles with numbered paragraphs in the corpus (`structured`) can
+    prove a subsection absent. Articles whose parts are not numbered
+    paragraphs, such as the Article 4 definitions '(1)'..'(26)', accept any
+    subsection token.
+    """
+    def __init__(self, tokens: Iterable[str], articles: Iterable[str], built_from_corpus: bool = False,
+                 structured: Iterable[str] = ()):
+        self.valid = frozenset(tokens)
+        self.articles = frozenset(articles)
+        self.structured = frozenset(structured)
+        self.built_from_corpus = built_from_corpus
+
+    @classmethod
+    def from_corpus(cls, data_path: str = DEFAULT_CORPUS_PATH) -> "CitationIndex":
+        whitelist = set(get_args(GDPR_SUBSECTIONS))
+        try:
+            corpus = load_corpus(data_path, source=DEFAULT_CLAUSES_PATH)
+        except FileNotFoundError:
+            return cls(whitelist, {t.split("(")[0] for t in whitelist})
+
+        tokens, articles, structured = set(whitelist), set(corpus.article_ids), set()
+        for _, clause in corpus.items(title_in_text=False):
+            paragraph_tokens = clause_citation_tokens(clause["article_id"], clause["clause_id"], clause["text"])
+            if paragraph_tokens:
+                structured.add(clause["article_id"])
+                tokens.update(paragraph_tokens)
+        return cls(tokens, articles, built_from_corpus=True, structured=structured)
+
+    def is_valid(self, token: str) -> bool:
+        parts = split_subsection(token)
+        if not parts:
+            return token.strip() in self.articles
+        if normalize_subsection(*parts) in self.valid:
+            return True
+        # Known article without numbered paragraphs in the corpus: absence cannot be shown
+        art_id = str(int(parts[0]))
+        return art_id in self.articles and art_id not in self.structured
+
+    def unknown(self, tokens: Iterable[str]) -> Set[str]:
+        return {t for t in tokens if split_subsection(t) and not self.is_valid(t)}
+
+
+@lru_cache(maxsize=4)
+def get_citation_index(data_path: str = DEFAULT_CORPUS_PATH) -> CitationIndex:
+    return CitationIndex.from_corpus(data_path)
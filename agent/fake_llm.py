@@ -0,0 +1,166 @@
+# agent/fake_llm.py
+"""
+Offline stand-in LLM provider (LLM_PROVIDER=fake).
+
+Mimics the Groq/OpenAI client surface used by the analyst
+(`client.chat.completions.create(...)`, with or without an instructor
+`response_model`) and returns schema-valid instances of any pydantic model,
+grounded in the articles present in the prompt. Latency, 429/5xx rates and
+the validation-failure rate are configurable and seeded, so throughput and
+failover can be measured without network access. A separate rate returns
+schema-valid responses that break the analyst's rules (an empty or
+hallucinated reasoning_map), which exercises validation and repair.
+"""
+import os
+import re
+import math
+import time
+import random
+import threading
+import types
+import typing
+from enum import Enum
+from typing import List, Optional
+from pydantic import BaseModel
+
+ARTICLE_RE = re.compile(r"\bArticle\s+(\d+)", re.IGNORECASE)
+QUERY_RE = re.compile(r"QUERY:\s*(.+)", re.DOTALL)
+
+
+class FakeProfile(BaseModel):
+    latency_ms: float = 200.0     # median latency
+    latency_sigma: float = 0.3    # lognormal spread (0 = constant latency)
+    rate_429: float = 0.0
+    rate_5xx: float = 0.0
+    invalid_rate: float = 0.0     # share of structured calls failing schema validation
+    rule_violation_rate: float = 0.0  # share of reasoning_map responses that are valid but break the rules
+    seed: int = 42
+
+    @classmethod
+    def from_env(cls) -> "FakeProfile":
+        return cls(
+            latency_ms=float(os.getenv("FAKE_LLM_LATENCY_MS", "200")),
+            latency_sigma=float(os.getenv("FAKE_LLM_LATENCY_SIGMA", "0.3")),
+            rate_429=float(os.getenv("FAKE_LLM_429_RATE", "0")),
+            rate_5xx=float(os.getenv("FAKE_LLM_5XX_RATE", "0")),
+            invalid_rate=float(os.getenv("FAKE_LLM_INVALID_RATE", "0")),
+            rule_violation_rate=float(os.getenv("FAKE_LLM_RULE_VIOLATION_RATE", "0")),
+            seed=int(os.getenv("FAKE_LLM_SEED", "42")),
+        )
+
+
+def fake_keys() -> List[str]:
+    """Pseudo keys for the key pool (FAKE_LLM_KEYS=n simulates n accounts)."""
+    return [f"fake-key-{i + 1}" for i in range(int(os.getenv("FAKE_LLM_KEYS", "1")))]
+
+
+def _prompt_facts(messages: List[dict]) -> dict:
+    text = "\n".join(m.get("content", "") for m in messages)
+    articles = list(dict.fromkeys(ARTICLE_RE.findall(text))) or ["5"]
+    query = QUERY_RE.search(text)
+    return {"articles": articles, "query": (query.group(1) if query else messages[-1].get("content", "")).strip()[:120]}
+
+
+def _field_value(name: str, annotation, facts: dict):
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    art = facts["articles"][0]
+
+    if origin in (typing.Union, types.UnionType):
+        non_none = [a for a in args if a is not type(None)]
+        return _field_value(name, non_none[0], facts)
+    if origin is typing.Literal:
+        return args[0]
+    if origin in (list, List):
+        item = args[0] if args else str
+        if isinstance(item, type) and issubclass(item, BaseModel):
+            return [build_instance(item, facts)]
+        return list(facts["articles"]) if name == "references" else []
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return list(annotation)[0]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return build_instance(annotation, facts)
+    if annotation is float:
+        return 0.9
+    if annotation is int:
+        return 1
+    if annotation is bool:
+        return False
+
+    # Strings: grounded in the first article of the prompt context
+    if "subsection" in name:
+        return f"{art}(1)"
+    if name == "legal_basis":
+        return ", ".join(f"Article {a}" for a in facts["articles"][:3])
+    if name == "scope_limitation":
+        return "N/A"
+    return f"Per Article {art}, offline {name.replace('_', ' ')} for: {facts['query']}"
+
+
+def build_instance(model_cls, facts: dict):
+    """Schema-valid instance of `model_cls` with every field populated."""
+    values = {
+        name: _field_value(name, field.annotation, facts)
+        for name, field in model_cls.model_fields.items()
+    }
+    return model_cls.model_validate(values)
+
+
+def violate_rules(instance, empty_map: bool):
+    """
+    Schema-valid copy of `instance` that fails the analyst's validation:
+    an empty reasoning_map (rule 0a) or one mapped to 83(2)(h) (rule 0e-h).
+    """
+    values = instance.model_dump()
+    if empty_map:
+        values["reasoning_map"] = []
+    else:
+        for entry in values["reasoning_map"]:
+            entry["gdpr_subsection"] = "83(2)(h)"
+    return type(instance).model_validate(values)
+
+
+class FakeLLMClient:
+    """
+    One fake account. Exposes client.chat.completions.create like Groq/OpenAI;
+    the same object serves as both the base and the instructor client.
+    """
+    def __init__(self, profile: FakeProfile, key: str = "fake-key-1"):
+        self.profile = profile
+        self._rng = random.Random(f"{profile.seed}:{key}")
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=self.create))
+
+    def _draw(self):
+        with self._lock:
+            self.calls += 1
+            latency = self.profile.latency_ms * math.exp(self.profile.latency_sigma * self._rng.gauss(0, 1))
+            return latency / 1000.0, self._rng.random()
+
+    def create(self, messages, model: str, temperature: float = 0, response_model=None, max_tokens: Optional[int] = None, **kwargs):
+        latency_s, roll = self._draw()
+        time.sleep(latency_s)
+
+        p = self.profile
+        if roll < p.rate_429:
+            raise RuntimeError(f"Error code: 429 - Rate limit reached for model `{model}`. Please try again in 1.5s.")
+        if roll < p.rate_429 + p.rate_5xx:
+            raise RuntimeError(f"Error code: 503 - Service unavailable for model `{model}`.")
+
+        facts = _prompt_facts(messages)
+        if response_model is None:
+            content = f"Offline response from {model} for: {facts['query']}"
+            prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 4
+            return types.SimpleNamespace(
+                choices=[types.SimpleNamespace(message=types.SimpleNamespace(content=content))],
+                usage=types.SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=len(content) // 4,
+                                            total_tokens=prompt_tokens + len(content) // 4),
+            )
+        failed = p.rate_429 + p.rate_5xx + p.invalid_rate
+        if roll < failed:
+            raise RuntimeError(f"1 validation error for {response_model.__name__}: tool call validation failed (simulated)")
+        instance = build_instance(response_model, facts)
+        if roll < failed + p.rule_violation_rate and "reasoning_map" in response_model.model_fields:
+            return violate_rules(instance, empty_map=roll < failed + p.rule_violation_rate / 2)
+        return instance
@@ -0,0 +1,194 @@
+# agent/fda_pipeline.py
+"""
+Concurrent multi-source retrieval for the FDA domain.
+
+One query fans out to several Tavily query variants, a local FDA corpus (if
+one has been ingested) and parallel fetch + extraction of the top web hits.
+Everything shares a single deadline; whatever has arrived by then is merged,
+deduplicated by URL and content, and handed to generation.
+"""
+import os
+import re
+import json
+import time
+import hashlib
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, List, Optional
+from rank_bm25 import BM25Okapi
+
+from agent.researcher import fetch_and_extract
+from agent.logging_setup import get_logger
+
+FDA_CORPUS_PATH = os.getenv("FDA_CORPUS_PATH", "data/processed/fda_structured.json")
+FDA_DEADLINE_S = float(os.getenv("FDA_DEADLINE_S", "8"))
+
+log = get_logger("fda")
+
+# (prefix, label) per Tavily variant
+QUERY_VARIANTS = [
+    ("legal lawsuit court case", "lawsuits"),
+    ("FDA warning letter enforcement action", "enforcement"),
+    ("FDA regulation 21 CFR guidance", "regulation"),
+]
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def _tokens(text: str) -> List[str]:
+    return WORD_RE.findall(text.lower())
+
+
+def _url_key(url: str) -> str:
+    return re.sub(r"^https?://(www\.)?", "", url.split("#")[0]).rstrip("/").lower()
+
+
+def _text_key(text: str) -> str:
+    return hashlib.sha1(" ".join(_tokens(text)[:60]).encode("utf-8")).hexdigest()
+
+
+class LocalFDACorpus:
+    """
+    BM25 over a locally ingested FDA LegalDocument JSON (articles -> clauses).
+    """
+    def __init__(self, path: str = FDA_CORPUS_PATH):
+        self.entries = []
+        self.vocab = []
+        self.bm25 = None
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            doc = json.load(f)
+        for article in doc.get('articles', []):
+            for clause in article.get('clauses', []):
+                self.entries.append({
+                    "title": f"{doc.get('title', 'FDA')} - {article['title']}",
+                    "source": f"Local: {article['article_id']}",
+                    "text": clause['text'],
+                })
+        if self.entries:
+            corpus = [_tokens(e['title'] + " " + e['text']) for e in self.entries]
+            self.vocab = [set(toks) for toks in corpus]
+            self.bm25 = BM25Okapi(corpus)
+
+    def search(self, query: str, k: int = 5) -> List[dict]:
+        if not self.bm25:
+            return []
+        terms = _tokens(query)
+        scores = self.bm25.get_scores(terms)
+        # BM25 idf goes negative on tiny corpora, so require term overlap instead of score > 0
+        matching = [i for i in range(len(scores)) if self.vocab[i].intersection(t for t in terms if len(t) > 2)]
+        best = sorted(matching, key=lambda i: scores[i], reverse=True)[:k]
+        return [self.entries[i] for i in best]
+
+
+@lru_cache(maxsize=4)
+def get_local_corpus(path: str = FDA_CORPUS_PATH) -> LocalFDACorpus:
+    # Agents are built per request; load and index the corpus once per process
+    return LocalFDACorpus(path)
+
+
+class FDARetriever:
+    def __init__(self, searcher=None, corpus: Optional[LocalFDACorpus] = None,
+                 fetcher: Callable[[str], Optional[str]] = fetch_and_extract,
+                 deadline_s: float = FDA_DEADLINE_S, fetch_top: int = 3,
+                 max_results: int = 5, max_workers: int = 8):
+        """
+        searcher: LawsuitSearcher (None or without client = local corpus only).
+        fetcher: url -> extracted text; injected so tests can run offline.
+        """
+        self.searcher = searcher if searcher is not None and searcher.client else None
+        self.corpus = corpus if corpus is not None else get_local_corpus()
+        self.fetcher = fetcher
+        self.deadline_s = deadline_s
+        self.fetch_top = fetch_top
+        self.max_results = max_results
+        self.max_workers = max_workers
+
+    @property
+    def has_sources(self) -> bool:
+        return self.searcher is not None or bool(self.corpus.entries)
+
+    def retrieve(self, query: str) -> str:
+        """
+        Returns the merged context for generation ('' if nothing arrived in time).
+        """
+        started = time.perf_counter()
+        deadline = started + self.deadline_s
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        pending = {}
+        local_hits, answers, web_hits, pages = [], [], [], {}
+        queued_urls = set()
+
+        if self.corpus.entries:
+            pending[pool.submit(self.corpus.search, query)] = ("local", None)
+        if self.searcher:
+            for prefix, label in QUERY_VARIANTS:
+                future = pool.submit(self.searcher.search, query, self.max_results, prefix)
+                pending[future] = ("search", label)
+
+        try:
+            while pending:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, payload = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        log.warning("fda_source_failed", extra={"source": kind, "error": str(e)[:500]})
+                        continue
+
+                    if kind == "local":
+                        local_hits = result
+                    elif kind == "search":
+                        if result.get('answer'):
+                            answers.append(result['answer'])
+                        for res in result.get('results', []):
+                            web_hits.append(res)
+                        # Start fetching new top URLs as soon as a variant returns
+                        for res in sorted(result.get('results', []), key=lambda r: r.get('score', 0), reverse=True)[:self.fetch_top]:
+                            key = _url_key(res['url'])
+                            if key not in queued_urls:
+                                queued_urls.add(key)
+                                pending[pool.submit(self.fetcher, res['url'])] = ("fetch", key)
+                    elif kind == "fetch" and result:
+                        pages[payload] = result
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        if pending:
+            log.warning("fda_deadline", extra={"deadline_s": self.deadline_s, "outstanding": len(pending)})
+        log.info("fda_sources_merged", extra={"elapsed_s": round(time.perf_counter() - started, 4), "local_hits": len(local_hits),
+                                              "web_hits": len(web_hits), "pages": len(pages)})
+        return self._merge(local_hits, answers, web_hits, pages)
+
+    def _merge(self, local_hits, answers, web_hits, pages) -> str:
+        context, seen_urls, seen_text = [], set(), set()
+
+        if answers:
+            context.append(f"**AI Overview:** {answers[0]}")
+
+        for hit in local_hits:
+            key = _text_key(hit['text'])
+            if key in seen_text:
+                continue
+            seen_text.add(key)
+            context.append(f"- **{hit['title']}** ({hit['source']}): {hit['text']}")
+
+        for res in sorted(web_hits, key=lambda r: r.get('score', 0), reverse=True):
+            url_key = _url_key(res['url'])
+            if url_key in seen_urls:
+                continue
+            seen_urls.add(url_key)
+            body = pages.get(url_key) or res.get('content', '')
+            text_key = _text_key(body)
+            if text_key in seen_text:
+                continue
+            seen_text.add(text_key)
+            limit = 1500 if url_key in pages else 300
+            context.append(f"- **{res['title']}**: {body[:limit]}... [Source]({res['url']})")
+
+        return "\n\n".join(context)
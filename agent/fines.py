@@ -0,0 +1,277 @@
+# agent/fines.py
+"""
+Deterministic Article 83 fine-tier engine.
+
+Maps the obligations infringed in a query to the Art 83(4)/(5)/(6) caps and
+enumerates the Art 83(2) factors supported by the query's own facts, so the
+LLM only has to narrate a pre-computed assessment.
+"""
+import re
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+from agent.schemas import ReasoningMapEntry, RiskLevel
+
+# --- FINE TIERS (Art 83(4)-(6)) ---
+TIER_CAPS = {
+    "83(4)": "up to EUR 10 000 000, or in the case of an undertaking, up to 2 % of the total worldwide annual turnover of the preceding financial year, whichever is higher",
+    "83(5)": "up to EUR 20 000 000, or in the case of an undertaking, up to 4 % of the total worldwide annual turnover of the preceding financial year, whichever is higher",
+    "83(6)": "up to EUR 20 000 000, or in the case of an undertaking, up to 4 % of the total worldwide annual turnover of the preceding financial year, whichever is higher",
+}
+
+# Gravity order used when several provisions are infringed (Art 83(3)).
+TIER_RANK = {"83(4)": 1, "83(5)": 2, "83(6)": 3}
+
+# Exposure per tier: the 4 % tiers are high risk, the 2 % tier medium.
+TIER_RISK = {"83(4)": RiskLevel.MEDIUM, "83(5)": RiskLevel.HIGH, "83(6)": RiskLevel.HIGH}
+
+# Article -> (tier point, description of the obligation group)
+ARTICLE_TIERS = {}
+for _art in [8, 11] + list(range(25, 40)):
+    ARTICLE_TIERS[str(_art)] = ("83(4)(a)", "obligations of the controller and processor")
+for _art in (42, 43):
+    ARTICLE_TIERS[str(_art)] = ("83(4)(b)", "obligations of the certification body")
+ARTICLE_TIERS["41"] = ("83(4)(c)", "obligations of the monitoring body")
+for _art in (5, 6, 7, 9):
+    ARTICLE_TIERS[str(_art)] = ("83(5)(a)", "basic principles for processing, including conditions for consent")
+for _art in range(12, 23):
+    ARTICLE_TIERS[str(_art)] = ("83(5)(b)", "data subjects' rights")
+for _art in range(44, 50):
+    ARTICLE_TIERS[str(_art)] = ("83(5)(c)", "transfers of personal data to a third country or international organisation")
+for _art in range(85, 92):
+    ARTICLE_TIERS[str(_art)] = ("83(5)(d)", "obligations under Member State law adopted under Chapter IX")
+ARTICLE_TIERS["58"] = ("83(6)", "non-compliance with an order by the supervisory authority")
+
+# Infringement triggers -> article. Checked in order; first hit per article wins.
+OBLIGATION_TRIGGERS = [
+    (["privacy by design", "protection by design", "by default"], "25"),
+    (["joint controller"], "26"),
+    (["processor agreement", "processor contract", "without a contract", "no contract"], "28"),
+    (["records of processing", "record of processing"], "30"),
+    (["encrypt", "security measure", "unsecured", "security", "hacked", "breach"], "32"),
+    (["notify the authority", "notified the authority late", "late notification", "72 hours"], "33"),
+    (["impact assessment", "dpia"], "35"),
+    (["data protection officer", "dpo"], "37"),
+    (["child"], "8"),
+    (["purpose limitation", "own purpose", "own marketing", "without instruction", "minimi", "storage limitation", "principle"], "5"),
+    (["lawful basis", "legal basis", "unlawful", "without basis"], "6"),
+    (["consent"], "7"),
+    (["health data", "special categor", "biometric", "genetic"], "9"),
+    (["transparen", "privacy notice"], "13"),
+    (["access request", "subject access"], "15"),
+    (["rectif"], "16"),
+    (["erasure", "erase", "forgotten", "deletion request"], "17"),
+    (["portability"], "20"),
+    (["right to object", "objection"], "21"),
+    (["automated decision", "profiling"], "22"),
+    (["transfer", "third country", "adequacy", "standard contractual"], "46"),
+    (["order of the", "ignored the order", "ignored an order", "corrective order", "ban on processing", "suspension of data flows"], "58"),
+]
+
+# Art 83(2) factors. (h) is intentionally absent: notification is mapped to
+# (c) (towards data subjects) or (f) (towards the authority), as the analyst
+# validation rules require.
+FACTOR_MEANINGS = {
+    "a": "nature, gravity and duration of the infringement",
+    "b": "intentional or negligent character of the infringement",
+    "c": "actions taken to mitigate the damage suffered by data subjects",
+    "d": "degree of responsibility given the technical and organisational measures implemented",
+    "e": "relevant previous infringements by the controller or processor",
+    "f": "degree of cooperation with the supervisory authority",
+    "g": "categories of personal data affected by the infringement",
+    "i": "compliance with measures previously ordered under Article 58(2)",
+    "j": "adherence to approved codes of conduct or certification mechanisms",
+    "k": "other aggravating or mitigating factors such as financial benefits gained",
+}
+
+FACTOR_TRIGGERS = [
+    ("f", ["authority", "regulator", "supervisory", "cooperat", "investigat"]),
+    ("c", ["informed", "data subjects", "mitigat", "remed", "compensat", "reset", "customers", "users were told"]),
+    ("b", ["intentional", "deliberate", "knowingly", "negligen", "accident", "mistake", "human error"]),
+    ("a", ["month", "year", "duration", "large scale", "thousand", "million", "records", "number of"]),
+    ("d", ["encrypt", "technical", "organisational", "organizational", "measures", "pseudonym"]),
+    ("e", ["previous", "prior infringement", "repeat", "history"]),
+    ("g", ["health", "special categor", "biometric", "genetic", "financial data", "children", "sensitive"]),
+    ("i", ["previous order", "corrective measure", "earlier order"]),
+    ("j", ["code of conduct", "certif"]),
+    ("k", ["financial benefit", "profit", "gained", "losses avoided"]),
+]
+
+CLAUSE_SPLIT_RE = re.compile(r"[.;,?!]|\band\b|\bbut\b|\bwhile\b", re.IGNORECASE)
+ARTICLE_REF_RE = re.compile(r"\b(?:Article|Art\.?)\s*(\d{1,2})\b", re.IGNORECASE)
+
+
+class FactorFinding(BaseModel):
+    factor: str = Field(..., description="Art 83(2) point letter, e.g. 'c'.")
+    fact: str = Field(..., description="Query fragment that supports the factor.")
+
+    @property
+    def subsection(self) -> str:
+        return f"83(2)({self.factor})"
+
+
+class InfringementFinding(BaseModel):
+    article_id: str
+    tier_point: str = Field(..., description="Fine tier point, e.g. '83(4)(a)' or '83(6)'.")
+    obligation: str
+    fact: str
+
+    @property
+    def tier(self) -> str:
+        return self.tier_point[:5]
+
+
+class FineAssessment(BaseModel):
+    """
+    Pre-computed Art 83 assessment for a single query.
+    """
+    infringements: List[InfringementFinding] = Field(default_factory=list)
+    factors: List[FactorFinding] = Field(default_factory=list)
+    role_note: Optional[str] = None
+
+    @property
+    def tier(self) -> Optional[str]:
+        if not self.infringements:
+            return None
+        return max((i.tier for i in self.infringements), key=TIER_RANK.get)
+
+    @property
+    def cap(self) -> Optional[str]:
+        return TIER_CAPS.get(self.tier) if self.tier else None
+
+    @property
+    def is_actionable(self) -> bool:
+        """
+        Enough deterministic signal to skip open-ended generation: an
+        infringed provision fixes the tier. Factors alone do not ((a) and (b)
+        are always listed), so general penalty questions take the retrieval path.
+        """
+        return self.tier is not None
+
+    @property
+    def confidence(self) -> float:
+        return 0.9 if self.tier else 0.8
+
+    def subsections(self) -> List[str]:
+        cited = list(dict.fromkeys(i.tier_point for i in self.infringements))
+        cited.extend(f.subsection for f in self.factors)
+        return cited
+
+    def references(self) -> List[str]:
+        return list(dict.fromkeys(["83"] + [i.article_id for i in self.infringements]))
+
+    def legal_basis(self) -> str:
+        return "GDPR " + ", ".join(f"Article {s}" for s in self.subsections())
+
+    def reasoning_map(self) -> List[ReasoningMapEntry]:
+        entries = []
+        for inf in self.infringements:
+            entries.append(ReasoningMapEntry(
+                fact=inf.fact,
+                legal_meaning=f"Infringement of Article {inf.article_id} ({inf.obligation})",
+                gdpr_subsection=inf.tier_point,
+                justification=f"Infringements of {inf.obligation} are subject to administrative fines {TIER_CAPS[inf.tier]}."
+            ))
+        for f in self.factors:
+            entries.append(ReasoningMapEntry(
+                fact=f.fact,
+                legal_meaning=FACTOR_MEANINGS[f.factor],
+                gdpr_subsection=f.subsection,
+                justification=f"Article 83(2)({f.factor}) requires due regard to the {FACTOR_MEANINGS[f.factor]}."
+            ))
+        return entries
+
+    def to_context(self) -> str:
+        """Renders the assessment as an authoritative prompt block."""
+        lines = ["PRE-COMPUTED ARTICLE 83 ASSESSMENT (authoritative - narrate, do not alter):"]
+        if self.role_note:
+            lines.append(f"- Role: {self.role_note}")
+        if self.tier:
+            lines.append(f"- Applicable tier: Article {self.tier}, {self.cap}.")
+            for inf in self.infringements:
+                lines.append(f"- Article {inf.tier_point}: infringement of Article {inf.article_id} ({inf.obligation}). Fact: \"{inf.fact}\"")
+        else:
+            lines.append("- Applicable tier: undetermined (depends on the infringed provision; 83(4) or 83(5)).")
+        for f in self.factors:
+            lines.append(f"- Article {f.subsection}: {FACTOR_MEANINGS[f.factor]}. Fact: \"{f.fact}\"")
+        return "\n".join(lines)
+
+    def render_summary(self) -> str:
+        """Deterministic narration used when the LLM narration fails validation."""
+        parts = []
+        if self.role_note:
+            parts.append(self.role_note)
+        if self.tier:
+            arts = ", ".join(f"Article {i.article_id}" for i in self.infringements)
+            parts.append(
+                f"The infringement of {arts} falls under Article {self.tier}, exposing the organisation to administrative fines {self.cap}."
+            )
+        for f in self.factors:
+            parts.append(f"'{f.fact}' is relevant under Article {f.subsection} ({FACTOR_MEANINGS[f.factor]}).")
+        parts.append(
+            "Under Article 83(2) the supervisory authority weighs these factors when deciding whether to impose a fine and its amount."
+        )
+        return " ".join(parts)
+
+    def risk_level(self) -> Optional[RiskLevel]:
+        """From the tier; None without an infringement (not assessed here)."""
+        return TIER_RISK.get(self.tier) if self.tier else None
+
+
+def _fragments(query: str) -> List[str]:
+    return [f.strip() for f in CLAUSE_SPLIT_RE.split(query) if f and len(f.strip()) > 3]
+
+
+def assess_fine(query: str) -> FineAssessment:
+    """
+    Rule-based Art 83 assessment of a penalty question.
+    """
+    fragments = _fragments(query)
+    q_lower = query.lower()
+    assessment = FineAssessment()
+
+    # Art 28(10): a processor determining its own purposes is treated as a controller.
+    if "processor" in q_lower and any(t in q_lower for t in ["own purpose", "own marketing", "without instruction"]):
+        assessment.role_note = "Under Article 28(10) a processor that determines the purposes of processing is considered a controller."
+
+    seen = set()
+    for match in ARTICLE_REF_RE.finditer(query):
+        art_id = match.group(1)
+        if art_id in ARTICLE_TIERS and art_id not in seen:
+            seen.add(art_id)
+            point, obligation = ARTICLE_TIERS[art_id]
+            assessment.infringements.append(InfringementFinding(
+                article_id=art_id, tier_point=point, obligation=obligation,
+                fact=next((f for f in fragments if match.group(0) in f), query.strip())
+            ))
+
+    for fragment in fragments:
+        f_lower = fragment.lower()
+        for triggers, art_id in OBLIGATION_TRIGGERS:
+            if art_id in seen:
+                continue
+            if any(t in f_lower for t in triggers):
+                seen.add(art_id)
+                point, obligation = ARTICLE_TIERS[art_id]
+                assessment.infringements.append(InfringementFinding(
+                    article_id=art_id, tier_point=point, obligation=obligation, fact=fragment
+                ))
+
+    found = set()
+    for fragment in fragments:
+        f_lower = fragment.lower()
+        for letter, triggers in FACTOR_TRIGGERS:
+            if letter not in found and any(t in f_lower for t in triggers):
+                found.add(letter)
+                assessment.factors.append(FactorFinding(factor=letter, fact=fragment))
+                break
+
+    # Gravity (a) and intent/negligence (b) are weighed in every case; anchor
+    # them on the infringing fact so the map always carries a multi-factor test.
+    anchor = assessment.infringements[0].fact if assessment.infringements else query.strip()
+    for letter in ("a", "b"):
+        if letter not in found:
+            assessment.factors.append(FactorFinding(factor=letter, fact=anchor))
+
+    assessment.factors.sort(key=lambda f: f.factor)
+    return assessment
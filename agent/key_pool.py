@@ -0,0 +1,123 @@
+# agent/key_pool.py
+"""
+API key pools per provider.
+
+Keys come from GROQ_API_KEYS / OPENROUTER_API_KEYS (comma-separated) plus the
+single-key variables. For each model the failover loop walks keys best-first:
+shortest scheduler wait, then lowest recent error rate, then most remaining
+token quota. Since every key has its own RPM/TPM buckets in the scheduler,
+throughput grows with the number of keys. Provider clients are built once
+per key and shared process-wide.
+"""
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from agent.scheduler import SCHEDULER, RateScheduler, key_id
+
+PROVIDER_ENV = {
+    "openrouter": ("OPENROUTER_API_KEYS", "OPENROUTER_API_KEY"),
+    "groq": ("GROQ_API_KEYS", "GROQ_API_KEY"),
+}
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+# Seconds of extra 'wait' charged per unit of error EWMA when ranking keys
+ERROR_PENALTY_S = 30.0
+
+
+def keys_from_env(provider: str) -> List[str]:
+    if provider == "fake":
+        from agent.fake_llm import fake_keys
+        return fake_keys()
+    pool_var, single_var = PROVIDER_ENV[provider]
+    keys = [k.strip() for k in os.getenv(pool_var, "").split(",") if k.strip()]
+    single = os.getenv(single_var)
+    if single and single not in keys:
+        keys.append(single)
+    return keys
+
+
+_CLIENTS: Dict[Tuple[str, str], tuple] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_clients(provider: str, api_key: str) -> tuple:
+    """
+    (base_client, instructor_client) for one key, built once per process.
+    OpenRouter keys get an OpenAI client in JSON mode; Groq keys a Groq client in TOOLS mode;
+    the offline fake provider serves both roles with one FakeLLMClient.
+    """
+    with _CLIENTS_LOCK:
+        cached = _CLIENTS.get((provider, api_key))
+        if cached:
+            return cached
+        if provider == "fake":
+            from agent.fake_llm import FakeLLMClient, FakeProfile
+            client = FakeLLMClient(FakeProfile.from_env(), key=api_key)
+            _CLIENTS[(provider, api_key)] = (client, client)
+            return client, client
+        import instructor
+        if provider == "openrouter":
+            from openai import OpenAI
+            base = OpenAI(base_url=OPENROUTER_BASE_URL, api_key=api_key)
+            clients = (base, instructor.from_openai(base, mode=instructor.Mode.JSON))
+        else:
+            from groq import Groq
+            base = Groq(api_key=api_key)
+            clients = (base, instructor.from_groq(base, mode=instructor.Mode.TOOLS))
+        _CLIENTS[(provider, api_key)] = clients
+        return clients
+
+
+class KeyPool:
+    def __init__(self, provider: str, keys: List[str], scheduler: RateScheduler = SCHEDULER, alpha: float = 0.3):
+        self.provider = provider
+        self.keys = list(dict.fromkeys(keys))
+        self.scheduler = scheduler
+        self.alpha = alpha
+        self._lock = threading.Lock()
+        self._error_ewma: Dict[str, float] = {key_id(k): 0.0 for k in self.keys}
+        self._calls: Dict[str, int] = {key_id(k): 0 for k in self.keys}
+
+    def order(self, model: str, tokens: int) -> List[str]:
+        """Keys for this model, best candidate first."""
+        def rank(key):
+            wait, headroom = self.scheduler.headroom(self.provider, model, key, tokens)
+            with self._lock:
+                errors = self._error_ewma.get(key_id(key), 0.0)
+            return (wait + errors * ERROR_PENALTY_S, errors, -headroom)
+        return sorted(self.keys, key=rank)
+
+    def record(self, api_key: str, ok: bool):
+        kid = key_id(api_key)
+        with self._lock:
+            prev = self._error_ewma.get(kid, 0.0)
+            self._error_ewma[kid] = (1 - self.alpha) * prev + self.alpha * (0.0 if ok else 1.0)
+            self._calls[kid] = self._calls.get(kid, 0) + 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                kid: {"calls": self._calls.get(kid, 0), "error_ewma": round(err, 4)}
+                for kid, err in self._error_ewma.items()
+            }
+
+
+_POOLS: Dict[str, KeyPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_key_pool(provider: str) -> Optional[KeyPool]:
+    """Process-wide pool for a provider (None if no keys are configured)."""
+    with _POOLS_LOCK:
+        if provider not in _POOLS:
+            keys = keys_from_env(provider)
+            if not keys:
+                return None
+            _POOLS[provider] = KeyPool(provider, keys)
+        return _POOLS[provider]
+
+
+def pool_stats() -> dict:
+    with _POOLS_LOCK:
+        return {provider: pool.snapshot() for provider, pool in _POOLS.items()}
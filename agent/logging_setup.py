@@ -0,0 +1,134 @@
+# agent/logging_setup.py
+"""
+Structured, non-blocking logging.
+
+Configured once per process: loggers under the 'compliance' namespace hand
+records to a QueueHandler (an in-memory enqueue on the request path) and a
+QueueListener thread formats them as JSON lines into a rotating file.
+Every record carries the request id of the request that produced it,
+stamped at enqueue time from a context variable, so one request can be
+followed across routing, retrieval, provider attempts and governance.
+
+Environment:
+    LOG_PATH=logs/compliance.jsonl   LOG_LEVEL=INFO
+    LOG_MAX_BYTES=10485760           LOG_BACKUPS=5
+    LOG_CONSOLE=0                    also mirror records to stderr
+"""
+import os
+import copy
+import json
+import queue
+import atexit
+import logging
+import threading
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+ROOT_LOGGER = "compliance"
+LOG_PATH = os.getenv("LOG_PATH", "logs/compliance.jsonl")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUPS = int(os.getenv("LOG_BACKUPS", "5"))
+LOG_CONSOLE = os.getenv("LOG_CONSOLE", "0") == "1"
+
+_REQUEST_ID: ContextVar[str] = ContextVar("request_id", default="-")
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def set_request_id(request_id: Optional[str] = None) -> str:
+    """Binds a request id to the current context (new one if not given) and returns it."""
+    request_id = request_id or new_request_id()
+    _REQUEST_ID.set(request_id)
+    return request_id
+
+
+def get_request_id() -> str:
+    return _REQUEST_ID.get()
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamps the caller's request id; must run before the record leaves the caller's thread."""
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _REQUEST_ID.get()
+        return True
+
+
+class _StructuredQueueHandler(QueueHandler):
+    """Keeps `extra` fields as attributes and renders tracebacks to text before crossing threads."""
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+_lock = threading.Lock()
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(path: str = LOG_PATH, level: str = LOG_LEVEL, console: bool = LOG_CONSOLE) -> QueueListener:
+    """Installs the queue handler and starts the background writer (idempotent)."""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return _listener
+        handlers = []
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            handlers.append(RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8"))
+        if console:
+            handlers.append(logging.StreamHandler())
+        formatter = JsonFormatter()
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        records = queue.SimpleQueue()
+        queue_handler = _StructuredQueueHandler(records)
+        queue_handler.addFilter(RequestIdFilter())
+
+        root = logging.getLogger(ROOT_LOGGER)
+        root.setLevel(level)
+        root.addHandler(queue_handler)
+        root.propagate = False
+
+        _listener = QueueListener(records, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+        return _listener
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger under the 'compliance' namespace; configures the pipeline on first use."""
+    configure_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
@@ -0,0 +1,174 @@
+# agent/metrics.py
+"""
+Minimal in-process metrics registry with Prometheus text exposition.
+
+Counters and histograms with labels, each child guarded by its own lock
+(an increment is a dict lookup plus an add), rendered on demand by the
+backend's /metrics endpoint. No external client library required.
+"""
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+DEFAULT_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0]
+TOKEN_BUCKETS = [100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List["_Metric"] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: "_Metric"):
+        with self._lock:
+            self._metrics.append(metric)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics)
+        return "".join(m.render() for m in metrics)
+
+
+REGISTRY = Registry()
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry: Registry = REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def labels(self, *values):
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _header(self) -> str:
+        return f"# HELP {self.name} {self.documentation}\n# TYPE {self.name} {self.kind}\n"
+
+    def _items(self):
+        with self._lock:
+            return list(self._children.items())
+
+
+class _CounterChild:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def value(self, *labels) -> float:
+        return self.labels(*labels).value
+
+    def render(self) -> str:
+        lines = [f"{self.name}{_label_str(self.labelnames, key)} {_fmt(child.value)}\n" for key, child in self._items()]
+        return self._header() + "".join(lines)
+
+
+class _HistogramChild:
+    def __init__(self, buckets: List[float]):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[idx] += 1
+            self.sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: List[float] = DEFAULT_BUCKETS, registry: Registry = REGISTRY):
+        self.buckets = sorted(buckets)
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def render(self) -> str:
+        lines = []
+        for key, child in self._items():
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            bounds = [_fmt(b) for b in self.buckets] + ["+Inf"]
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                le = 'le="' + bound + '"'
+                lines.append(f"{self.name}_bucket{_label_str(self.labelnames, key, le)} {cumulative}\n")
+            lines.append(f"{self.name}_sum{_label_str(self.labelnames, key)} {_fmt(total)}\n")
+            lines.append(f"{self.name}_count{_label_str(self.labelnames, key)} {cumulative}\n")
+        return self._header() + "".join(lines)
+
+
+# --- Pipeline metrics ---
+RETRIEVAL_SECONDS = Histogram("compliance_retrieval_seconds", "Hybrid search latency per call (batched calls count once).")
+RETRIEVAL_QUERIES = Counter("compliance_retrieval_queries_total", "Queries answered by hybrid search.")
+CONTEXT_TOKENS = Histogram("compliance_context_tokens", "Estimated prompt context size in tokens.", ["domain"], buckets=TOKEN_BUCKETS)
+LLM_SECONDS = Histogram(
+    "compliance_llm_request_seconds", "Provider call latency per model and failover attempt.",
+    ["provider", "model", "attempt", "outcome"]
+)
+LLM_SHED = Counter("compliance_llm_shed_total", "Calls shed by the rate scheduler before reaching the provider.", ["provider", "model"])
+VALIDATION_FAILURES = Counter("compliance_validation_failures_total", "Responses failing a validation rule.", ["rule"])
+RETRIES = Counter("compliance_retries_total", "Extra generation work: provider failover, targeted repair, full retry.", ["kind"])
+GOVERNANCE_DECISIONS = Counter("compliance_governance_decisions_total", "Governance outcomes by status.", ["status"])
+CACHE_REQUESTS = Counter("compliance_cache_requests_total", "Cache lookups by cache and result.", ["cache", "result"])
+STAGE_SECONDS = Histogram("compliance_stage_seconds", "Pipeline stage latency.", ["stage"])
+
+
+def observe_retrieval(queries: int, seconds: float):
+    """ClauseIndexer.on_search hook."""
+    RETRIEVAL_SECONDS.observe(seconds)
+    RETRIEVAL_QUERIES.inc(queries)
@@ -0,0 +1,150 @@
+# agent/repair.py
+"""
+Targeted field-level repair for responses that fail `_validate_response`.
+
+Instead of regenerating the whole ComplianceResponse, only the fields named
+by the failing rules are re-requested and merged back into the original.
+"""
+import json
+import threading
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field, create_model
+
+from agent.schemas import ComplianceResponse, RiskLevel
+
+
+class ValidationIssue(BaseModel):
+    rule: str = Field(..., description="Rule identifier, e.g. '0d' or 'D2'.")
+    fields: List[str] = Field(..., description="ComplianceResponse fields that must change to fix the issue.")
+    message: str
+    # 'append': only new reasoning_map entries are needed (orphan subsections)
+    mode: str = "replace"
+    # Deterministic fix applied without an LLM call (e.g. {'risk_level': 'medium'})
+    fix: Optional[Dict[str, str]] = None
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough provider-agnostic token estimate (~4 chars per token)."""
+    return max(1, len(text) // 4)
+
+
+def messages_tokens(messages: List[dict]) -> int:
+    return sum(estimate_tokens(m["content"]) for m in messages)
+
+
+def apply_deterministic_fixes(response: ComplianceResponse, issues: List[ValidationIssue]) -> List[ValidationIssue]:
+    """
+    Applies rule-defined fixes in place and returns the issues still needing the LLM.
+    """
+    remaining = []
+    for issue in issues:
+        if issue.fix:
+            for field, value in issue.fix.items():
+                if field == "risk_level":
+                    # Never downgrade an existing HIGH/CRITICAL assessment
+                    if response.risk_level != RiskLevel.LOW:
+                        continue
+                    value = RiskLevel(value)
+                setattr(response, field, value)
+        else:
+            remaining.append(issue)
+    return remaining
+
+
+def build_repair_model(issues: List[ValidationIssue]):
+    """
+    Creates a partial response model containing only the failing fields.
+    """
+    fields = {}
+    for issue in issues:
+        for name in issue.fields:
+            if name in fields:
+                continue
+            info = ComplianceResponse.model_fields[name]
+            fields[name] = (info.annotation, Field(..., description=info.description))
+    return create_model("ComplianceRepair", **fields)
+
+
+def append_only(issues: List[ValidationIssue]) -> bool:
+    """True if every reasoning_map issue only asks for additional entries."""
+    return all(i.mode == "append" for i in issues if "reasoning_map" in i.fields)
+
+
+def build_repair_messages(response: ComplianceResponse, issues: List[ValidationIssue], query: str) -> List[dict]:
+    fields = list(dict.fromkeys(f for i in issues for f in i.fields))
+    current = response.model_dump(include=set(fields) | {"reasoning_map"}, mode="json")
+    if "reasoning_map" in fields and append_only(issues):
+        instruction = "Return ONLY the NEW reasoning_map entries needed; existing entries are kept."
+    else:
+        instruction = f"Return corrected values for: {', '.join(fields)}. Keep everything that was already correct."
+    return [
+        {"role": "system", "content": (
+            "You are repairing specific fields of a GDPR compliance analysis that failed validation.\n"
+            "Only output the requested fields. Use normalized subsection tokens (e.g. '83(2)(c)').\n"
+            "Every reasoning_map fact must be taken from the user query. Do not invent facts."
+        )},
+        {"role": "user", "content": (
+            f"QUERY: {query}\n\n"
+            f"CURRENT VALUES:\n{json.dumps(current, ensure_ascii=False)}\n\n"
+            f"VALIDATION ERRORS:\n" + "\n".join(i.message for i in issues) + f"\n\n{instruction}"
+        )}
+    ]
+
+
+def merge_repair(response: ComplianceResponse, patch: BaseModel, issues: List[ValidationIssue]) -> ComplianceResponse:
+    """
+    Merges the repaired fields into a copy of the original response.
+    """
+    update = {name: getattr(patch, name) for name in type(patch).model_fields}
+    if "reasoning_map" in update and append_only(issues):
+        existing = {e.gdpr_subsection for e in response.reasoning_map}
+        update["reasoning_map"] = response.reasoning_map + [
+            e for e in update["reasoning_map"] if e.gdpr_subsection not in existing
+        ]
+    return ComplianceResponse.model_validate({**response.model_dump(), **update})
+
+
+class RepairStats:
+    """
+    Process-wide counters for validation failures and repair savings.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.validations = 0
+        self.rule_failures: Dict[str, int] = {}
+        self.deterministic_fixes = 0
+        self.llm_repairs = 0
+        self.unresolved = 0
+        self.repair_tokens = 0
+        self.full_regen_tokens = 0
+
+    def record_validation(self, issues: List[ValidationIssue]):
+        with self._lock:
+            self.validations += 1
+            for rule in {i.rule for i in issues}:
+                self.rule_failures[rule] = self.rule_failures.get(rule, 0) + 1
+
+    def record_repair(self, deterministic: int, used_llm: bool, repair_tokens: int, full_regen_tokens: int, resolved: bool):
+        with self._lock:
+            self.deterministic_fixes += deterministic
+            self.llm_repairs += int(used_llm)
+            self.unresolved += int(not resolved)
+            self.repair_tokens += repair_tokens
+            self.full_regen_tokens += full_regen_tokens
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            total = self.validations or 1
+            return {
+                "validations": self.validations,
+                "retry_rate_by_rule": {r: round(n / total, 4) for r, n in sorted(self.rule_failures.items())},
+                "deterministic_fixes": self.deterministic_fixes,
+                "llm_repairs": self.llm_repairs,
+                "unresolved": self.unresolved,
+                "repair_tokens": self.repair_tokens,
+                "full_regeneration_tokens_estimate": self.full_regen_tokens,
+                "tokens_saved_estimate": self.full_regen_tokens - self.repair_tokens,
+            }
+
+
+REPAIR_STATS = RepairStats()
@@ -1,17 +1,64 @@
 import os
-from tavily import TavilyClient
-import trafilatura
-from typing import Optional, Dict
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from typing import Optional, Dict, List, Callable
+from agent.search_cache import get_search_client
+from agent.logging_setup import get_logger
+
+log = get_logger("researcher")
+
+PREFERRED_SOURCES = ['.gov', 'legislation', 'parliament', 'europa.eu', 'law.cornell']
+
+
+def fetch_and_extract(url: str) -> Optional[str]:
+    """
+    Downloads one page and extracts its main text (None on failure).
+    """
+    import trafilatura
+    downloaded = trafilatura.fetch_url(url)
+    if not downloaded:
+        return None
+    return trafilatura.extract(downloaded, include_comments=False, include_tables=True)
+
+
+def fetch_many(urls: List[str], deadline_s: float = 10.0, max_workers: int = 4,
+               fetcher: Callable[[str], Optional[str]] = fetch_and_extract) -> Dict[str, str]:
+    """
+    Fetches and extracts URLs concurrently. Returns {url: text} for the pages
+    that finished before the deadline; stragglers and failures are dropped.
+    """
+    if not urls:
+        return {}
+    texts = {}
+    pool = ThreadPoolExecutor(max_workers=min(max_workers, len(urls)))
+    futures = {pool.submit(fetcher, url): url for url in urls}
+    try:
+        for future in as_completed(futures, timeout=deadline_s):
+            try:
+                text = future.result()
+            except Exception as e:
+                log.warning("fetch_failed", extra={"url": futures[future], "error": str(e)[:500]})
+                continue
+            if text:
+                texts[futures[future]] = text
+    except FuturesTimeout:
+        log.warning("fetch_deadline", extra={"deadline_s": deadline_s, "extracted": len(texts), "urls": len(urls)})
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return texts
+
 
 class LegalResearcher:
     """
     Finds and downloads legal texts from the web.
     """
-    def __init__(self):
+    def __init__(self, fetcher: Callable[[str], Optional[str]] = fetch_and_extract, deadline_s: float = 15.0):
         self.api_key = os.getenv("TAVILY_API_KEY")
-        if not self.api_key:
+        self.client = get_search_client(self.api_key)
+        if not self.client:
             raise ValueError("TAVILY_API_KEY not found in environment.")
-        self.client = TavilyClient(api_key=self.api_key)
+        self.fetcher = fetcher
+        self.deadline_s = deadline_s
 
     def find_regulation_text(self, law_name: str, region: str) -> Dict[str, str]:
         """
@@ -19,49 +66,45 @@ class LegalResearcher:
         Returns: {'url': str, 'content': str, 'title': str}
         """
         query = f"official full text of {law_name} {region} regulation law filetype:html OR filetype:pdf"
-        print(f"🔎 Researching: {query}")
-        
+        log.info("regulation_search", extra={"law_name": law_name, "region": region})
+
         # 1. Search with Tavily (advanced search)
         results = self.client.search(
-            query=query, 
-            search_depth="advanced", 
+            query=query,
+            search_depth="advanced",
             max_results=5,
             include_raw_content=False
         )
-        
-        best_url = None
-        # Simple heuristic: Look for .gov or .org or "legislation" in URL
-        for r in results.get('results', []):
-            url = r['url']
-            if any(x in url for x in ['.gov', 'legislation', 'parliament', 'europa.eu', 'law.cornell']):
-                best_url = url
-                break
-        
-        if not best_url and results['results']:
-            best_url = results['results'][0]['url']
-            
-        if not best_url:
+
+        # Simple heuristic: .gov / .org / "legislation" sources first, then search rank
+        candidates = sorted(
+            results.get('results', []),
+            key=lambda r: not any(x in r['url'] for x in PREFERRED_SOURCES)
+        )
+        if not candidates:
             raise RuntimeError("No suitable source found for this regulation.")
 
-        print(f"📥 Downloading from: {best_url}")
-        
-        # 2. Scrape Content
-        downloaded = trafilatura.fetch_url(best_url)
-        text_content = trafilatura.extract(downloaded, include_comments=False, include_tables=True)
-        
-        if not text_content or len(text_content) < 500:
-             # Fallback: Use Tavily's raw content window if scrape fails?
-             # For now, just raise or return partial
-             if results['results'][0].get('content'):
-                 return {
-                     "url": best_url,
-                     "content": results['results'][0]['content'],  # Tavily snippet (not ideal for full RAG)
-                     "title": results['results'][0]['title']
-                 }
-             raise RuntimeError(f"Failed to extract content from {best_url}")
+        # 2. Scrape all candidates concurrently; keep the best-ranked full text
+        started = time.perf_counter()
+        log.info("regulation_fetch_start", extra={"candidates": len(candidates)})
+        texts = fetch_many([r['url'] for r in candidates], deadline_s=self.deadline_s, fetcher=self.fetcher)
+        log.info("regulation_fetch_done", extra={"elapsed_s": round(time.perf_counter() - started, 4), "extracted": len(texts)})
+
+        for r in candidates:
+            text_content = texts.get(r['url'])
+            if text_content and len(text_content) >= 500:
+                return {
+                    "url": r['url'],
+                    "content": text_content, # Clean raw text
+                    "title": r['title']
+                }
 
-        return {
-            "url": best_url,
-            "content": text_content, # Clean raw text
-            "title": results['results'][0]['title']
-        }
+        # Fallback: Tavily snippet of the best candidate (not ideal for full RAG)
+        best = candidates[0]
+        if best.get('content'):
+            return {
+                "url": best['url'],
+                "content": best['content'],
+                "title": best['title']
+            }
+        raise RuntimeError(f"Failed to extract content from {best['url']}")
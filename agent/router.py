@@ -1,4 +1,5 @@
 # agent/router.py
+import re
 
 def needs_multi_article_reasoning(query: str) -> bool:
     """
@@ -15,4 +16,56 @@ def needs_multi_article_reasoning(query: str) -> bool:
         "breach"
     ]
     
-    return any(k in query.lower() for k in keywords)
\ No newline at end of file
+    return any(k in query.lower() for k in keywords)
+
+def retrieval_depth(query: str) -> int:
+    """Number of semantic hits to retrieve (cross-chapter questions need more)."""
+    return 6 if needs_multi_article_reasoning(query) else 3
+
+def normalize_query(query: str) -> str:
+    """Case/whitespace-insensitive form used for dedupe and cache keys."""
+    return re.sub(r"\s+", " ", query.strip().lower())
+
+PENALTY_RE = re.compile(r"\b(fin(e|es|ed|ing)|penalt(y|ies)|sanctions?|fine tier)\b", re.IGNORECASE)
+
+def is_penalty_query(query: str) -> bool:
+    """
+    Detects Article 83 penalty questions ('fine', 'fined', 'fining', ...).
+    Word-boundary match, so 'define' does not count as 'fine'.
+    """
+    return bool(PENALTY_RE.search(query))
+
+DEFINITION_TRIGGERS = ["what is", "define", "meaning of", "considered personal info", "stand for", "are ip addresses"]
+GENERAL_RE = re.compile(
+    r"\b(hi|hello|hey|who are you|what can you do|help|thanks|thank you|good morning|capabilities)\b",
+    re.IGNORECASE
+)
+# Substantive compliance vocabulary: never treated as small talk
+LEGAL_SIGNAL_RE = re.compile(
+    r"\b(article|art\.?|gdpr|ccpa|fda|data|consent|erasure|breach|fine|fines|penalty|controller|processor|transfer|law|regulation)\b|\d",
+    re.IGNORECASE
+)
+
+def is_definition_query(query: str) -> bool:
+    return any(k in query.lower() for k in DEFINITION_TRIGGERS)
+
+def is_general_query(query: str) -> bool:
+    """
+    Short greetings / capability questions that need no retrieval.
+    """
+    return len(query.split()) < 10 and bool(GENERAL_RE.search(query)) and not LEGAL_SIGNAL_RE.search(query)
+
+def classify_query(query: str) -> str:
+    """
+    Coarse query-complexity class used for tier routing:
+    'general' < 'definition' < 'standard' < 'multi_article' < 'penalty'.
+    """
+    if is_general_query(query):
+        return "general"
+    if is_penalty_query(query):
+        return "penalty"
+    if is_definition_query(query):
+        return "definition"
+    if needs_multi_article_reasoning(query):
+        return "multi_article"
+    return "standard"
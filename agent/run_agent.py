@@ -1,5 +1,4 @@
 import os
-import json
 import sys
 
 # Ensure the script can see all subfolders correctly
@@ -8,6 +7,7 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from retrieval.indexer import ClauseIndexer
+from retrieval.corpus import load_corpus
 from agent.analyst import ComplianceAgent
 
 def main():
@@ -18,36 +18,16 @@ def main():
     project_root = os.path.dirname(current_script_dir)
     
     # 3. Construct the path to the data folder in the root
-    data_path = os.path.join(project_root, "data", "processed", "gdpr_structured.json")
+    data_path = os.path.join(project_root, "data", "processed", "gdpr_corpus.bin")
+    clauses_path = os.path.join(project_root, "data", "processed", "gdpr_clauses.jsonl")
     
     # --- DEBUG PRINT: Let's see if we got it right this time ---
     print(f"📂 Resolved Data Path: {data_path}")
     
-    if not os.path.exists(data_path):
-        print(f"❌ ERROR: Still can't find the file at the path above!")
-        return
     # ---------------------------------------------------------
 
-    with open(data_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    # 1. Build the Index (with Title Injection for precision)
-    indexer = ClauseIndexer()
-    texts = []
-    metadata = []
-    
-    for a in data['articles']:
-        title = a.get('title', 'GDPR Regulation')
-        for c in a['clauses']:
-            texts.append(f"Article {a['article_id']} - {title}: {c['text']}")
-            metadata.append({
-                "article_id": str(a['article_id']),
-                "clause_id": c['clause_id'],
-                "text": c['text'],
-                "clause_type": c.get('clause_type', 'other')
-            })
-            
-    indexer.build(texts, metadata)
+    # 1. Build the Index (with Title Injection for precision); the stream is compiled in memory if the .bin is missing or stale
+    indexer = ClauseIndexer.from_corpus(load_corpus(data_path, source=clauses_path))
 
     # 2. Run the Compliance Agent
     agent = ComplianceAgent(indexer, data_path)
@@ -0,0 +1,248 @@
+# agent/scheduler.py
+"""
+Process-wide rate-limit scheduler for LLM calls.
+
+Each (provider, model, key) gets two token buckets: requests per minute and
+tokens per minute. A call reserves capacity before it is sent; if the
+reservation means waiting, the caller queues (sleeps) up to `max_wait_s`,
+otherwise the work is shed so the failover loop can try another model/key
+instead of collecting a 429. Provider 429s put the slot into a cooldown.
+
+A reservation is the prompt plus the model's expected completion (a running
+average of reported completion tokens), not the max_tokens cap: on small
+TPM budgets the cap alone can exceed a whole minute of quota. Every ticket
+is settled against reported usage, or refunded when the call failed.
+"""
+import os
+import re
+import time
+import hashlib
+import threading
+from typing import Dict, List, Optional, Tuple
+from pydantic import BaseModel
+
+
+class RateLimits(BaseModel):
+    rpm: int
+    tpm: int
+
+
+# Published free/dev-tier limits; override with LLM_RPM / LLM_TPM
+DEFAULT_LIMITS: Dict[str, Dict[str, RateLimits]] = {
+    "groq": {
+        "llama-3.1-8b-instant": RateLimits(rpm=30, tpm=6000),
+        "llama-3.3-70b-versatile": RateLimits(rpm=30, tpm=12000),
+        "gemma2-9b-it": RateLimits(rpm=30, tpm=15000),
+    },
+    "openrouter": {},
+}
+FALLBACK_LIMITS = {
+    "groq": RateLimits(rpm=30, tpm=6000),
+    "openrouter": RateLimits(rpm=60, tpm=100000),
+    "fake": RateLimits(rpm=600, tpm=1000000),
+}
+
+# Completion tokens assumed before a model has reported any usage; weight of each new observation
+COMPLETION_ESTIMATE_TOKENS = int(os.getenv("SCHEDULER_COMPLETION_ESTIMATE", "512"))
+COMPLETION_EWMA_ALPHA = 0.2
+
+RETRY_AFTER_RE = re.compile(r"(?:try again in|retry after)\s*(?:(\d+)m)?([\d.]+)\s*s", re.IGNORECASE)
+
+
+class CapacityExceeded(RuntimeError):
+    """Every model/key would have to wait longer than the queue allows."""
+    def __init__(self, message: str, retry_after_s: float):
+        super().__init__(message)
+        self.retry_after_s = retry_after_s
+
+
+def key_id(api_key: str) -> str:
+    # Never keep raw keys in scheduler state or stats
+    return hashlib.sha1(api_key.encode("utf-8")).hexdigest()[:8]
+
+
+def limits_for(provider: str, model: str) -> RateLimits:
+    base = DEFAULT_LIMITS.get(provider, {}).get(model) or FALLBACK_LIMITS.get(provider, FALLBACK_LIMITS["groq"])
+    return RateLimits(
+        rpm=int(os.getenv("LLM_RPM", base.rpm)),
+        tpm=int(os.getenv("LLM_TPM", base.tpm)),
+    )
+
+
+def parse_retry_after(error_msg: str, default_s: float = 15.0) -> float:
+    match = RETRY_AFTER_RE.search(error_msg)
+    if not match:
+        return default_s
+    return int(match.group(1) or 0) * 60 + float(match.group(2))
+
+
+def usage_tokens(response) -> Optional[int]:
+    """Provider-reported total tokens (raw completion or instructor model), if any."""
+    raw = getattr(response, "_raw_response", response)
+    usage = getattr(raw, "usage", None)
+    return getattr(usage, "total_tokens", None)
+
+
+def usage_completion_tokens(response) -> Optional[int]:
+    raw = getattr(response, "_raw_response", response)
+    usage = getattr(raw, "usage", None)
+    return getattr(usage, "completion_tokens", None)
+
+
+def is_rate_limit_error(error_msg: str) -> bool:
+    error_msg = error_msg.lower()
+    return "429" in error_msg or "rate limit" in error_msg or "rate_limit" in error_msg
+
+
+class TokenBucket:
+    """
+    Continuous-refill bucket. Reservations may drive the balance negative,
+    which is how queued callers line up behind each other.
+    """
+    def __init__(self, capacity: float, per_minute: float):
+        self.capacity = capacity
+        self.rate = per_minute / 60.0
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_for(self, amount: float, now: float) -> float:
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        self.level -= min(amount, self.capacity)
+
+    def give(self, amount: float):
+        self.level = min(self.capacity, self.level + amount)
+
+
+class Ticket(BaseModel):
+    slot: Tuple[str, str, str]
+    reserved_tokens: int
+    queue_wait_s: float
+    settled: bool = False
+
+
+class _Slot:
+    def __init__(self, limits: RateLimits):
+        self.requests = TokenBucket(limits.rpm, limits.rpm)
+        self.tokens = TokenBucket(limits.tpm, limits.tpm)
+        self.cooldown_until = 0.0
+
+
+class RateScheduler:
+    def __init__(self, max_wait_s: float = 20.0, window: int = 500):
+        self.max_wait_s = max_wait_s
+        self.window = window
+        self._lock = threading.Lock()
+        self._slots: Dict[Tuple[str, str, str], _Slot] = {}
+        self._waits: List[float] = []
+        self._completion: Dict[Tuple[str, str], float] = {}
+        self.granted = 0
+        self.shed = 0
+        self.throttled = 0
+
+    def _slot(self, slot_key) -> _Slot:
+        slot = self._slots.get(slot_key)
+        if slot is None:
+            slot = self._slots[slot_key] = _Slot(limits_for(slot_key[0], slot_key[1]))
+        return slot
+
+    def headroom(self, provider: str, model: str, api_key: str, tokens: int) -> Tuple[float, float]:
+        """(wait_s, remaining token-quota fraction) if `tokens` were reserved now."""
+        with self._lock:
+            slot = self._slot((provider, model, key_id(api_key)))
+            wait = self._wait(slot, tokens, time.monotonic())
+            return wait, max(slot.tokens.level, 0.0) / slot.tokens.capacity
+
+    @staticmethod
+    def _wait(slot: _Slot, tokens: int, now: float) -> float:
+        return max(slot.requests.wait_for(1, now), slot.tokens.wait_for(tokens, now), slot.cooldown_until - now, 0.0)
+
+    def acquire(self, provider: str, model: str, api_key: str, tokens: int,
+                max_wait_s: Optional[float] = None) -> Optional[Ticket]:
+        """
+        Reserves one request and `tokens` tokens. Sleeps until the reservation
+        is due (queueing) and returns a Ticket, or returns None (shed) when the
+        wait would exceed max_wait_s.
+        """
+        max_wait_s = self.max_wait_s if max_wait_s is None else max_wait_s
+        slot_key = (provider, model, key_id(api_key))
+        with self._lock:
+            slot = self._slot(slot_key)
+            wait = self._wait(slot, tokens, time.monotonic())
+            if wait > max_wait_s:
+                self.shed += 1
+                return None
+            slot.requests.take(1)
+            slot.tokens.take(tokens)
+            self.granted += 1
+            self._waits.append(wait)
+            del self._waits[:-self.window]
+        if wait > 0:
+            time.sleep(wait)
+        return Ticket(slot=slot_key, reserved_tokens=tokens, queue_wait_s=wait)
+
+    def completion_estimate(self, provider: str, model: str, cap: Optional[int] = None) -> int:
+        """Expected completion tokens for one call: running average of reported usage, at most `cap`."""
+        with self._lock:
+            estimate = self._completion.get((provider, model), COMPLETION_ESTIMATE_TOKENS)
+        return int(min(estimate, cap) if cap else estimate)
+
+    def settle(self, ticket: Ticket, used_tokens: Optional[int], completion_tokens: Optional[int] = None):
+        """
+        Corrects the token reservation with the provider-reported usage (None
+        keeps the estimate) and feeds the completion average. Settling twice is a no-op.
+        """
+        with self._lock:
+            if ticket.settled:
+                return
+            ticket.settled = True
+            if completion_tokens is not None:
+                key = ticket.slot[:2]
+                previous = self._completion.get(key)
+                self._completion[key] = completion_tokens if previous is None else (
+                    previous + COMPLETION_EWMA_ALPHA * (completion_tokens - previous))
+            if used_tokens is None:
+                return
+            bucket = self._slot(ticket.slot).tokens
+            delta = ticket.reserved_tokens - used_tokens
+            bucket.give(delta) if delta > 0 else bucket.take(-delta)
+
+    def refund(self, ticket: Ticket):
+        """Returns the whole token reservation (the call failed without consuming quota)."""
+        self.settle(ticket, 0)
+
+    def penalize(self, ticket: Ticket, retry_after_s: float):
+        """Provider said 429: no new work on this slot until the cooldown ends."""
+        with self._lock:
+            slot = self._slot(ticket.slot)
+            slot.cooldown_until = max(slot.cooldown_until, time.monotonic() + retry_after_s)
+            self.throttled += 1
+
+    def min_wait(self) -> float:
+        now = time.monotonic()
+        with self._lock:
+            waits = [max(s.cooldown_until - now, 0.0) for s in self._slots.values()]
+        return min(waits) if waits else 0.0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            ordered = sorted(self._waits)
+            now = time.monotonic()
+            return {
+                "granted": self.granted,
+                "shed": self.shed,
+                "throttled_429": self.throttled,
+                "queue_wait_avg_s": round(sum(ordered) / len(ordered), 4) if ordered else 0.0,
+                "queue_wait_p95_s": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4) if ordered else 0.0,
+                "cooling_down": sorted(f"{p}/{m}/{k}" for (p, m, k), s in self._slots.items() if s.cooldown_until > now),
+            }
+
+
+SCHEDULER = RateScheduler(max_wait_s=float(os.getenv("SCHEDULER_MAX_WAIT_S", "20")))
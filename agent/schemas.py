@@ -124,3 +124,21 @@ class ComplianceResponse(BaseModel):
     @classmethod
     def validate_confidence(cls, v):
         return round(v, 2)
+
+class PenaltyNarrative(BaseModel):
+    """
+    Narrative-only response for penalty questions. Citations, reasoning map
+    and risk are pre-computed by the Article 83 engine (agent/fines.py).
+    """
+    summary: str = Field(
+        ...,
+        description="Analysis narrating the pre-computed assessment. Cite every listed subsection and name each factor."
+    )
+    risk_analysis: str = Field(
+        ...,
+        description="Brief justification of the fine exposure."
+    )
+    scope_limitation: str = Field(
+        default="N/A",
+        description="Any limits on processing or refusal relevant to the case."
+    )
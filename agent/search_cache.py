@@ -0,0 +1,228 @@
+# agent/search_cache.py
+"""
+Search result cache for Tavily calls.
+
+Entries are keyed by the normalized query plus the search parameters, expire
+after a TTL, are bounded in number, and persist in SQLite so identical
+searches survive restarts. `OfflineSearchClient` is a local stand-in for
+TavilyClient used to exercise the cache (and the FDA path) without network.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from agent.router import normalize_query
+from agent.metrics import CACHE_REQUESTS
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_PATH = os.path.join(PROJECT_ROOT, "data", "cache", "search_cache.sqlite")
+
+
+def cache_key(query: str, params: dict) -> str:
+    payload = json.dumps({"q": normalize_query(query), "p": params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SearchCache:
+    """
+    Two-level cache: in-memory LRU in front of an optional SQLite file.
+    `_lock` guards only the LRU and counters; SQLite I/O runs outside it on a
+    writer and a reader connection (WAL), so memory hits never wait on a commit.
+    """
+    def __init__(self, path: Optional[str] = None, ttl_s: float = 3600.0, max_entries: int = 1000, memory_entries: int = 256,
+                 name: str = "search"):
+        self.path = path
+        self.name = name  # metrics label
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._db = None
+        self._reader = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS search_cache ("
+                "key TEXT PRIMARY KEY, payload TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_search_cache_accessed ON search_cache(accessed)")
+            self._db.commit()
+            self._write_lock = threading.Lock()
+            self._reader = sqlite3.connect(path, check_same_thread=False)
+            self._reader_lock = threading.Lock()
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and now - entry[0] <= self.ttl_s:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                CACHE_REQUESTS.labels(self.name, "hit").inc()
+                return entry[1]
+            if entry:
+                del self._memory[key]
+
+        if self._reader is not None:
+            with self._reader_lock:
+                row = self._reader.execute("SELECT payload, created FROM search_cache WHERE key = ?", (key,)).fetchone()
+            if row and now - row[1] <= self.ttl_s:
+                value = json.loads(row[0])
+                # LRU touch is best effort: a read never queues behind a commit
+                if self._write_lock.acquire(blocking=False):
+                    try:
+                        self._db.execute("UPDATE search_cache SET accessed = ? WHERE key = ?", (now, key))
+                        self._db.commit()
+                    finally:
+                        self._write_lock.release()
+                with self._lock:
+                    self._remember(key, row[1], value)
+                    self.hits += 1
+                CACHE_REQUESTS.labels(self.name, "hit").inc()
+                return value
+            if row:
+                with self._write_lock:
+                    # Only if still expired: a concurrent set() may have refreshed it
+                    self._db.execute("DELETE FROM search_cache WHERE key = ? AND created < ?", (key, now - self.ttl_s))
+                    self._db.commit()
+
+        with self._lock:
+            self.misses += 1
+        CACHE_REQUESTS.labels(self.name, "miss").inc()
+        return None
+
+    def set(self, key: str, value):
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, value)
+        if self._db is None:
+            return
+        payload = json.dumps(value, default=str)
+        with self._write_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO search_cache (key, payload, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, payload, now, now)
+            )
+            # Size bound: drop least recently used rows beyond max_entries
+            self._db.execute(
+                "DELETE FROM search_cache WHERE key IN ("
+                "SELECT key FROM search_cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._db.commit()
+
+    def _remember(self, key, created, value):
+        self._memory[key] = (created, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > min(self.memory_entries, self.max_entries):
+            self._memory.popitem(last=False)
+
+    def purge_expired(self) -> int:
+        cutoff = time.time() - self.ttl_s
+        with self._lock:
+            for key in [k for k, (created, _) in self._memory.items() if created < cutoff]:
+                del self._memory[key]
+        if self._db is None:
+            return 0
+        with self._write_lock:
+            cur = self._db.execute("DELETE FROM search_cache WHERE created < ?", (cutoff,))
+            self._db.commit()
+            return cur.rowcount
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "hit_rate": round(self.hits / total, 4) if total else 0.0}
+
+
+class CachedSearchClient:
+    """
+    Drop-in wrapper exposing TavilyClient.search(query, **params) with caching.
+    """
+    def __init__(self, client, cache: SearchCache):
+        self.client = client
+        self.cache = cache
+
+    def search(self, query: str, **params):
+        key = cache_key(query, params)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        result = self.client.search(query=query, **params)
+        self.cache.set(key, result)
+        return result
+
+
+class OfflineSearchClient:
+    """
+    Local stand-in for TavilyClient: deterministic, Tavily-shaped results with
+    a configurable artificial latency. Counts calls so cache behaviour is testable.
+    """
+    def __init__(self, latency_s: float = 0.0):
+        self.latency_s = latency_s
+        self.calls = 0
+
+    def search(self, query: str, max_results: int = 5, include_answer: bool = False, **params):
+        self.calls += 1
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        digest = hashlib.sha1(normalize_query(query).encode("utf-8")).hexdigest()[:8]
+        results = [
+            {
+                "title": f"Offline result {i + 1} for '{query[:40]}'",
+                "url": f"https://offline.example.gov/{digest}/{i + 1}",
+                "content": f"Offline search stand-in content {i + 1} for query: {query}",
+                "score": round(1.0 - i * 0.1, 2),
+            }
+            for i in range(max_results)
+        ]
+        response = {"query": query, "results": results}
+        if include_answer:
+            response["answer"] = f"Offline overview for: {query}"
+        return response
+
+
+_SHARED_CACHE = None
+_SHARED_LOCK = threading.Lock()
+
+
+def get_shared_cache() -> SearchCache:
+    """
+    Process-wide cache configured from SEARCH_CACHE_PATH / SEARCH_CACHE_TTL /
+    SEARCH_CACHE_MAX_ENTRIES. SEARCH_CACHE_PATH='' keeps it in memory only.
+    """
+    global _SHARED_CACHE
+    with _SHARED_LOCK:
+        if _SHARED_CACHE is None:
+            _SHARED_CACHE = SearchCache(
+                path=os.getenv("SEARCH_CACHE_PATH", DEFAULT_CACHE_PATH) or None,
+                ttl_s=float(os.getenv("SEARCH_CACHE_TTL", "3600")),
+                max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1000")),
+            )
+        return _SHARED_CACHE
+
+
+def get_search_client(api_key: Optional[str]):
+    """
+    Returns a cached search client, or None if no provider is available.
+    TAVILY_OFFLINE=1 uses the local stand-in instead of the Tavily API.
+    """
+    if os.getenv("TAVILY_OFFLINE") == "1":
+        client = OfflineSearchClient(latency_s=float(os.getenv("TAVILY_OFFLINE_LATENCY", "0")))
+    elif api_key:
+        from tavily import TavilyClient
+        client = TavilyClient(api_key=api_key)
+    else:
+        return None
+    return CachedSearchClient(client, get_shared_cache())
@@ -0,0 +1,120 @@
+# agent/singleflight.py
+"""
+In-flight request coalescing.
+
+Concurrent callers with the same key share one computation: the first
+caller (leader) runs it, the others wait until it finishes and receive the
+same result or exception. Nothing is cached once the call completes.
+
+`do_async` is the event-loop entry point: the computation runs in a worker
+thread while every caller awaits a future, so a burst of identical
+requests holds one executor thread rather than one per caller.
+"""
+import asyncio
+import contextvars
+import threading
+from typing import Any, Callable, Dict, List, Tuple
+
+from agent.router import normalize_query
+from agent.metrics import CACHE_REQUESTS
+
+
+def request_key(query: str, domain: str, tier: str) -> Tuple[str, str, str]:
+    return (normalize_query(query), domain, tier)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []  # do_async callers
+
+    def outcome(self):
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def _wake(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Any, _Call] = {}
+        self.requests = 0
+        self.coalesced = 0
+
+    def _join(self, key, waiter=None) -> Tuple[_Call, bool]:
+        """The in-flight call for `key` or a new one led by the caller; `waiter` is registered either way."""
+        with self._lock:
+            self.requests += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+            if waiter is not None:
+                call.waiters.append(waiter)
+        CACHE_REQUESTS.labels("inflight", "leader" if leader else "coalesced").inc()
+        return call, leader
+
+    def _run(self, key, call: _Call, fn: Callable[[], Any]):
+        """Runs the shared computation and wakes every waiter."""
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+        finally:
+            with self._lock:
+                del self._calls[key]
+                call.done.set()
+                waiters, call.waiters = call.waiters, []
+            for loop, future in waiters:
+                try:
+                    loop.call_soon_threadsafe(_wake, future)
+                except RuntimeError:  # the waiter's loop is gone
+                    pass
+
+    def do(self, key, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Returns (result, shared). shared is True when this caller received
+        another caller's in-flight result. Followers block their thread.
+        """
+        call, leader = self._join(key)
+        if leader:
+            self._run(key, call, fn)
+        else:
+            call.done.wait()
+        return call.outcome(), not leader
+
+    async def do_async(self, key, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Like do(), from the event loop. The leader starts `fn` in the default
+        executor and, like every follower, awaits a future: only the
+        computation itself holds a thread, and it completes for the
+        followers even if the leader's request is cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        call, leader = self._join(key, waiter=(loop, future))
+        if leader:
+            loop.run_in_executor(None, contextvars.copy_context().run, self._run, key, call, fn)
+        await future
+        return call.outcome(), not leader
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "coalesced": self.coalesced,
+                "coalesce_ratio": round(self.coalesced / self.requests, 4) if self.requests else 0.0,
+                "in_flight": len(self._calls),
+            }
+
+
+INFLIGHT = SingleFlight()
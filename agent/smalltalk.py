@@ -0,0 +1,118 @@
+# agent/smalltalk.py
+"""
+Local responder for greetings, thanks and capability questions.
+
+Answers are rendered once from templates describing the loaded domain and
+corpus, so small talk costs microseconds and no provider rate limit. An
+optional LLM variant generates each intent's answer once per process and
+caches it, shared by every responder (the backend builds one per request).
+"""
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+GREETING_RE = re.compile(r"\b(hi|hello|hey|good (morning|afternoon|evening))\b", re.IGNORECASE)
+THANKS_RE = re.compile(r"\b(thanks|thank you|cheers)\b", re.IGNORECASE)
+
+DOMAIN_DESCRIPTIONS = {
+    "GDPR": "EU General Data Protection Regulation (Regulation (EU) 2016/679)",
+    "FDA": "US Food & Drug Administration regulations and recent court cases",
+    "CCPA": "California Consumer Privacy Act / CPRA (California Civil Code §1798)",
+}
+
+CAPABILITIES = [
+    "Answer compliance questions with article- and subsection-level citations",
+    "Classify risk (low / medium / high) with a confidence score and governance decision",
+    "Work out GDPR Article 83 fine tiers and the 83(2) factors that apply to a case",
+    "Search recent lawsuits and legal precedents (FDA workspace)",
+]
+
+TEMPLATES = {
+    "greeting": (
+        "Hello! I'm the Agentic Compliance Analyst, your virtual compliance officer for the {domain_name}.\n\n"
+        "Knowledge loaded: {corpus}.\n\n"
+        "Ask me a concrete compliance question to get a cited analysis."
+    ),
+    "thanks": "You're welcome! Ask me anything else about the {domain_name} whenever you need a cited analysis.",
+    "capabilities": (
+        "I'm the Agentic Compliance Analyst, an AI compliance officer currently working in the **{domain}** workspace "
+        "({domain_name}).\n\n"
+        "Knowledge loaded: {corpus}.\n\n"
+        "What I can do:\n{capabilities}\n\n"
+        "I do not answer compliance questions in small talk - just ask your question directly."
+    ),
+}
+
+
+# (domain, intent) -> LLM-phrased answer, LRU-bounded and shared across responders
+SMALLTALK_CACHE_MAX_ENTRIES = int(os.getenv("SMALLTALK_CACHE_MAX_ENTRIES", "64"))
+_llm_cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+_llm_cache_lock = threading.Lock()
+
+
+def _cached_answer(key: Tuple[str, str]) -> Optional[str]:
+    with _llm_cache_lock:
+        text = _llm_cache.get(key)
+        if text is not None:
+            _llm_cache.move_to_end(key)
+        return text
+
+
+def _store_answer(key: Tuple[str, str], text: str):
+    with _llm_cache_lock:
+        _llm_cache[key] = text
+        _llm_cache.move_to_end(key)
+        while len(_llm_cache) > SMALLTALK_CACHE_MAX_ENTRIES:
+            _llm_cache.popitem(last=False)
+
+
+def clear_small_talk_cache():
+    with _llm_cache_lock:
+        _llm_cache.clear()
+
+
+def classify_small_talk(query: str) -> str:
+    if THANKS_RE.search(query):
+        return "thanks"
+    if GREETING_RE.search(query) and len(query.split()) <= 3:
+        return "greeting"
+    return "capabilities"
+
+
+class SmallTalkResponder:
+    def __init__(self, domain: str, corpus: str, llm_call: Optional[Callable[[str], str]] = None):
+        """
+        corpus: human-readable description of the loaded knowledge.
+        llm_call: optional prompt -> text function; when set, each intent is
+        generated once by the model and then served from the shared cache.
+        """
+        self.domain = domain
+        self.llm_call = llm_call
+        fields = {
+            "domain": domain,
+            "domain_name": DOMAIN_DESCRIPTIONS.get(domain, domain),
+            "corpus": corpus,
+            "capabilities": "\n".join(f"- {c}" for c in CAPABILITIES),
+        }
+        self._rendered: Dict[str, str] = {intent: t.format(**fields) for intent, t in TEMPLATES.items()}
+
+    def respond(self, query: str) -> str:
+        intent = classify_small_talk(query)
+        if self.llm_call is None:
+            return self._rendered[intent]
+
+        key = (self.domain, intent)
+        cached = _cached_answer(key)
+        if cached is not None:
+            return cached
+        try:
+            text = self.llm_call(
+                "Rewrite the following assistant message in a friendly, concise tone. Keep every fact unchanged.\n\n"
+                + self._rendered[intent]
+            )
+        except Exception:
+            return self._rendered[intent]
+        _store_answer(key, text)
+        return text
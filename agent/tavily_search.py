@@ -1,20 +1,32 @@
 import os
-from tavily import TavilyClient
 from dotenv import load_dotenv, find_dotenv
+from agent.search_cache import get_search_client
+from agent.logging_setup import get_logger
 
 # Force updated env
 load_dotenv(find_dotenv(), override=True)
 
+log = get_logger("tavily")
+
 class LawsuitSearcher:
     def __init__(self):
         api_key = os.getenv("TAVILY_API_KEY")
-        print(f"🔧 LawsuitSearcher Init. API Key Present: {bool(api_key)}")
         
-        if not api_key:
-            print("⚠️ Warning: TAVILY_API_KEY not found. Search will fail.")
-            self.client = None
-        else:
-            self.client = TavilyClient(api_key=api_key)
+        # Cached client (TTL + SQLite); TAVILY_OFFLINE=1 swaps in the local stand-in
+        self.client = get_search_client(api_key)
+        if not self.client:
+            log.warning("tavily_key_missing", extra={"component": "LawsuitSearcher"})
+
+    def search(self, query: str, max_results=5, prefix="legal lawsuit court case") -> dict:
+        """
+        Raw Tavily response for one query variant (cached by the client).
+        """
+        return self.client.search(
+            query=f"{prefix} {query}".strip(),
+            search_depth="advanced",
+            max_results=max_results,
+            include_answer=True
+        )
 
     def search_lawsuits(self, query: str, max_results=5) -> str:
         """
@@ -23,15 +35,10 @@ class LawsuitSearcher:
         if not self.client:
             return "❌ Error: Tavily API Key missing. Cannot perform external search."
 
-        print(f"🔎 Tavily Searching: {query}")
+        log.info("tavily_search", extra={"query_chars": len(query), "max_results": max_results})
         try:
             # Optimized search for legal context
-            response = self.client.search(
-                query=f"legal lawsuit court case {query}",
-                search_depth="advanced",
-                max_results=max_results,
-                include_answer=True
-            )
+            response = self.search(query, max_results=max_results)
             
             context = []
             if response.get('answer'):
@@ -0,0 +1,143 @@
+# agent/tiers.py
+"""
+Cost/latency-tiered model routing.
+
+A tier is an ordered failover list of models plus a per-call budget.
+'Tier 1' keeps the provider's full (largest-capability) list; lower tiers
+are cheaper and faster. 'auto' picks the cheapest tier whose historical
+first-pass validation rate for the query class is good enough.
+"""
+import random
+import threading
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+
+
+class ModelTier(BaseModel):
+    name: str
+    models: List[str]
+    max_tokens: int = Field(..., description="Completion token budget per call.")
+    cost_rank: int = Field(..., description="Lower is cheaper.")
+
+
+PROVIDER_TIERS: Dict[str, Dict[str, ModelTier]] = {
+    "openrouter": {
+        "Tier 1": ModelTier(name="Tier 1", cost_rank=3, max_tokens=4096, models=[
+            "meta-llama/llama-3.3-70b-instruct",
+            "google/gemini-2.0-flash-001",
+            "meta-llama/llama-3.1-8b-instruct",
+        ]),
+        "Tier 2": ModelTier(name="Tier 2", cost_rank=2, max_tokens=2048, models=[
+            "google/gemini-2.0-flash-001",
+            "meta-llama/llama-3.1-8b-instruct",
+        ]),
+        "Tier 3": ModelTier(name="Tier 3", cost_rank=1, max_tokens=1024, models=[
+            "meta-llama/llama-3.1-8b-instruct",
+        ]),
+    },
+    "groq": {
+        "Tier 1": ModelTier(name="Tier 1", cost_rank=3, max_tokens=4096, models=[
+            "llama-3.1-8b-instant",
+            "llama-3.3-70b-versatile",
+            "gemma2-9b-it",
+        ]),
+        "Tier 2": ModelTier(name="Tier 2", cost_rank=2, max_tokens=2048, models=[
+            "llama-3.1-8b-instant",
+            "gemma2-9b-it",
+        ]),
+        "Tier 3": ModelTier(name="Tier 3", cost_rank=1, max_tokens=1024, models=[
+            "llama-3.1-8b-instant",
+        ]),
+    },
+    # Offline stand-in (LLM_PROVIDER=fake), same shape as the real providers
+    "fake": {
+        "Tier 1": ModelTier(name="Tier 1", cost_rank=3, max_tokens=4096, models=["fake-large", "fake-medium", "fake-small"]),
+        "Tier 2": ModelTier(name="Tier 2", cost_rank=2, max_tokens=2048, models=["fake-medium", "fake-small"]),
+        "Tier 3": ModelTier(name="Tier 3", cost_rank=1, max_tokens=1024, models=["fake-small"]),
+    },
+}
+
+DEFAULT_TIER = "Tier 1"
+AUTO_TIER = "auto"
+
+# Query classes that never need the expensive tiers
+CHEAPEST_CLASSES = {"general"}
+
+
+class TierStats:
+    """
+    Process-wide latency and first-pass validation stats per (tier, query class).
+    """
+    def __init__(self, window: int = 200):
+        self._lock = threading.Lock()
+        self.window = window
+        self._latencies: Dict[str, List[float]] = {}
+        self._outcomes: Dict[tuple, List[bool]] = {}
+
+    def record(self, tier: str, query_class: str, latency_s: float, passed: bool):
+        with self._lock:
+            lat = self._latencies.setdefault(tier, [])
+            lat.append(latency_s)
+            del lat[:-self.window]
+            out = self._outcomes.setdefault((tier, query_class), [])
+            out.append(passed)
+            del out[:-self.window]
+
+    def pass_rate(self, tier: str, query_class: str) -> Optional[float]:
+        with self._lock:
+            out = self._outcomes.get((tier, query_class), [])
+            return sum(out) / len(out) if out else None
+
+    def samples(self, tier: str, query_class: str) -> int:
+        with self._lock:
+            return len(self._outcomes.get((tier, query_class), []))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            tiers = {}
+            for tier, lat in self._latencies.items():
+                ordered = sorted(lat)
+                tiers[tier] = {
+                    "calls": len(lat),
+                    "latency_avg_s": round(sum(lat) / len(lat), 4),
+                    "latency_p50_s": round(ordered[len(ordered) // 2], 4),
+                    "latency_p95_s": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+                    "pass_rate_by_class": {},
+                }
+            for (tier, qclass), out in self._outcomes.items():
+                tiers.setdefault(tier, {"pass_rate_by_class": {}})["pass_rate_by_class"][qclass] = round(sum(out) / len(out), 4)
+            return tiers
+
+
+TIER_STATS = TierStats()
+
+
+def resolve_tier(provider: str, requested: Optional[str], query_class: str,
+                 stats: TierStats = TIER_STATS, min_pass_rate: float = 0.8,
+                 min_samples: int = 5, explore_rate: float = 0.1) -> ModelTier:
+    """
+    Returns the tier to use for one query.
+    Explicit tier names are honoured; 'auto' walks tiers from cheapest to most
+    expensive and takes the first with a proven pass rate for this query class,
+    occasionally exploring an unproven cheaper tier to gather evidence.
+    """
+    tiers = PROVIDER_TIERS.get(provider, PROVIDER_TIERS["groq"])
+    if requested and requested != AUTO_TIER:
+        return tiers.get(requested, tiers[DEFAULT_TIER])
+
+    by_cost = sorted(tiers.values(), key=lambda t: t.cost_rank)
+    if query_class in CHEAPEST_CLASSES:
+        return by_cost[0]
+
+    for tier in by_cost:
+        if tier.name == DEFAULT_TIER:
+            break
+        rate = stats.pass_rate(tier.name, query_class)
+        if stats.samples(tier.name, query_class) < min_samples:
+            if random.random() < explore_rate:
+                return tier
+            continue
+        if rate is not None and rate >= min_pass_rate:
+            return tier
+    return tiers[DEFAULT_TIER]
+
@@ -0,0 +1,84 @@
+# agent/timing.py
+"""
+Per-request pipeline stage timings.
+
+The backend opens a timing scope per request (`start_timings`); the analyst
+marks stage boundaries with a StageClock. Durations land in the request's
+dict (returned to clients as a Server-Timing header) and in process-wide
+fixed-bucket histograms.
+"""
+import time
+import threading
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from agent.metrics import STAGE_SECONDS
+
+_TIMINGS: ContextVar[Optional[Dict[str, float]]] = ContextVar("stage_timings", default=None)
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0]
+
+
+class StageStats:
+    def __init__(self, buckets: List[float] = BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counts: Dict[str, List[int]] = {}
+        self._sums: Dict[str, float] = {}
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            counts = self._counts.setdefault(stage, [0] * (len(self.buckets) + 1))
+            idx = next((i for i, bound in enumerate(self.buckets) if seconds <= bound), len(self.buckets))
+            counts[idx] += 1
+            self._sums[stage] = self._sums.get(stage, 0.0) + seconds
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            out = {}
+            for stage, counts in self._counts.items():
+                total = sum(counts)
+                out[stage] = {
+                    "count": total,
+                    "avg_s": round(self._sums[stage] / total, 4) if total else 0.0,
+                    "buckets": {
+                        **{f"le_{bound}": c for bound, c in zip(self.buckets, counts)},
+                        "le_inf": counts[-1],
+                    },
+                }
+            return out
+
+
+STAGE_STATS = StageStats()
+
+
+def start_timings() -> Dict[str, float]:
+    """Opens a timing scope for the current request/thread and returns its dict."""
+    timings: Dict[str, float] = {}
+    _TIMINGS.set(timings)
+    return timings
+
+
+def record_stage(stage: str, seconds: float):
+    timings = _TIMINGS.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+    STAGE_STATS.record(stage, seconds)
+    STAGE_SECONDS.labels(stage).observe(seconds)
+
+
+class StageClock:
+    """Lap timer: each lap() records the time since the previous lap."""
+    def __init__(self):
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str):
+        now = time.perf_counter()
+        record_stage(stage, now - self._last)
+        self._last = now
+
+
+def server_timing(timings: Dict[str, float]) -> str:
+    """Server-Timing header value (milliseconds)."""
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings.items())
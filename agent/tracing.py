@@ -0,0 +1,156 @@
+# agent/tracing.py
+"""
+OpenTelemetry tracing for the analysis pipeline.
+
+Spans cover retrieval, every provider attempt (model, key alias, tokens,
+estimated cost), validation and repair/retry. OpenTelemetry is optional:
+without the API package every span is a shared no-op object. Export is
+configured once per process by `init_tracing` (OTLP over HTTP, e.g. to a
+Phoenix collector) with head-based sampling, so unsampled requests cost a
+context-manager enter/exit and nothing else.
+
+Environment:
+    TRACING_ENABLED=1        configure export on first use (default off)
+    TRACE_SAMPLE_RATE=0.1    share of root traces exported (children follow the parent)
+    TRACE_EXPORT_ENDPOINT    OTLP/HTTP traces endpoint (default: local Phoenix)
+"""
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from agent.logging_setup import get_logger
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # tracing is optional
+    otel_trace = None
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "0") == "1"
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.1"))
+TRACE_EXPORT_ENDPOINT = os.getenv("TRACE_EXPORT_ENDPOINT", "http://localhost:6006/v1/traces")
+SERVICE_NAME = "compliance-analyst"
+
+log = get_logger("tracing")
+
+# USD per 1M tokens (input, output). Unknown models are costed at 0.
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "meta-llama/llama-3.3-70b-instruct": (0.13, 0.40),
+    "google/gemini-2.0-flash-001": (0.10, 0.40),
+    "meta-llama/llama-3.1-8b-instruct": (0.02, 0.05),
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+    "llama-3.1-8b-instant": (0.05, 0.08),
+    "gemma2-9b-it": (0.20, 0.20),
+}
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    price_in, price_out = MODEL_PRICES.get(model, (0.0, 0.0))
+    return round((prompt_tokens * price_in + completion_tokens * price_out) / 1_000_000, 8)
+
+
+def usage_breakdown(response) -> Optional[Tuple[int, int]]:
+    """Provider-reported (prompt, completion) tokens from a raw completion or instructor model."""
+    raw = getattr(response, "_raw_response", response)
+    usage = getattr(raw, "usage", None)
+    if usage is None or getattr(usage, "prompt_tokens", None) is None:
+        return None
+    return usage.prompt_tokens, usage.completion_tokens or 0
+
+
+class _NoopSpan:
+    def set_attribute(self, key, value):
+        pass
+
+    def set_attributes(self, attributes):
+        pass
+
+    def record_exception(self, exception):
+        pass
+
+    def is_recording(self) -> bool:
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+_init_lock = threading.Lock()
+_initialized = False
+
+
+def init_tracing(endpoint: Optional[str] = None, sample_rate: Optional[float] = None, exporter=None) -> bool:
+    """
+    Installs a sampled TracerProvider with a batch exporter (once per process).
+    Returns False when the OpenTelemetry SDK is not installed.
+    """
+    global _initialized
+    with _init_lock:
+        if _initialized:
+            return True
+        try:
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+            from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+        except ImportError:
+            log.warning("tracing_unavailable", extra={"reason": "opentelemetry-sdk not installed"})
+            return False
+
+        if exporter is None:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            exporter = OTLPSpanExporter(endpoint=endpoint or TRACE_EXPORT_ENDPOINT)
+        rate = TRACE_SAMPLE_RATE if sample_rate is None else sample_rate
+        provider = TracerProvider(
+            resource=Resource.create({"service.name": SERVICE_NAME}),
+            sampler=ParentBased(TraceIdRatioBased(rate)),
+        )
+        provider.add_span_processor(BatchSpanProcessor(exporter))
+        otel_trace.set_tracer_provider(provider)
+        _initialized = True
+        log.info("tracing_enabled", extra={"sample_rate": rate, "service": SERVICE_NAME})
+        return True
+
+
+def _tracer():
+    if TRACING_ENABLED and not _initialized:
+        init_tracing()
+    return otel_trace.get_tracer(SERVICE_NAME)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Child of the current span (or a new root). Exceptions are recorded and re-raised.
+    Yields a no-op span when OpenTelemetry is unavailable.
+    """
+    if otel_trace is None:
+        yield NOOP_SPAN
+        return
+    with _tracer().start_as_current_span(name) as current:
+        if attributes and current.is_recording():
+            current.set_attributes({k: v for k, v in attributes.items() if v is not None})
+        yield current
+
+
+def current_span():
+    return otel_trace.get_current_span() if otel_trace is not None else NOOP_SPAN
+
+
+def record_llm_usage(current, model: str, response, messages: List[dict]):
+    """Token counts and estimated cost on a provider-attempt span (estimates when usage is unreported)."""
+    if not current.is_recording():
+        return
+    usage = usage_breakdown(response)
+    if usage is None:
+        from agent.repair import estimate_tokens, messages_tokens
+        output = response.model_dump_json() if hasattr(response, "model_dump_json") else str(response)
+        prompt_tokens, completion_tokens = messages_tokens(messages), estimate_tokens(output)
+    else:
+        prompt_tokens, completion_tokens = usage
+    current.set_attributes({
+        "llm.token_count.prompt": prompt_tokens,
+        "llm.token_count.completion": completion_tokens,
+        "llm.token_count.total": prompt_tokens + completion_tokens,
+        "llm.token_count.estimated": usage is None,
+        "llm.cost.usd": estimate_cost(model, prompt_tokens, completion_tokens),
+    })
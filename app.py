@@ -1,8 +1,6 @@
 import streamlit as st
 import time
 import os
-import json
-import datetime
 import pandas as pd
 from dotenv import load_dotenv
 import phoenix as px
@@ -14,7 +12,11 @@ import requests
 from auth import login_page
 from agent.analyst import ComplianceAgent
 from retrieval.indexer import ClauseIndexer
+from retrieval.corpus import GDPR_CORPUS_PATH, load_corpus
 from agent.schemas import ComplianceResponse
+from agent.tracing import init_tracing
+from governance.audit import get_audit_store
+from governance.decision import DecisionStatus
 
 # --- CONFIG & ASSETS ---
 st.set_page_config(page_title="ComplianceOS", page_icon="🛡️", layout="wide")
@@ -64,14 +66,20 @@ st.markdown("""
 if "authenticated" not in st.session_state: st.session_state["authenticated"] = False
 if "domain" not in st.session_state: st.session_state["domain"] = None
 if "messages" not in st.session_state: st.session_state.messages = []
-if "governance_vault" not in st.session_state: st.session_state.governance_vault = {}
 
 # --- OBSERVABILITY ---
-try:
-    if "px_session" not in st.session_state:
-        st.session_state.px_session = px.launch_app()
-    px_url = "http://localhost:6006"
-except: px_url = None
+@st.cache_resource
+def start_observability():
+    # One Phoenix instance and one tracer provider per process, not per session
+    try:
+        session = px.launch_app()
+        init_tracing(endpoint=f"{session.url.rstrip('/')}/v1/traces")
+        return session.url
+    except Exception as e:
+        print(f"⚠️ Phoenix unavailable: {e}")
+        return None
+
+px_url = start_observability()
 
 # --- AUTH CHECK ---
 if not st.session_state["authenticated"]:
@@ -83,19 +91,9 @@ if not st.session_state["authenticated"]:
 def get_agent(domain):
     # Load correct data based on Domain
     if domain == "GDPR":
-        data_path = "data/processed/gdpr_structured.json"
         try:
-            with open(data_path, "r", encoding="utf-8") as f:
-                gdpr_doc = json.load(f)
-            texts, metadata = [], []
-            for article in gdpr_doc['articles']:
-                title, art_id = article['title'], article['article_id']
-                for clause in article['clauses']:
-                    texts.append(f"Article {art_id} - {title}: {clause['text']}")
-                    metadata.append({"article_id": art_id, "clause_id": clause['clause_id'], "text": clause['text']})
-            indexer = ClauseIndexer()
-            indexer.build(texts, metadata)
-            return ComplianceAgent(indexer, data_path, domain="GDPR")
+            indexer = ClauseIndexer.from_corpus(load_corpus())
+            return ComplianceAgent(indexer, GDPR_CORPUS_PATH, domain="GDPR")
         except FileNotFoundError: return None
         
     elif domain == "FDA":
@@ -222,15 +220,7 @@ elif selected == "Agent Chat":
                     content_str = str(response)
 
                 st.session_state.messages.append({"role": "assistant", "content": content_str})
-                
-                # Auto-Log
-                qid = str(hash(prompt))
-                st.session_state.governance_vault[qid] = {
-                    "query": prompt,
-                    "domain": st.session_state["domain"],
-                    "timestamp": datetime.datetime.now().strftime("%H:%M:%S"),
-                    "response": content_str[:50] + "..."
-                }
+                # Governance decisions are written to the audit vault by the agent
 
 # --- PAGE: FDA SEARCH (DIRECT) ---
 elif selected == "FDA Search":
@@ -248,12 +238,39 @@ elif selected == "FDA Search":
 # --- PAGE: AUDIT LOGS ---
 elif selected == "Audit Logs":
     st.header("📜 Governance Vault")
-    if st.session_state.governance_vault:
-        df = pd.DataFrame(st.session_state.governance_vault.values())
+    store = get_audit_store()
+    f1, f2, f3 = st.columns(3)
+    domain_filter = f1.selectbox("Domain", ["All", "GDPR", "CCPA", "FDA"])
+    status_filter = f2.selectbox("Status", ["All"] + [s.value for s in DecisionStatus])
+    risk_filter = f3.selectbox("Risk Level", ["All", "low", "medium", "high", "critical"])
+    filters = {
+        "domain": None if domain_filter == "All" else domain_filter,
+        "status": None if status_filter == "All" else status_filter,
+        "risk_level": None if risk_filter == "All" else risk_filter,
+    }
+
+    # Keyset pagination: a stack of cursors so 'Newer' can step back
+    if st.session_state.get("audit_filters") != filters:
+        st.session_state.audit_filters = filters
+        st.session_state.audit_cursors = [None]
+    cursors = st.session_state.audit_cursors
+    page = store.query(before_id=cursors[-1], limit=50, **filters)
+
+    if page.records:
+        df = pd.DataFrame([r.model_dump(exclude={"query_hash", "response_hash"}) for r in page.records])
+        df["ts"] = pd.to_datetime(df["ts"], unit="s")
         st.dataframe(df, use_container_width=True)
     else:
         st.info("No logs found.")
 
+    p1, p2 = st.columns(2)
+    if p1.button("⬅️ Newer", disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun()
+    if p2.button("Older ➡️", disabled=page.next_cursor is None):
+        cursors.append(page.next_cursor)
+        st.rerun()
+
 # --- PAGE: ACCOUNTS ---
 elif selected == "Accounts":
     st.header("👤 User Configuration")
@@ -1,18 +1,33 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional, List
 import sys
 import os
 import asyncio
+import threading
 from sse_starlette.sse import EventSourceResponse
 import json
 
 # Add parent dir to path to import agent modules
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from agent.analyst import ComplianceAgent
-from retrieval.indexer import ClauseIndexer
+from agent.analyst import ComplianceAgent, BATCH_MAX_CONCURRENCY
+from agent.repair import REPAIR_STATS
+from agent.tiers import TIER_STATS
+from agent.scheduler import SCHEDULER, CapacityExceeded
+from agent.key_pool import pool_stats
+from agent.singleflight import INFLIGHT, request_key
+from agent.timing import STAGE_STATS, start_timings, server_timing
+from agent.metrics import REGISTRY
+from governance.audit import get_audit_store, AuditPage
+from governance.review_queue import get_review_queue, ReviewTicket, ReviewStatus, ReviewError
+from agent.schemas import ComplianceResponse
+from agent.logging_setup import get_logger, set_request_id
+from retrieval.indexer import ClauseIndexer, diff_items
+from retrieval.corpus import GDPR_CORPUS_PATH, load_corpus
+from ingestion.clause_stream import GDPR_DIFF_PATH, last_diff_seq, pending_diff
 
 app = FastAPI(title="ComplianceOS API")
 
@@ -23,85 +38,231 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID"],
 )
 
+log = get_logger("backend")
+
+@app.middleware("http")
+async def request_id_middleware(request: Request, call_next):
+    """
+    Binds a request id (the caller's X-Request-ID, or a new one) for log correlation
+    across agent stages and echoes it back.
+    """
+    request_id = set_request_id(request.headers.get("X-Request-ID"))
+    response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
 # Initialize Agent (Singleton for MVP)
 # In production, we might want per-session agents or lazy loading
 # Initialize Agent (Singleton for MVP)
 # In production, we might want per-session agents or lazy loading
 # Lazy Loading Global State
 GDPR_INDEXER = None
+GDPR_DIFF_SEQ = 0 # Last diff-journal entry the live index reflects
+GDPR_DIFF_MTIME = None # Journal mtime_ns at the last check (skips re-reading an unchanged journal)
+# Cosmetic pause between stream status events (0 for load tests)
+STREAM_STATUS_DELAY_S = float(os.getenv("STREAM_STATUS_DELAY_S", "1"))
+
+INDEXER_LOCK = threading.Lock()
+
+def _mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
 
 def get_gdpr_indexer():
-    global GDPR_INDEXER
-    if GDPR_INDEXER is None:
+    global GDPR_INDEXER, GDPR_DIFF_SEQ, GDPR_DIFF_MTIME
+    if GDPR_INDEXER is not None:
+        refresh_gdpr_indexer()
+        return GDPR_INDEXER
+    # Analyses run in worker threads: build the index once, not once per concurrent request
+    with INDEXER_LOCK:
+        if GDPR_INDEXER is not None:
+            return GDPR_INDEXER
         try:
-            print("⏳ Lazy Loading FAISS Indexer...")
-            if os.path.exists("data/processed/gdpr_structured.json"):
-                indexer = ClauseIndexer()
-                # Load and Build
-                with open("data/processed/gdpr_structured.json", "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    texts = []
-                    metadata = []
-                    if "articles" in data:
-                        for art in data["articles"]:
-                            for clause in art.get("clauses", []):
-                                texts.append(clause["text"])
-                                metadata.append({
-                                    "article_id": art["article_id"],
-                                    "clause_id": clause["clause_id"],
-                                    "text": clause["text"]
-                                })
-                    
-                    if texts:
-                        print(f"🚀 Building Index with {len(texts)} clauses...")
-                        indexer.build(texts, metadata)
-                        GDPR_INDEXER = indexer
-                    else:
-                        print("⚠️ No texts found in GDPR data!")
-            else:
-                print("⚠️ GDPR Data file not found.")
+            # Read before the corpus: a diff journaled during the build is applied on the next call
+            diff_mtime, diff_seq = _mtime_ns(GDPR_DIFF_PATH), last_diff_seq(GDPR_DIFF_PATH)
+            # Shared memory-mapped corpus; the same pages back every agent's ContextBuilder
+            indexer = ClauseIndexer.from_corpus(load_corpus())
+            log.info("index_built", extra={"clauses": len(indexer.metadata), "diff_seq": diff_seq})
+            GDPR_INDEXER, GDPR_DIFF_SEQ, GDPR_DIFF_MTIME = indexer, diff_seq, diff_mtime
         except Exception as e:
-            print(f"⚠️ Indexer Initialization Failed: {e}")
+            log.error("index_build_failed", extra={"error": str(e)[:500]})
     return GDPR_INDEXER
 
+def refresh_gdpr_indexer():
+    """
+    Applies every clause diff `python -m ingestion.run_parse` journaled since the last
+    refresh to the live index, merged into one: only the changed clauses are embedded,
+    on a copy that is swapped in when ready. In-flight analyses keep the index they
+    started with; concurrent callers do not wait.
+    """
+    global GDPR_INDEXER, GDPR_DIFF_SEQ, GDPR_DIFF_MTIME
+    diff_mtime = _mtime_ns(GDPR_DIFF_PATH)
+    if diff_mtime == GDPR_DIFF_MTIME or not INDEXER_LOCK.acquire(blocking=False):
+        return
+    try:
+        if diff_mtime != GDPR_DIFF_MTIME:
+            diff = pending_diff(GDPR_DIFF_PATH, after=GDPR_DIFF_SEQ)
+            if diff is not None:
+                # Upserts by clause id: re-applying a clause the index already has is harmless
+                GDPR_INDEXER = GDPR_INDEXER.with_changes(diff_items(diff), diff.removed)
+                log.info("index_diff_applied", extra={"from_seq": GDPR_DIFF_SEQ + 1, "to_seq": diff.seq,
+                                                      "added": len(diff.added), "changed": len(diff.changed),
+                                                      "removed": len(diff.removed), "clauses": len(GDPR_INDEXER.metadata)})
+                GDPR_DIFF_SEQ = diff.seq
+            GDPR_DIFF_MTIME = diff_mtime
+    except Exception as e:
+        # Pending entries stay pending: retried when run_parse journals the next diff
+        GDPR_DIFF_MTIME = diff_mtime
+        log.error("index_diff_failed", extra={"error": str(e)[:500]})
+    finally:
+        INDEXER_LOCK.release()
+
 class ChatRequest(BaseModel):
     query: str
     domain: str = "GDPR"
+    model_tier: str = "Tier 1" # "Tier 1" | "Tier 2" | "Tier 3" | "auto"
+
+class BatchChatRequest(BaseModel):
+    queries: List[str]
+    domain: str = "GDPR"
     model_tier: str = "Tier 1"
+    max_concurrency: Optional[int] = None # Defaults to BATCH_MAX_CONCURRENCY
+
+class ClaimRequest(BaseModel):
+    reviewer: str
+    ticket_id: Optional[str] = None # None: oldest claimable ticket
+
+class ResolveRequest(BaseModel):
+    reviewer: str
+    approved: bool
+    note: Optional[str] = None
+    response: Optional[ComplianceResponse] = None # Edited answer to approve instead of the original
 
 @app.get("/")
 def health_check():
     return {"status": "active", "system": "ComplianceOS"}
 
+@app.get("/api/stats")
+def stats_endpoint():
+    """
+    Operational counters (validation retry rates, repair token savings).
+    """
+    return {"repair": REPAIR_STATS.snapshot(), "tiers": TIER_STATS.snapshot(), "scheduler": SCHEDULER.snapshot(), "keys": pool_stats(), "coalescing": INFLIGHT.snapshot(), "stages": STAGE_STATS.snapshot()}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics_endpoint():
+    """
+    Prometheus text exposition of the pipeline counters and latency histograms.
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/audit", response_model=AuditPage)
+def audit_endpoint(domain: Optional[str] = None, status: Optional[str] = None, risk_level: Optional[str] = None,
+                   since: Optional[float] = None, until: Optional[float] = None,
+                   before_id: Optional[int] = None, limit: int = 50):
+    """
+    Governance audit records, newest first. Page with the returned next_cursor as before_id.
+    """
+    return get_audit_store().query(domain=domain, status=status, risk_level=risk_level,
+                                   since=since, until=until, before_id=before_id, limit=limit)
+
+@app.get("/api/review", response_model=List[ReviewTicket])
+def review_list_endpoint(status: Optional[ReviewStatus] = ReviewStatus.PENDING, limit: int = 50):
+    """
+    Review tickets, oldest first.
+    """
+    return get_review_queue().list_tickets(status=status, limit=limit)
+
+@app.get("/api/review/{ticket_id}", response_model=ReviewTicket)
+def review_get_endpoint(ticket_id: str):
+    try:
+        return get_review_queue().get(ticket_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown ticket {ticket_id}")
+
+@app.post("/api/review/claim", response_model=ReviewTicket)
+def review_claim_endpoint(req: ClaimRequest):
+    """
+    Claims a ticket for a reviewer (a lease; unresolved claims expire).
+    """
+    try:
+        ticket = get_review_queue().claim(req.reviewer, req.ticket_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown ticket {req.ticket_id}")
+    except ReviewError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if ticket is None:
+        raise HTTPException(status_code=404, detail="No tickets awaiting review")
+    return ticket
+
+@app.post("/api/review/{ticket_id}/resolve", response_model=ReviewTicket)
+def review_resolve_endpoint(ticket_id: str, req: ResolveRequest):
+    """
+    Approves or rejects a claimed ticket. Approved answers are served from the response cache from now on.
+    """
+    try:
+        return get_review_queue().resolve(ticket_id, req.reviewer, req.approved, note=req.note, response=req.response)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown ticket {ticket_id}")
+    except ReviewError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+def run_analysis(query: str, domain: str, model_tier: str):
+    """
+    One full analysis. Returns (response, seconds queued by the rate scheduler, stage timings,
+    review ticket id if the answer was held for human review).
+    """
+    timings = start_timings()
+    # Lazy load indexer on first GDPR request
+    indexer = get_gdpr_indexer() if domain == "GDPR" else None
+    
+    agent = ComplianceAgent(
+        indexer=indexer, 
+        data_path=GDPR_CORPUS_PATH, 
+        domain=domain,
+        model_tier=model_tier
+    )
+    outcome = agent.analyze_detailed(query)
+    return outcome.result, outcome.queue_wait_s, timings, outcome.review_ticket
+
 @app.post("/chat")
 @app.post("/api/chat")
-async def chat_endpoint(req: ChatRequest):
+async def chat_endpoint(req: ChatRequest, http_response: Response):
     """
     Standard Request-Response (Non-streaming)
     """
     try:
-        # Lazy load indexer on first request
-        indexer = get_gdpr_indexer()
-        
-        agent = ComplianceAgent(
-            indexer=indexer, 
-            data_path="data/processed/gdpr_structured.json", 
-            domain=req.domain
+        # Identical concurrent requests share one in-flight analysis (off the event loop;
+        # only the shared computation takes a worker thread)
+        key = request_key(req.query, req.domain, req.model_tier)
+        (response, queue_wait_s, timings, review_ticket), shared = await INFLIGHT.do_async(
+            key, lambda: run_analysis(req.query, req.domain, req.model_tier)
         )
-        response = agent.analyze(req.query)
+        http_response.headers["X-Queue-Wait-Seconds"] = f"{queue_wait_s:.3f}"
+        http_response.headers["X-Coalesced"] = "1" if shared else "0"
+        http_response.headers["Server-Timing"] = server_timing(timings)
+        if review_ticket:
+            http_response.headers["X-Review-Ticket"] = review_ticket
         
         # Output is likely a Pydantic object (ComplianceResponse)
         if hasattr(response, 'model_dump'):
             return response.model_dump()
-        return {"response": response} # Fallback for string
+        return {"response": response, "review_ticket": review_ticket} # Fallback for string
         
+    except CapacityExceeded as e:
+        # Shed before hitting provider 429s; clients should back off and retry
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(int(e.retry_after_s) + 1)})
     except Exception as e:
+        log.exception("chat_failed", extra={"domain": req.domain})
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/chat/stream")
-async def stream_chat_endpoint(query: str, domain: str = "GDPR"):
+async def stream_chat_endpoint(query: str, domain: str = "GDPR", model_tier: str = "Tier 1"):
     """
     Streaming Endpoint for 'Live Processing' visualization.
     We need to refactor the Agent to yield steps.
@@ -113,30 +274,32 @@ async def stream_chat_endpoint(query: str, domain: str = "GDPR"):
             "event": "status",
             "data": json.dumps({"step": "searching", "message": f"Scanning {domain} regulations..."})
         }
-        await asyncio.sleep(1) # Simulation for UI effect
+        await asyncio.sleep(STREAM_STATUS_DELAY_S) # Simulation for UI effect
         
         # 2. Yield Reading Status
         yield {
             "event": "status", 
             "data": json.dumps({"step": "reading", "message": "Analyzing legal context..."})
         }
-        await asyncio.sleep(1) # Simulation
+        await asyncio.sleep(STREAM_STATUS_DELAY_S) # Simulation
         
         # 3. Perform Actual Work
         try:
-            agent = ComplianceAgent(
-                indexer=GDPR_INDEXER, 
-                data_path="data/processed/gdpr_structured.json", 
-                domain=domain
+            key = request_key(query, domain, model_tier)
+            (response, _, timings, review_ticket), _ = await INFLIGHT.do_async(
+                key, lambda: run_analysis(query, domain, model_tier)
             )
-            response = agent.analyze(query)
+            yield {
+                "event": "timing",
+                "data": json.dumps({stage: round(seconds, 4) for stage, seconds in timings.items()})
+            }
             
             # Serialize
             final_data = {}
             if hasattr(response, 'model_dump'):
                 final_data = response.model_dump()
             else:
-                final_data = {"summary": str(response)}
+                final_data = {"summary": str(response), "review_ticket": review_ticket}
 
             yield {
                 "event": "result",
@@ -144,9 +307,52 @@ async def stream_chat_endpoint(query: str, domain: str = "GDPR"):
             }
             
         except Exception as e:
+            log.exception("stream_failed", extra={"domain": domain})
             yield {
                 "event": "error",
                 "data": json.dumps({"error": str(e)})
             }
 
     return EventSourceResponse(event_generator())
+
+@app.post("/api/chat/batch")
+async def batch_chat_endpoint(req: BatchChatRequest):
+    """
+    Batch analysis streamed as SSE: one 'result' (or 'error') event per input
+    query as it completes, then a 'done' summary. Duplicate queries are
+    analyzed once and retrieval runs as one batched pass.
+    """
+    async def event_generator():
+        try:
+            agent = ComplianceAgent(
+                indexer=get_gdpr_indexer() if req.domain == "GDPR" else None,
+                data_path=GDPR_CORPUS_PATH,
+                domain=req.domain,
+                model_tier=req.model_tier
+            )
+            items = agent.analyze_many(req.queries, max_concurrency=req.max_concurrency or BATCH_MAX_CONCURRENCY)
+        except Exception as e:
+            yield {"event": "error", "data": json.dumps({"error": str(e)})}
+            return
+
+        completed, failed = 0, 0
+        while True:
+            # The batch runs in worker threads; pull each finished item without blocking the loop
+            item = await asyncio.to_thread(next, items, None)
+            if item is None:
+                break
+            if "error" in item:
+                failed += 1
+                yield {"event": "error", "data": json.dumps(item)}
+                continue
+            completed += 1
+            result = item.pop("result")
+            item["result"] = result.model_dump() if hasattr(result, "model_dump") else {"summary": str(result)}
+            yield {"event": "result", "data": json.dumps(item)}
+
+        yield {
+            "event": "done",
+            "data": json.dumps({"total": len(req.queries), "completed": completed, "failed": failed})
+        }
+
+    return EventSourceResponse(event_generator())
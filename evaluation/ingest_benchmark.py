@@ -0,0 +1,142 @@
+import io
+import os
+import re
+import time
+import tempfile
+import fitz
+
+# Absolute imports (run from project root: python -m evaluation.ingest_benchmark)
+from ingestion.layout_parser import ARTICLE_RE, PARA_RE, assemble_articles, iter_page_blocks
+from ingestion.semantic_parser import classify_clause
+from ingestion.clause_stream import GDPR_CLAUSES_PATH, ArticleRecord, read_records
+from ingestion.dynamic_loader import DynamicLoader
+from ingestion.schemas import Article, Clause, ClauseType
+
+# Configuration (environment overrides)
+SOURCE_PDF = os.getenv("INGEST_BENCH_PDF", "data/raw/CELEX_32016R0679_EN_TXT.pdf")
+COPIES = [int(c) for c in os.getenv("INGEST_BENCH_COPIES", "1,10").split(",")]  # synthetic regulation sizes
+TEXT_MB = [float(m) for m in os.getenv("INGEST_BENCH_TEXT_MB", "1,8").split(",")]  # synthetic web-law sizes
+WORKERS = list(dict.fromkeys(int(w) for w in os.getenv("INGEST_BENCH_WORKERS", f"1,2,{os.cpu_count() or 1}").split(",")))
+
+
+def build_large_pdf(copies: int, out_path: str) -> int:
+    """Concatenates the source regulation `copies` times; returns the page count."""
+    with fitz.open(SOURCE_PDF) as src, fitz.open() as out:
+        for _ in range(copies):
+            out.insert_pdf(src)
+        out.save(out_path)
+        return len(out)
+
+
+def legacy_assemble(pages):
+    """Previous assembly: continuation text is concatenated and re-classified on every block."""
+    clauses, current = [], None
+    for blocks in pages:
+        for text in blocks:
+            if not text or len(text) < 2:
+                continue
+            if ARTICLE_RE.match(text):
+                current = None
+            elif PARA_RE.match(text):
+                current = [text, classify_clause(text)]
+                clauses.append(current)
+            elif current:
+                current[0] += f"\n{text}"
+                current[1] = classify_clause(current[0])
+    return clauses
+
+
+def build_law_text(megabytes: float) -> str:
+    """Plain-text statute ("Article N" header lines, one paragraph per line) from the clause stream, repeated to size."""
+    lines = []
+    for record in read_records(GDPR_CLAUSES_PATH):
+        lines.extend([f"Article {record.article_id}", record.title or ""] if isinstance(record, ArticleRecord) else [record.text])
+    unit = "\n".join(lines) + "\n"
+    return unit * max(1, round(megabytes * 1e6 / len(unit.encode("utf-8"))))
+
+
+LEGACY_HEADER = re.compile(r"^(Article|Section|Chapter)\s+([0-9IVX]+.*?)$", re.IGNORECASE | re.MULTILINE)
+
+
+def legacy_parse_text(text: str) -> list:
+    """Previous DynamicLoader: a pydantic Clause per line, checked against the header regex one line at a time."""
+    articles, current = [], None
+    for line in text.split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+        match = LEGACY_HEADER.match(line)
+        if match and len(line) < 100:
+            current = Article(article_id=f"{match.group(1)}-{match.group(2)}", title=line, clauses=[])
+            articles.append(current)
+            continue
+        if current is None:
+            current = Article(article_id="Intro", title="Preamble / Introduction", clauses=[])
+            articles.append(current)
+        lower_line = line.lower()
+        if "shall" in lower_line or "must" in lower_line or "required" in lower_line:
+            c_type = ClauseType.OBLIGATION
+        elif "prohibited" in lower_line or "shall not" in lower_line:
+            c_type = ClauseType.PROHIBITION
+        elif "penalty" in lower_line or "fine" in lower_line:
+            c_type = ClauseType.PENALTY
+        else:
+            c_type = ClauseType.OTHER
+        current.clauses.append(Clause(clause_id=f"{current.article_id}-{len(current.clauses) + 1}", text=line,
+                                      parent_article=current.article_id, clause_type=c_type))
+    return articles
+
+
+def text_benchmark():
+    """DynamicLoader throughput (MB/s) on plain-text laws, whole string vs chunked file reads."""
+    for megabytes in TEXT_MB:
+        text = build_law_text(megabytes)
+        size_mb = len(text.encode("utf-8")) / 1e6
+        print(f"\n🌐 {size_mb:.1f} MB plain-text law")
+
+        legacy_s, legacy = best_of(lambda: legacy_parse_text(text))
+        parse_s, document = best_of(lambda: DynamicLoader.parse_text(text, "bench", "synthetic"))
+        stream_s, rows = best_of(lambda: sum(1 for _ in DynamicLoader.iter_records(io.StringIO(text))))
+        assert [a.article_id for a in legacy] == [a.article_id for a in document.articles]
+        assert rows == document.article_count + sum(len(a.clauses) for a in document.articles)
+        for label, elapsed in (("legacy per-line", legacy_s), ("parse_text", parse_s), ("iter_records (file)", stream_s)):
+            print(f"   {label:<20} {elapsed:.3f}s  {size_mb / elapsed:6.1f} MB/s")
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def best_of(fn, runs: int = 3):
+    """Fastest of `runs` timings (the text runs are short and noisy)."""
+    return min((timed(fn) for _ in range(runs)), key=lambda r: r[0])
+
+
+def main():
+    print(f"🚀 Ingestion benchmark on {SOURCE_PDF} ({os.cpu_count()} CPUs)", flush=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        for copies in COPIES:
+            path = os.path.join(tmp, f"regulation_x{copies}.pdf")
+            pages = build_large_pdf(copies, path)
+            print(f"\n📄 {pages} pages ({copies}x)")
+
+            blocks = list(iter_page_blocks(path, workers=1))
+            legacy_s, _ = timed(lambda: legacy_assemble(blocks))
+            single_s, articles = timed(lambda: list(assemble_articles(blocks)))
+            clauses = sum(len(a.clauses) for a in articles)
+            print(f"   assembly: legacy re-classify {legacy_s:.3f}s -> classify once {single_s:.3f}s ({clauses} clauses)")
+
+            baseline = None
+            for workers in WORKERS:
+                elapsed, parsed = timed(lambda: list(assemble_articles(iter_page_blocks(path, workers=workers))))
+                baseline = baseline or elapsed
+                assert parsed == articles, "parallel parse must match the sequential parse"
+                print(f"   workers={workers:<3} {elapsed:.3f}s  {pages / elapsed:8.1f} pages/s  x{baseline / elapsed:.2f}")
+
+    text_benchmark()
+
+
+if __name__ == "__main__":
+    main()
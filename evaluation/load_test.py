@@ -0,0 +1,261 @@
+import os
+import sys
+import json
+import math
+import time
+import random
+import shutil
+import tempfile
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+
+# Absolute imports (run from project root: python -m evaluation.load_test)
+from agent.timing import BUCKETS
+
+# Configuration (environment overrides)
+DATASET_PATH = "evaluation/golden_dataset.json"
+RESULTS_PATH = os.getenv("LOAD_REPORT_PATH", "evaluation/load_test_report.json")
+BASELINE_PATH = os.getenv("LOAD_BASELINE_PATH")          # previous report to diff against
+BASE_URL = os.getenv("LOAD_BASE_URL")                    # unset: start a local backend
+PORT = int(os.getenv("LOAD_PORT", "8765"))
+DOMAIN = os.getenv("LOAD_DOMAIN", "GDPR")
+MODEL_TIER = os.getenv("LOAD_MODEL_TIER", "Tier 1")
+CONCURRENCY = int(os.getenv("LOAD_CONCURRENCY", "8"))
+TOTAL_REQUESTS = int(os.getenv("LOAD_REQUESTS", "200"))
+STREAM_SHARE = float(os.getenv("LOAD_STREAM_SHARE", "0.25"))  # share of /api/chat/stream calls
+SEED = int(os.getenv("LOAD_SEED", "7"))
+TIMEOUT_S = float(os.getenv("LOAD_TIMEOUT_S", "120"))
+
+# Local backend runs against the offline stand-ins unless told otherwise.
+# Approved answers stay in memory; the audit vault and review queue go to a
+# per-run temp dir (see start_backend), never into data/.
+LOCAL_BACKEND_ENV = {
+    "LLM_PROVIDER": "fake",
+    "TAVILY_OFFLINE": "1",
+    "SEARCH_CACHE_PATH": "",
+    "RESPONSE_CACHE_PATH": "",
+    "STREAM_STATUS_DELAY_S": "0",
+}
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    # Nearest-rank percentile
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def histogram(values):
+    counts = [0] * (len(BUCKETS) + 1)
+    for v in values:
+        counts[next((i for i, b in enumerate(BUCKETS) if v <= b), len(BUCKETS))] += 1
+    return {**{f"le_{b}": c for b, c in zip(BUCKETS, counts)}, "le_inf": counts[-1]}
+
+
+def summarize(values):
+    return {
+        "count": len(values),
+        "p50_s": round(percentile(values, 50), 4),
+        "p90_s": round(percentile(values, 90), 4),
+        "p99_s": round(percentile(values, 99), 4),
+        "max_s": round(max(values), 4) if values else 0.0,
+        "histogram": histogram(values),
+    }
+
+
+def parse_server_timing(header):
+    stages = {}
+    for part in filter(None, (p.strip() for p in (header or "").split(","))):
+        name, _, dur = part.partition(";dur=")
+        if dur:
+            stages[name] = float(dur) / 1000
+    return stages
+
+
+def load_query_mix():
+    with open(DATASET_PATH, "r", encoding="utf-8") as f:
+        questions = [d["question"] for d in json.load(f) if "id" in d]
+    rng = random.Random(SEED)
+    return [
+        {"query": rng.choice(questions), "kind": "stream" if rng.random() < STREAM_SHARE else "chat"}
+        for _ in range(TOTAL_REQUESTS)
+    ]
+
+
+def call_chat(base_url, query):
+    started = time.perf_counter()
+    resp = requests.post(f"{base_url}/api/chat", json={"query": query, "domain": DOMAIN, "model_tier": MODEL_TIER}, timeout=TIMEOUT_S)
+    result = {
+        "status": resp.status_code,
+        "latency_s": time.perf_counter() - started,
+        "stages": parse_server_timing(resp.headers.get("Server-Timing")),
+        "coalesced": resp.headers.get("X-Coalesced") == "1",
+    }
+    if not resp.ok:
+        result["error"] = resp.text[:300]
+    return result
+
+
+def call_stream(base_url, query):
+    started = time.perf_counter()
+    first_event, stages, event, error = None, {}, None, None
+    with requests.get(f"{base_url}/api/chat/stream", params={"query": query, "domain": DOMAIN, "model_tier": MODEL_TIER},
+                      stream=True, timeout=TIMEOUT_S) as resp:
+        for line in resp.iter_lines(decode_unicode=True):
+            if line.startswith("event:"):
+                event = line.split(":", 1)[1].strip()
+                first_event = first_event or time.perf_counter() - started
+            elif line.startswith("data:") and event == "timing":
+                stages = json.loads(line.split(":", 1)[1])
+            elif line.startswith("data:") and event == "error":
+                error = line.split(":", 1)[1].strip()[:300]
+        code = resp.status_code
+    result = {
+        # Errors inside an SSE stream arrive with HTTP 200; count them as 500s
+        "status": code if error is None else 500,
+        "latency_s": time.perf_counter() - started,
+        "ttfe_s": first_event or 0.0,
+        "stages": stages,
+        "coalesced": False,
+    }
+    if error:
+        result["error"] = error
+    return result
+
+
+def run_item(base_url, item):
+    try:
+        result = (call_stream if item["kind"] == "stream" else call_chat)(base_url, item["query"])
+    except Exception as e:
+        result = {"status": 0, "latency_s": 0.0, "stages": {}, "coalesced": False, "error": str(e)}
+    return {**item, **result}
+
+
+def start_backend(state_dir):
+    env = {
+        **os.environ, **LOCAL_BACKEND_ENV,
+        "AUDIT_DB_PATH": os.path.join(state_dir, "governance_audit.sqlite"),
+        "REVIEW_DB_PATH": os.path.join(state_dir, "review_queue.sqlite"),
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(PORT), "--log-level", "warning"],
+        env=env
+    )
+    base_url = f"http://127.0.0.1:{PORT}"
+    deadline = time.time() + 60
+    while time.time() < deadline and proc.poll() is None:
+        try:
+            if requests.get(f"{base_url}/", timeout=1).ok:
+                return proc, base_url
+        except requests.ConnectionError:
+            time.sleep(0.5)
+    proc.terminate()
+    raise RuntimeError("Backend did not start (exited or not healthy within 60s)")
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return None
+
+
+def build_report(results, wall_s, server_stats):
+    ok = [r for r in results if r["status"] == 200]
+    stage_names = sorted({s for r in ok for s in r["stages"]})
+    return {
+        "commit": git_commit(),
+        "config": {
+            "domain": DOMAIN, "model_tier": MODEL_TIER, "concurrency": CONCURRENCY,
+            "requests": TOTAL_REQUESTS, "stream_share": STREAM_SHARE, "seed": SEED,
+            "provider": "fake" if not BASE_URL else "external",
+        },
+        "summary": {
+            "wall_s": round(wall_s, 3),
+            "throughput_rps": round(len(results) / wall_s, 3) if wall_s else 0.0,
+            "error_rate": round(1 - len(ok) / len(results), 4) if results else 0.0,
+            "status_codes": {str(c): sum(1 for r in results if r["status"] == c) for c in sorted({r["status"] for r in results})},
+            "coalesced": sum(1 for r in results if r["coalesced"]),
+            "sample_errors": list(dict.fromkeys(r["error"] for r in results if r.get("error")))[:5],
+        },
+        "latency": {
+            kind: summarize([r["latency_s"] for r in ok if r["kind"] == kind]) for kind in ("chat", "stream")
+        },
+        "time_to_first_event": summarize([r["ttfe_s"] for r in ok if r["kind"] == "stream"]),
+        "stages": {name: summarize([r["stages"][name] for r in ok if name in r["stages"]]) for name in stage_names},
+        "server_stats": server_stats,
+    }
+
+
+def compare(report, baseline):
+    print(f"📏 Against baseline {baseline.get('commit')}:")
+    rows = [("throughput_rps", report["summary"]["throughput_rps"], baseline["summary"]["throughput_rps"])]
+    for kind in ("chat", "stream"):
+        for key in ("p50_s", "p99_s"):
+            rows.append((f"{kind}.{key}", report["latency"][kind][key], baseline["latency"][kind][key]))
+    for name, new, old in rows:
+        delta = f"{100 * (new - old) / old:+.1f}%" if old else "n/a"
+        print(f"   {name:<18} {old:>10} -> {new:<10} ({delta})")
+
+
+def main():
+    proc = None
+    state_dir = None
+    base_url = BASE_URL
+    if not base_url:
+        print("🚀 Starting local backend with the offline fake provider...", flush=True)
+        state_dir = tempfile.mkdtemp(prefix="load_test_")
+        proc, base_url = start_backend(state_dir)
+
+    try:
+        mix = load_query_mix()
+        print(f"🔥 {len(mix)} requests at concurrency {CONCURRENCY} against {base_url}", flush=True)
+        done = 0
+        lock = threading.Lock()
+
+        def tracked(item):
+            nonlocal done
+            result = run_item(base_url, item)
+            with lock:
+                done += 1
+                if done % 50 == 0:
+                    print(f"   {done}/{len(mix)} completed", flush=True)
+            return result
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+            results = list(pool.map(tracked, mix))
+        wall_s = time.perf_counter() - started
+
+        try:
+            server_stats = requests.get(f"{base_url}/api/stats", timeout=10).json()
+        except Exception:
+            server_stats = None
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait(timeout=10)
+        if state_dir:
+            shutil.rmtree(state_dir, ignore_errors=True)
+
+    report = build_report(results, wall_s, server_stats)
+    s = report["summary"]
+    print(f"📊 {s['throughput_rps']} req/s, error rate {s['error_rate']}, "
+          f"chat p50={report['latency']['chat']['p50_s']}s p99={report['latency']['chat']['p99_s']}s")
+    for name, stats in report["stages"].items():
+        print(f"   stage {name:<12} p50={stats['p50_s']}s p99={stats['p99_s']}s")
+
+    if BASELINE_PATH and os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+    with open(RESULTS_PATH, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4)
+    print(f"📝 Report saved to {RESULTS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
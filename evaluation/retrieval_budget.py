@@ -0,0 +1,101 @@
+import json
+import os
+from dotenv import load_dotenv
+
+# Absolute imports (run from project root: python -m evaluation.retrieval_budget)
+from agent.analyst import inject_domain_articles
+from agent.repair import estimate_tokens
+from agent.router import retrieval_depth
+from retrieval.context_builder import ContextBuilder
+from retrieval.fusion import adaptive_cutoff
+from retrieval.indexer import ClauseIndexer
+from retrieval.corpus import GDPR_CORPUS_PATH, load_corpus
+
+load_dotenv()
+
+# Configuration
+DATASET_PATH = "evaluation/golden_dataset.json"
+RESULTS_PATH = "evaluation/retrieval_budget.json"
+GDPR_DATA_PATH = GDPR_CORPUS_PATH
+# adaptive_cutoff settings replayed next to the defaults: (rel_threshold, max_drop)
+SWEEP = [(float(r), float(d)) for r, d in (p.split(":") for p in os.getenv(
+    "RETRIEVAL_BUDGET_SWEEP", "0.5:0.35,0.6:0.35,0.7:0.35,0.75:0.35,0.8:0.35,0.85:0.35,0.9:0.35,0.75:0.2,0.75:0.1").split(","))]
+
+def context_for(results, query: str, builder: ContextBuilder):
+    """Mirrors the analyst: retrieved articles + domain injection, expanded in full."""
+    ids = inject_domain_articles(query.lower(), {str(r['article_id']) for r in results})
+    context = "\n\n".join(builder.expand_article_by_id(aid) for aid in sorted(ids))
+    return ids, estimate_tokens(context)
+
+def main():
+    print("🚀 Measuring retrieval context budget (fixed k vs adaptive cutoff)...", flush=True)
+
+    with open(DATASET_PATH, "r", encoding="utf-8") as f:
+        dataset = [d for d in json.load(f) if "id" in d]
+
+    indexer = ClauseIndexer.from_corpus(load_corpus(GDPR_DATA_PATH))
+    builder = ContextBuilder(GDPR_DATA_PATH)
+
+    encoder = "all-MiniLM-L6-v2" if indexer.index is not None else "none (citations + BM25 only)"
+    print(f"🔎 Dense encoder: {encoder}")
+
+    rows, sweep_tokens, sweep_recall = [], {setting: 0 for setting in SWEEP}, {setting: 0.0 for setting in SWEEP}
+    for entry in dataset:
+        query = entry['question']
+        k = retrieval_depth(query)
+        fixed = indexer.hybrid_search(query, k=k)
+        adaptive = adaptive_cutoff(fixed, max_k=k)
+        expected = {str(c['unit_id']) for c in entry.get('expected_citations', [])}
+
+        for rel_threshold, max_drop in SWEEP:
+            ids, tokens = context_for(adaptive_cutoff(fixed, max_k=k, rel_threshold=rel_threshold, max_drop=max_drop), query, builder)
+            sweep_tokens[(rel_threshold, max_drop)] += tokens
+            sweep_recall[(rel_threshold, max_drop)] += len(expected & ids) / len(expected) if expected else 1.0
+
+        fixed_ids, fixed_tokens = context_for(fixed, query, builder)
+        adaptive_ids, adaptive_tokens = context_for(adaptive, query, builder)
+
+        rows.append({
+            "question_id": entry['id'],
+            "k": k,
+            "fixed_hits": len(fixed),
+            "adaptive_hits": len(adaptive),
+            "fixed_articles": len(fixed_ids),
+            "adaptive_articles": len(adaptive_ids),
+            "fixed_tokens": fixed_tokens,
+            "adaptive_tokens": adaptive_tokens,
+            "fixed_recall": len(expected & fixed_ids) / len(expected) if expected else 1.0,
+            "adaptive_recall": len(expected & adaptive_ids) / len(expected) if expected else 1.0,
+        })
+
+    fixed_total = sum(r['fixed_tokens'] for r in rows)
+    adaptive_total = sum(r['adaptive_tokens'] for r in rows)
+    summary = {
+        "encoder": encoder,
+        "cases": len(rows),
+        "fixed_prompt_tokens": fixed_total,
+        "adaptive_prompt_tokens": adaptive_total,
+        "tokens_saved": fixed_total - adaptive_total,
+        "tokens_saved_pct": round(100 * (fixed_total - adaptive_total) / fixed_total, 2) if fixed_total else 0.0,
+        "fixed_recall": round(sum(r['fixed_recall'] for r in rows) / len(rows), 4) if rows else 0.0,
+        "adaptive_recall": round(sum(r['adaptive_recall'] for r in rows) / len(rows), 4) if rows else 0.0,
+    }
+
+    print(f"📊 Context tokens: fixed={fixed_total} adaptive={adaptive_total} (saved {summary['tokens_saved_pct']}%)")
+    print(f"🎯 Expected-article recall: fixed={summary['fixed_recall']} adaptive={summary['adaptive_recall']}")
+
+    sweep = []
+    print("\n   rel_threshold  max_drop  tokens  saved%  recall")
+    for setting in SWEEP:
+        tokens, recall = sweep_tokens[setting], round(sweep_recall[setting] / len(rows), 4) if rows else 0.0
+        saved = round(100 * (fixed_total - tokens) / fixed_total, 2) if fixed_total else 0.0
+        sweep.append({"rel_threshold": setting[0], "max_drop": setting[1], "prompt_tokens": tokens,
+                      "tokens_saved_pct": saved, "recall": recall})
+        print(f"   {setting[0]:>13} {setting[1]:>9} {tokens:>7} {saved:>7} {recall:>7}")
+
+    with open(RESULTS_PATH, "w", encoding="utf-8") as f:
+        json.dump({"summary": summary, "sweep": sweep, "cases": rows}, f, indent=4)
+    print(f"📝 Results saved to {RESULTS_PATH}")
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,26 @@
 import json
 import os
-import re
 import sys
 from tqdm import tqdm
 from dotenv import load_dotenv
 
 # Absolute imports
 from agent.analyst import ComplianceAgent
+from retrieval.citations import parse_citations, CitationSet
 from retrieval.indexer import ClauseIndexer
+from retrieval.corpus import GDPR_CORPUS_PATH, load_corpus
 
 load_dotenv()
 
 # Configuration
 DATASET_PATH = "evaluation/golden_dataset.json"
 RESULTS_PATH = "evaluation/eval_results.json"
-GDPR_DATA_PATH = "data/processed/gdpr_structured.json"
+GDPR_DATA_PATH = GDPR_CORPUS_PATH
 
-def check_citation_match(response_text: str, expected_unit: dict) -> bool:
-    unit_id = expected_unit['unit_id']
-    unit_type = expected_unit['unit_type']
-    # Regex for "Article 25", "Art. 25", "Art 25"
-    pattern = rf"(?i)\b({unit_type}|Art\.?)\s*{re.escape(unit_id)}\b"
-    return bool(re.search(pattern, response_text))
+def check_citation_match(response_text, expected_unit: dict) -> bool:
+    # Accepts raw text or a pre-parsed CitationSet ("Article 25", "Art. 25(1)", "Art 25")
+    cites = response_text if isinstance(response_text, CitationSet) else parse_citations(response_text)
+    return str(expected_unit['unit_id']) in cites.articles
 
 def evaluate_response(question_data: dict, response_text: str) -> dict:
     score = 0.0
@@ -50,8 +49,9 @@ def evaluate_response(question_data: dict, response_text: str) -> dict:
             score = 1.0; passed = True
         else:
             matches = 0
+            cites = parse_citations(response_text)
             for cit in expected:
-                if check_citation_match(response_text, cit):
+                if check_citation_match(cites, cit):
                     matches += 1
                 else:
                     feedback.append(f"❌ Missed: {cit['unit_id']}")
@@ -84,33 +84,14 @@ def main():
 
     # --- STEP 2: BUILD INDEX ---
     print("⚙️  Loading GDPR Data...", flush=True)
-    if not os.path.exists(GDPR_DATA_PATH):
+    try:
+        corpus = load_corpus(GDPR_DATA_PATH)
+    except FileNotFoundError:
         print(f"❌ ERROR: GDPR data not found at {GDPR_DATA_PATH}")
         return
 
-    with open(GDPR_DATA_PATH, "r", encoding="utf-8") as f:
-        gdpr_doc = json.load(f)
-
-    texts = []
-    metadata = []
-    
-    print("🔹 Pre-processing Articles...", flush=True)
-    for article in gdpr_doc['articles']:
-        title = article['title']
-        art_id = article['article_id']
-        for clause in article['clauses']:
-            full_text = f"Article {art_id} - {title}: {clause['text']}"
-            texts.append(full_text)
-            metadata.append({
-                "article_id": art_id,
-                "clause_id": clause['clause_id'],
-                "text": clause['text']
-            })
-
-    print(f"🔹 Building Index for {len(texts)} clauses (this uses GPU)...", flush=True)
-    indexer = ClauseIndexer()
-    # verify build works
-    indexer.build(texts, metadata)
+    print(f"🔹 Building Index for {len(corpus)} clauses (this uses GPU)...", flush=True)
+    indexer = ClauseIndexer.from_corpus(corpus)
     print("✅ Index Build Complete.", flush=True)
 
     # --- STEP 3: RUN AGENT ---
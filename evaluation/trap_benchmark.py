@@ -1,9 +1,9 @@
 import os
 import re
-import json
 from dotenv import load_dotenv
 from agent.analyst import ComplianceAgent
 from retrieval.indexer import ClauseIndexer
+from retrieval.corpus import GDPR_CORPUS_PATH, load_corpus
 
 load_dotenv()
 
@@ -36,18 +36,8 @@ def run_traps():
     print("🚀 Starting Legal Logic Trap Suite...")
     
     # 1. Setup Agent (In-memory build for speed)
-    data_path = "data/processed/gdpr_structured.json"
-    with open(data_path, "r", encoding="utf-8") as f:
-        gdpr_doc = json.load(f)
-    texts, metadata = [], []
-    for article in gdpr_doc['articles']:
-        for clause in article['clauses']:
-            texts.append(f"Article {article['article_id']}: {clause['text']}")
-            metadata.append({"article_id": article['article_id'], "clause_id": clause['clause_id'], "text": clause['text']})
-    
-    indexer = ClauseIndexer()
-    indexer.build(texts, metadata)
-    agent = ComplianceAgent(indexer, data_path)
+    indexer = ClauseIndexer.from_corpus(load_corpus())
+    agent = ComplianceAgent(indexer, GDPR_CORPUS_PATH)
     
     score = 0
     
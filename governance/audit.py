@@ -0,0 +1,227 @@
+"""
+Append-only governance audit vault.
+
+Every classify_decision outcome is appended with the query, citations,
+model, latency and content hashes. Appends only enqueue; a writer thread
+drains the queue and commits each batch in one transaction (group commit),
+so the request path never waits on disk. Rows cannot be updated or deleted
+(enforced by triggers). Reads page by keyset (id cursor) over composite
+indexes, so page N costs the same as page 1 at any table size.
+"""
+import os
+import json
+import atexit
+import time
+import queue
+import sqlite3
+import hashlib
+import threading
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+from agent.logging_setup import get_logger
+
+log = get_logger("audit")
+
+AUDIT_DB_PATH = os.getenv("AUDIT_DB_PATH", "data/audit/governance_audit.sqlite")
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "256"))
+AUDIT_FLUSH_INTERVAL_S = float(os.getenv("AUDIT_FLUSH_INTERVAL_S", "0.25"))
+MAX_PAGE_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS audit_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    request_id TEXT,
+    domain TEXT NOT NULL,
+    status TEXT NOT NULL,
+    risk_level TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    reason TEXT,
+    model TEXT,
+    model_tier TEXT,
+    latency_s REAL,
+    query TEXT NOT NULL,
+    query_hash TEXT NOT NULL,
+    response_hash TEXT,
+    citations TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_audit_ts ON audit_log (ts);
+CREATE INDEX IF NOT EXISTS idx_audit_domain ON audit_log (domain, id);
+CREATE INDEX IF NOT EXISTS idx_audit_status ON audit_log (status, id);
+CREATE INDEX IF NOT EXISTS idx_audit_risk ON audit_log (risk_level, id);
+CREATE INDEX IF NOT EXISTS idx_audit_query_hash ON audit_log (query_hash);
+CREATE TRIGGER IF NOT EXISTS audit_no_update BEFORE UPDATE ON audit_log
+BEGIN SELECT RAISE(ABORT, 'audit_log is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS audit_no_delete BEFORE DELETE ON audit_log
+BEGIN SELECT RAISE(ABORT, 'audit_log is append-only'); END;
+"""
+
+COLUMNS = [
+    "ts", "request_id", "domain", "status", "risk_level", "confidence", "reason", "model",
+    "model_tier", "latency_s", "query", "query_hash", "response_hash", "citations",
+]
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class AuditRecord(BaseModel):
+    id: Optional[int] = None
+    ts: float = Field(default_factory=time.time)
+    request_id: Optional[str] = None
+    domain: str
+    status: str
+    risk_level: str
+    confidence: float
+    reason: Optional[str] = None
+    model: Optional[str] = None
+    model_tier: Optional[str] = None
+    latency_s: Optional[float] = None
+    query: str
+    query_hash: str = ""
+    response_hash: Optional[str] = None
+    citations: List[str] = Field(default_factory=list)
+
+    def row(self) -> tuple:
+        values = self.model_dump()
+        values["query_hash"] = self.query_hash or content_hash(self.query)
+        values["citations"] = json.dumps(self.citations)
+        return tuple(values[c] for c in COLUMNS)
+
+
+class AuditPage(BaseModel):
+    records: List[AuditRecord]
+    next_cursor: Optional[int] = Field(None, description="Pass as before_id for the next (older) page.")
+
+
+class AuditStore:
+    def __init__(self, path: str = AUDIT_DB_PATH, batch_size: int = AUDIT_BATCH_SIZE,
+                 flush_interval_s: float = AUDIT_FLUSH_INTERVAL_S):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Writer thread owns one connection; readers share another. WAL lets reads run during a group commit.
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._db.commit()
+        self._reader = sqlite3.connect(path, check_same_thread=False)
+        self._reader_lock = threading.Lock()
+
+        self._queue: "queue.Queue[Optional[AuditRecord]]" = queue.Queue()
+        self.batches = 0
+        self.written = 0
+        self._writer = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._writer.start()
+
+    def append(self, record: AuditRecord):
+        """Enqueues a record; it is durable after the writer's next group commit."""
+        self._queue.put(record)
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                self._queue.task_done()
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval_s
+            stop = False
+            # Group commit: gather whatever else arrives within the flush interval
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._write(batch)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: List[AuditRecord]):
+        placeholders = ",".join("?" * len(COLUMNS))
+        try:
+            self._db.executemany(f"INSERT INTO audit_log ({','.join(COLUMNS)}) VALUES ({placeholders})", [r.row() for r in batch])
+            self._db.commit()
+            self.batches += 1
+            self.written += len(batch)
+        except sqlite3.Error as e:
+            log.error("audit_write_failed", extra={"records_lost": len(batch), "error": str(e)})
+
+    def flush(self):
+        """Blocks until every record appended so far is committed."""
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(None)
+        self._writer.join()
+        self._db.close()
+        with self._reader_lock:
+            self._reader.close()
+
+    def query(self, domain: Optional[str] = None, status: Optional[str] = None, risk_level: Optional[str] = None,
+              since: Optional[float] = None, until: Optional[float] = None,
+              before_id: Optional[int] = None, limit: int = 50) -> AuditPage:
+        """Newest first. Keyset pagination: pass the returned next_cursor as before_id."""
+        clauses, params = [], []
+        for column, value in (("domain", domain), ("status", status), ("risk_level", risk_level)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(until)
+        if before_id is not None:
+            clauses.append("id < ?")
+            params.append(before_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        with self._reader_lock:
+            rows = self._reader.execute(
+                f"SELECT id, {','.join(COLUMNS)} FROM audit_log {where} ORDER BY id DESC LIMIT ?",
+                (*params, limit + 1)
+            ).fetchall()
+
+        records = [self._record(row) for row in rows[:limit]]
+        next_cursor = records[-1].id if len(rows) > limit else None
+        return AuditPage(records=records, next_cursor=next_cursor)
+
+    def counts(self, since: Optional[float] = None) -> dict:
+        """Decisions per status (optionally since a timestamp)."""
+        where, params = ("WHERE ts >= ?", (since,)) if since is not None else ("", ())
+        with self._reader_lock:
+            rows = self._reader.execute(f"SELECT status, COUNT(*) FROM audit_log {where} GROUP BY status", params).fetchall()
+        return dict(rows)
+
+    @staticmethod
+    def _record(row: tuple) -> AuditRecord:
+        values = dict(zip(["id"] + COLUMNS, row))
+        values["citations"] = json.loads(values["citations"])
+        return AuditRecord(**values)
+
+
+_STORE: Optional[AuditStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_audit_store() -> AuditStore:
+    """Process-wide vault at AUDIT_DB_PATH."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = AuditStore()
+            atexit.register(_STORE.flush)
+        return _STORE
@@ -0,0 +1,226 @@
+"""
+Human review queue for REVIEW_REQUIRED decisions.
+
+The analyst submits the full ComplianceResponse and GovernanceDecision and
+gets a ticket id back at once; a question that already has an open ticket
+(same domain and normalized query) gets that ticket's id instead of a
+duplicate. Reviewers claim the oldest pending ticket
+(a claim is a lease: abandoned tickets return to the pool after
+REVIEW_LEASE_S), then approve or reject it, optionally with an edited
+response. Approved answers are written to the response cache, keyed by
+domain and normalized query, and served for the same question afterwards
+without another LLM call.
+"""
+import os
+import time
+import uuid
+import sqlite3
+import threading
+from enum import Enum
+from typing import List, Optional
+from pydantic import BaseModel
+
+from agent.schemas import ComplianceResponse
+from agent.search_cache import SearchCache, cache_key
+from governance.decision import GovernanceDecision
+
+REVIEW_DB_PATH = os.getenv("REVIEW_DB_PATH", "data/review/review_queue.sqlite")
+REVIEW_LEASE_S = float(os.getenv("REVIEW_LEASE_S", "900"))
+RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH", "data/cache/response_cache.sqlite")
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", str(30 * 24 * 3600)))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS review_items (
+    ticket_id TEXT PRIMARY KEY,
+    created REAL NOT NULL,
+    status TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    query TEXT NOT NULL,
+    model_tier TEXT,
+    request_id TEXT,
+    response TEXT NOT NULL,
+    decision TEXT NOT NULL,
+    reviewer TEXT,
+    claimed_at REAL,
+    resolved_at REAL,
+    note TEXT,
+    cache_key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_review_status ON review_items (status, created);
+CREATE INDEX IF NOT EXISTS idx_review_key ON review_items (cache_key, status);
+"""
+
+
+class ReviewStatus(str, Enum):
+    PENDING = "pending"
+    CLAIMED = "claimed"
+    APPROVED = "approved"
+    REJECTED = "rejected"
+
+
+class ReviewError(ValueError):
+    """Ticket is not in a state that allows the requested transition."""
+
+
+class ReviewTicket(BaseModel):
+    ticket_id: str
+    created: float
+    status: ReviewStatus
+    domain: str
+    query: str
+    model_tier: Optional[str] = None
+    request_id: Optional[str] = None
+    response: ComplianceResponse
+    decision: GovernanceDecision
+    reviewer: Optional[str] = None
+    claimed_at: Optional[float] = None
+    resolved_at: Optional[float] = None
+    note: Optional[str] = None
+
+
+FIELDS = list(ReviewTicket.model_fields)
+
+
+def response_cache_key(domain: str, query: str) -> str:
+    return cache_key(query, {"domain": domain})
+
+
+_RESPONSE_CACHE: Optional[SearchCache] = None
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+
+def get_response_cache() -> SearchCache:
+    """Reviewer-approved answers (RESPONSE_CACHE_PATH='' keeps them in memory only)."""
+    global _RESPONSE_CACHE
+    with _RESPONSE_CACHE_LOCK:
+        if _RESPONSE_CACHE is None:
+            _RESPONSE_CACHE = SearchCache(path=RESPONSE_CACHE_PATH or None, ttl_s=RESPONSE_CACHE_TTL,
+                                          max_entries=10000, name="response")
+        return _RESPONSE_CACHE
+
+
+class ReviewQueue:
+    def __init__(self, path: str = REVIEW_DB_PATH, lease_s: float = REVIEW_LEASE_S, response_cache: Optional[SearchCache] = None):
+        self.path = path
+        self.lease_s = lease_s
+        self.response_cache = response_cache
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+        self._db.commit()
+        self._lock = threading.Lock()
+
+    def submit(self, domain: str, query: str, response: ComplianceResponse, decision: GovernanceDecision,
+               model_tier: Optional[str] = None, request_id: Optional[str] = None) -> str:
+        """New pending ticket, or the open (pending/claimed) ticket already held for this question."""
+        key = response_cache_key(domain, query)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT ticket_id FROM review_items WHERE cache_key = ? AND status IN ('pending', 'claimed') "
+                "ORDER BY created LIMIT 1", (key,)
+            ).fetchone()
+            if row is not None:
+                return row[0]
+            ticket_id = uuid.uuid4().hex
+            self._db.execute(
+                "INSERT INTO review_items (ticket_id, created, status, domain, query, model_tier, request_id, response, decision, cache_key) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (ticket_id, time.time(), ReviewStatus.PENDING.value, domain, query, model_tier, request_id,
+                 response.model_dump_json(), decision.model_dump_json(), key)
+            )
+            self._db.commit()
+        return ticket_id
+
+    def get(self, ticket_id: str) -> ReviewTicket:
+        with self._lock:
+            row = self._db.execute(f"SELECT {','.join(FIELDS)} FROM review_items WHERE ticket_id = ?", (ticket_id,)).fetchone()
+        if row is None:
+            raise KeyError(ticket_id)
+        return self._ticket(row)
+
+    def list_tickets(self, status: Optional[ReviewStatus] = ReviewStatus.PENDING, limit: int = 50) -> List[ReviewTicket]:
+        """Oldest first."""
+        where, params = ("WHERE status = ?", (ReviewStatus(status).value,)) if status else ("", ())
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {','.join(FIELDS)} FROM review_items {where} ORDER BY created LIMIT ?", (*params, limit)
+            ).fetchall()
+        return [self._ticket(row) for row in rows]
+
+    def claim(self, reviewer: str, ticket_id: Optional[str] = None) -> Optional[ReviewTicket]:
+        """
+        Claims a specific ticket, or the oldest claimable one. Tickets whose
+        claim lease expired are claimable again. Returns None if nothing is available.
+        """
+        now = time.time()
+        claimable = "(status = 'pending' OR (status = 'claimed' AND claimed_at < ?))"
+        with self._lock:
+            if ticket_id is None:
+                row = self._db.execute(
+                    f"SELECT ticket_id FROM review_items WHERE {claimable} ORDER BY created LIMIT 1", (now - self.lease_s,)
+                ).fetchone()
+                if row is None:
+                    return None
+                ticket_id = row[0]
+            claimed = self._db.execute(
+                f"UPDATE review_items SET status = 'claimed', reviewer = ?, claimed_at = ? WHERE ticket_id = ? AND {claimable}",
+                (reviewer, now, ticket_id, now - self.lease_s)
+            ).rowcount
+            self._db.commit()
+        if not claimed:
+            current = self.get(ticket_id)  # KeyError if unknown
+            raise ReviewError(f"Ticket {ticket_id} is {current.status.value} (reviewer: {current.reviewer})")
+        return self.get(ticket_id)
+
+    def resolve(self, ticket_id: str, reviewer: str, approved: bool, note: Optional[str] = None,
+                response: Optional[ComplianceResponse] = None) -> ReviewTicket:
+        """
+        Approves (optionally with an edited response) or rejects a ticket claimed by
+        this reviewer. Approved answers go to the response cache.
+        """
+        status = ReviewStatus.APPROVED if approved else ReviewStatus.REJECTED
+        with self._lock:
+            params = [status.value, time.time(), note]
+            edit = ""
+            if response is not None:
+                edit = ", response = ?"
+                params.append(response.model_dump_json())
+            updated = self._db.execute(
+                f"UPDATE review_items SET status = ?, resolved_at = ?, note = ?{edit} "
+                "WHERE ticket_id = ? AND status = 'claimed' AND reviewer = ?",
+                (*params, ticket_id, reviewer)
+            ).rowcount
+            self._db.commit()
+
+        ticket = self.get(ticket_id)
+        if not updated:
+            raise ReviewError(f"Ticket {ticket_id} is {ticket.status.value} (reviewer: {ticket.reviewer}); claim it first")
+        if approved:
+            cache = self.response_cache or get_response_cache()
+            cache.set(response_cache_key(ticket.domain, ticket.query), ticket.response.model_dump(mode="json"))
+        return ticket
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._db.execute("SELECT status, COUNT(*) FROM review_items GROUP BY status").fetchall())
+
+    @staticmethod
+    def _ticket(row: tuple) -> ReviewTicket:
+        values = dict(zip(FIELDS, row))
+        values["response"] = ComplianceResponse.model_validate_json(values["response"])
+        values["decision"] = GovernanceDecision.model_validate_json(values["decision"])
+        return ReviewTicket(**values)
+
+
+_QUEUE: Optional[ReviewQueue] = None
+_QUEUE_LOCK = threading.Lock()
+
+
+def get_review_queue() -> ReviewQueue:
+    """Process-wide queue at REVIEW_DB_PATH."""
+    global _QUEUE
+    with _QUEUE_LOCK:
+        if _QUEUE is None:
+            _QUEUE = ReviewQueue()
+        return _QUEUE
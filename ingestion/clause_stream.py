@@ -0,0 +1,172 @@
+"""
+Line-delimited clause stream.
+
+The parsed regulation is stored as JSONL: one `article` line (id and title)
+followed by one `clause` line per clause of that article, in document order.
+Writers consume generators and append line by line; readers yield records
+lazily, so neither side ever holds the whole document in memory.
+"""
+import os
+import json
+from typing import Iterable, Iterator, List, Literal, Optional, Tuple, Union
+from pydantic import BaseModel, Field
+
+from ingestion.schemas import Article, Clause
+
+GDPR_PDF_PATH = "data/raw/CELEX_32016R0679_EN_TXT.pdf"
+GDPR_CLAUSES_PATH = "data/processed/gdpr_clauses.jsonl"
+# Append-only journal of clause-level changes (ingestion/incremental.py), one numbered diff per line
+GDPR_DIFF_PATH = "data/processed/gdpr_clauses.diff.jsonl"
+
+
+class ArticleRecord(BaseModel):
+    type: Literal["article"] = "article"
+    article_id: str
+    title: Optional[str] = None
+
+
+class ClauseRecord(Clause):
+    type: Literal["clause"] = "clause"
+
+
+Record = Union[ArticleRecord, ClauseRecord]
+
+class ClauseChange(BaseModel):
+    article: ArticleRecord
+    clause: ClauseRecord
+
+
+class ClauseDiff(BaseModel):
+    seq: int = Field(default=0, description="Position in the diff journal (0: not journaled).")
+    added: List[ClauseChange] = Field(default_factory=list)
+    changed: List[ClauseChange] = Field(default_factory=list)
+    removed: List[str] = Field(default_factory=list, description="Clause ids.")
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.changed or self.removed)
+
+    def then(self, newer: "ClauseDiff") -> "ClauseDiff":
+        """One diff with the effect of this one followed by `newer` (latest text per clause wins)."""
+        entries = {c.clause.clause_id: ("added", c) for c in self.added}
+        entries.update({c.clause.clause_id: ("changed", c) for c in self.changed})
+        removed = dict.fromkeys(self.removed)
+        for clause_id in newer.removed:
+            entries.pop(clause_id, None)
+            removed[clause_id] = None
+        for kind, changes in (("added", newer.added), ("changed", newer.changed)):
+            for change in changes:
+                clause_id = change.clause.clause_id
+                removed.pop(clause_id, None)
+                entries[clause_id] = (entries[clause_id][0] if clause_id in entries else kind, change)
+        return ClauseDiff(
+            seq=max(self.seq, newer.seq),
+            added=[c for kind, c in entries.values() if kind == "added"],
+            changed=[c for kind, c in entries.values() if kind == "changed"],
+            removed=list(removed),
+        )
+
+
+# `type` is the first field of ArticleRecord, so header lines can be spotted without parsing JSON
+ARTICLE_LINE_PREFIX = b'{"type":"article"'
+
+
+def article_records(articles: Iterable[Article]) -> Iterator[Record]:
+    """Flattens articles (e.g. from assemble_articles) into the record stream."""
+    for article in articles:
+        yield ArticleRecord(article_id=article.article_id, title=article.title)
+        for clause in article.clauses:
+            yield ClauseRecord(**clause.model_dump())
+
+
+def stream_pdf_records(pdf_path: str, workers: Optional[int] = None) -> Iterator[Record]:
+    """Records straight from the PDF; each article is emitted as soon as the next one starts."""
+    # Lazy: readers of the stream should not need PyMuPDF installed
+    from ingestion.layout_parser import INGEST_WORKERS, assemble_articles, iter_page_blocks
+    pages = iter_page_blocks(pdf_path, workers=INGEST_WORKERS if workers is None else workers)
+    return article_records(assemble_articles(pages))
+
+
+def write_jsonl(records: Iterable[Record], path: str) -> int:
+    """
+    Writes records incrementally to a temp file and swaps it into place, so
+    readers never see a half-written stream. Returns the number of lines.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    count = 0
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(record.model_dump_json())
+            f.write("\n")
+            count += 1
+    os.replace(tmp_path, path)
+    return count
+
+
+def read_diffs(path: str = GDPR_DIFF_PATH, after: int = 0) -> Iterator[ClauseDiff]:
+    """Journaled diffs with seq > `after`, oldest first."""
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                diff = ClauseDiff.model_validate_json(line)
+                if diff.seq > after:
+                    yield diff
+
+
+def last_diff_seq(path: str = GDPR_DIFF_PATH) -> int:
+    return max((diff.seq for diff in read_diffs(path)), default=0)
+
+
+def append_diff(diff: ClauseDiff, path: str = GDPR_DIFF_PATH) -> int:
+    """
+    Journals a non-empty diff under the next sequence number and returns it.
+    Earlier entries are kept, so a consumer that missed several runs still
+    sees every change.
+    """
+    seq = last_diff_seq(path) + 1
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(diff.model_copy(update={"seq": seq}).model_dump_json() + "\n")
+    return seq
+
+
+def pending_diff(path: str = GDPR_DIFF_PATH, after: int = 0) -> Optional[ClauseDiff]:
+    """Every journaled diff newer than `after`, merged into one (None if there are none)."""
+    merged = None
+    for diff in read_diffs(path, after):
+        merged = diff if merged is None else merged.then(diff)
+    return merged
+
+
+def parse_record(line: str) -> Record:
+    data = json.loads(line)
+    return ArticleRecord(**data) if data.get("type") == "article" else ClauseRecord(**data)
+
+
+def read_records(path: str) -> Iterator[Record]:
+    """
+    Lazily yields records from a JSONL stream. A legacy structured JSON
+    document (.json) is converted on the fly.
+    """
+    if not path.endswith(".jsonl"):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        yield from article_records(Article(**a) for a in data.get("articles", []))
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield parse_record(line)
+
+
+def iter_titled_clauses(path: str) -> Iterator[Tuple[ArticleRecord, ClauseRecord]]:
+    """Clauses paired with their article header (for title-enriched indexing)."""
+    article = None
+    for record in read_records(path):
+        if isinstance(record, ArticleRecord):
+            article = record
+        else:
+            yield article, record
@@ -1,94 +1,176 @@
 from datetime import datetime
+import io
+import os
 import re
-from ingestion.schemas import LegalDocument, Article, Clause, ClauseType
+from itertools import repeat
+from typing import Iterable, Iterator, List, NamedTuple, TextIO, Union
+from ingestion.schemas import LegalDocument, ClauseType
+
+# Generic Regex for headers: "Article 1", "Section 2.3", "Chapter IV" on a line of their own.
+# Runs over whole text blocks (MULTILINE); [^\S\n] keeps every match inside one line.
+HEADER_PATTERN = re.compile(
+    r"^[^\S\n]*((Article|Section|Chapter)[^\S\n]+([0-9IVX]+.*?))[^\S\n]*$", re.IGNORECASE | re.MULTILINE
+)
+MAX_HEADER_LEN = 100  # longer lines are content even if they start like a header
+
+READ_CHUNK_CHARS = int(os.getenv("LOADER_CHUNK_CHARS", str(1 << 20)))
+CLASSIFY_BATCH_SIZE = int(os.getenv("LOADER_BATCH_SIZE", "1024"))
+
+TextSource = Union[str, TextIO, Iterable[str]]
+
+
+class ArticleRow(NamedTuple):
+    article_id: str
+    title: str
+
+
+class ClauseRow(NamedTuple):
+    clause_id: str
+    text: str
+    parent_article: str
+    clause_type: ClauseType
+
+
+def iter_text_blocks(source: TextSource, chunk_chars: int = READ_CHUNK_CHARS) -> Iterator[str]:
+    """
+    Text blocks that end on a line boundary, from a string, a text file object
+    (read in chunks) or any iterable of text chunks; chunk boundaries may fall
+    anywhere, even mid-line.
+    """
+    if isinstance(source, str):
+        source = io.StringIO(source)
+    chunks = iter(lambda: source.read(chunk_chars), "") if hasattr(source, "read") else source
+
+    tail = ""
+    for chunk in chunks:
+        text = tail + chunk
+        cut = text.rfind("\n") + 1
+        if cut:
+            yield text[:cut]
+        tail = text[cut:]
+    if tail:
+        yield tail
+
+
+def classify_batch(lines: List[str]) -> List[ClauseType]:
+    """
+    Naive classification (can use LLM here later) for a batch of single lines,
+    lowered in one call. "shall not" / "must not" contain the obligation
+    keywords, so prohibitions are picked out of the obligation branch.
+    """
+    types = []
+    append = types.append
+    for line in "\n".join(lines).lower().split("\n"):
+        if "shall" in line or "must" in line or "required" in line:
+            prohibited = "shall not" in line or "must not" in line or "prohibited" in line
+            append(ClauseType.PROHIBITION if prohibited else ClauseType.OBLIGATION)
+        elif "prohibited" in line:
+            append(ClauseType.PROHIBITION)
+        elif "penalty" in line or "fine" in line:
+            append(ClauseType.PENALTY)
+        else:
+            append(ClauseType.OTHER)
+    return types
+
 
 class DynamicLoader:
     """
     Parses generic text into the LegalDocument structure.
-    Since we don't have perfect 'Article X' regex for every law, 
-    we use a generic chunking strategy.
+    Since we don't have perfect 'Article X' regex for every law,
+    we use a generic chunking strategy: every non-empty line under a
+    header is a clause.
     """
-    
+
+    @staticmethod
+    def iter_row_batches(source: TextSource, batch_size: int = CLASSIFY_BATCH_SIZE) -> Iterator[List[Union[ArticleRow, ClauseRow]]]:
+        """
+        Lists of ArticleRow / ClauseRow tuples in document order. Each input
+        block is split at header lines with one regex pass; content lines are
+        buffered and classified together once at least batch_size are pending.
+        """
+        pending: list = []   # ArticleRow, or the number of clauses that follow in the batch
+        ids: List[str] = []
+        texts: List[str] = []
+        parents: List[str] = []
+        article_id = None
+        clause_count = 0
+
+        def add_content(segment: str):
+            nonlocal article_id, clause_count
+            lines = list(filter(None, map(str.strip, segment.split("\n"))))
+            if not lines:
+                return
+            if article_id is None:
+                # Content before the first header goes to a dummy Intro article
+                article_id, clause_count = "Intro", 0
+                pending.append(ArticleRow(article_id, "Preamble / Introduction"))
+            pending.append(len(lines))
+            ids.extend([f"{article_id}-{n}" for n in range(clause_count + 1, clause_count + len(lines) + 1)])
+            texts.extend(lines)
+            parents.extend([article_id] * len(lines))
+            clause_count += len(lines)
+
+        def flush() -> list:
+            # tuple.__new__ builds the NamedTuples without a Python-level __new__ call per row
+            clauses = list(map(tuple.__new__, repeat(ClauseRow), zip(ids, texts, parents, classify_batch(texts))))
+            rows, offset = [], 0
+            for item in pending:
+                if type(item) is ArticleRow:
+                    rows.append(item)
+                else:
+                    rows.extend(clauses[offset:offset + item])
+                    offset += item
+            for buffer in (pending, ids, texts, parents):
+                buffer.clear()
+            return rows
+
+        for block in iter_text_blocks(source):
+            # Header lines split the block; everything between them is clause text
+            position = 0
+            for match in HEADER_PATTERN.finditer(block):
+                header = match.group(1)
+                if len(header) >= MAX_HEADER_LEN:
+                    continue
+                add_content(block[position:match.start()])
+                article_id, clause_count = f"{match.group(2)}-{match.group(3)}", 0
+                pending.append(ArticleRow(article_id, header))
+                position = match.end()
+            add_content(block[position:])
+            if len(texts) >= batch_size:
+                yield flush()
+
+        if pending:
+            yield flush()
+
+    @staticmethod
+    def iter_records(source: TextSource, batch_size: int = CLASSIFY_BATCH_SIZE) -> Iterator[Union[ArticleRow, ClauseRow]]:
+        """Streams ArticleRow / ClauseRow tuples in document order."""
+        for rows in DynamicLoader.iter_row_batches(source, batch_size):
+            yield from rows
+
+    @staticmethod
+    def parse_stream(source: TextSource, title: str, source_url: str, batch_size: int = CLASSIFY_BATCH_SIZE) -> LegalDocument:
+        """
+        Builds the LegalDocument from the row stream. Rows stay plain tuples until
+        the end and are validated in a single model_validate call.
+        """
+        articles: List[dict] = []
+        clauses: list = []
+        for rows in DynamicLoader.iter_row_batches(source, batch_size):
+            for row in rows:
+                if type(row) is ArticleRow:
+                    clauses = []
+                    articles.append({"article_id": row.article_id, "title": row.title, "clauses": clauses})
+                else:
+                    clauses.append(row)
+
+        return LegalDocument.model_validate({
+            "source": source_url,
+            "parsed_at": datetime.now(),
+            "article_count": len(articles),
+            "articles": articles,
+        }, from_attributes=True)
+
     @staticmethod
     def parse_text(text: str, title: str, source_url: str) -> LegalDocument:
-        articles = []
-        
-        # Split by typical legal headers (Section, Article, Chapter)
-        # If none found, we split by paragraphs.
-        
-        # Generic Regex for headers: "Article 1", "Section 2.3", "Chapter IV"
-        # We look for a line that starts with these keywords and is short (< 50 chars)
-        HEADER_PATTERN = re.compile(r"^(Article|Section|Chapter)\s+([0-9IVX]+.*?)$", re.IGNORECASE | re.MULTILINE)
-        
-        # We iterate through the text
-        lines = text.split('\n')
-        current_article = None
-        current_clauses = []
-        
-        article_counter = 1
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            match = HEADER_PATTERN.match(line)
-            if match and len(line) < 100:
-                # Save previous
-                if current_article:
-                    current_article.clauses = current_clauses
-                    articles.append(current_article)
-                
-                # Start new
-                art_type = match.group(1)
-                art_num = match.group(2)
-                art_id = f"{art_type}-{art_num}"
-                
-                current_article = Article(
-                    article_id=art_id,
-                    title=line,
-                    clauses=[]
-                )
-                current_clauses = []
-            else:
-                # It's content
-                if current_article is None:
-                    # Create a dummy Intro article
-                    current_article = Article(
-                        article_id="Intro", 
-                        title="Preamble / Introduction", 
-                        clauses=[]
-                    )
-                
-                # Check if it's a new clause (simple heuristic: if it looks like a list item or new para)
-                # For now, every non-empty line is a clause/paragraph
-                clause_id = f"{current_article.article_id}-{len(current_clauses)+1}"
-                
-                # Naive classification (can use LLM here later)
-                c_type = ClauseType.OTHER
-                lower_line = line.lower()
-                if "shall" in lower_line or "must" in lower_line or "required" in lower_line:
-                    c_type = ClauseType.OBLIGATION
-                elif "prohibited" in lower_line or "shall not" in lower_line:
-                    c_type = ClauseType.PROHIBITION
-                elif "penalty" in lower_line or "fine" in lower_line:
-                    c_type = ClauseType.PENALTY
-                    
-                current_clauses.append(Clause(
-                    clause_id=clause_id,
-                    text=line,
-                    parent_article=current_article.article_id,
-                    clause_type=c_type
-                ))
-
-        # Append last
-        if current_article:
-            current_article.clauses = current_clauses
-            articles.append(current_article)
-            
-        return LegalDocument(
-            source=source_url,
-            parsed_at=datetime.now(),
-            article_count=len(articles),
-            articles=articles
-        )
+        return DynamicLoader.parse_stream(text, title, source_url)
@@ -0,0 +1,207 @@
+"""
+Incremental re-ingestion.
+
+A manifest next to the clause stream records a content hash per PDF page,
+plus a hash and page span per article. On re-ingestion only pages whose
+hash changed trigger work: parsing restarts at the header page of the
+first article touching a changed page and stops at the first article
+header after the last changed page, where the parser state is back in sync
+with the previous run. The reparsed articles are spliced into the stream
+and the clause-level diff is returned and appended to the GDPR_DIFF_PATH
+journal, where the backend picks up every entry it has not applied yet and
+patches its live index (refresh_gdpr_indexer).
+"""
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from pydantic import BaseModel, Field
+
+from ingestion.clause_stream import (
+    ArticleRecord, ClauseRecord, ClauseChange, ClauseDiff, GDPR_CLAUSES_PATH, GDPR_DIFF_PATH, GDPR_PDF_PATH,
+    append_diff, article_records, iter_titled_clauses, read_records, write_jsonl,
+)
+from ingestion.layout_parser import INGEST_WORKERS, assemble_articles, iter_page_blocks, page_hashes
+from ingestion.schemas import Article
+from ingestion.utils import hash_text
+
+GDPR_MANIFEST_PATH = "data/processed/gdpr_manifest.json"
+
+
+class ArticleEntry(BaseModel):
+    hash: str
+    first_page: int
+    last_page: int
+
+
+class IngestManifest(BaseModel):
+    source: str
+    page_hashes: List[str]
+    articles: Dict[str, ArticleEntry] = Field(default_factory=dict, description="In document order.")
+
+
+class IngestResult(BaseModel):
+    full: bool
+    pages_total: int
+    pages_changed: int
+    pages_parsed: int
+    articles_reparsed: int
+    diff: ClauseDiff
+
+
+class ManifestMismatch(RuntimeError):
+    """The clause stream on disk does not match the manifest; a full parse is needed."""
+
+
+def article_hash(article: Article) -> str:
+    parts = [article.title or ""] + [f"{c.clause_id}|{c.clause_type.value}|{c.text}" for c in article.clauses]
+    return hash_text("\n".join(parts))
+
+
+def load_manifest(path: str = GDPR_MANIFEST_PATH) -> Optional[IngestManifest]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return IngestManifest.model_validate_json(f.read())
+
+
+def _write_model(model: BaseModel, path: str):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(model.model_dump_json(indent=2))
+    os.replace(tmp_path, path)
+
+
+class _PageCounter:
+    """Passes pages through, counting them; `done` is set once the source is exhausted."""
+    def __init__(self, pages: Iterable[List[str]]):
+        self.pages = pages
+        self.count = 0
+        self.done = False
+
+    def __iter__(self):
+        for page in self.pages:
+            self.count += 1
+            yield page
+        self.done = True
+
+
+def _restart_page(manifest: IngestManifest, changed: List[int]) -> int:
+    """Header page of the earliest article containing the first changed page (or that page itself)."""
+    first = changed[0]
+    containing = [e.first_page for e in manifest.articles.values() if e.first_page <= first <= e.last_page]
+    return min(containing, default=first)
+
+
+def diff_clauses(old: Dict[str, Tuple[ArticleRecord, ClauseRecord]], new_articles: List[Article],
+                 unchanged: Iterable[str] = ()) -> ClauseDiff:
+    """
+    Compares replaced clauses (clause_id -> (article, clause)) with reparsed
+    articles. Articles listed in `unchanged` (equal article hash) are skipped
+    without comparing their clauses.
+    """
+    old = dict(old)
+    unchanged = set(unchanged)
+    diff = ClauseDiff()
+    for article in new_articles:
+        header = ArticleRecord(article_id=article.article_id, title=article.title)
+        for clause in article.clauses:
+            previous = old.pop(clause.clause_id, None)
+            if article.article_id in unchanged:
+                continue
+            record = ClauseRecord(**clause.model_dump())
+            if previous is None:
+                diff.added.append(ClauseChange(article=header, clause=record))
+            elif previous[0].title != header.title or previous[1] != record:
+                diff.changed.append(ClauseChange(article=header, clause=record))
+    diff.removed = list(old)
+    return diff
+
+
+def _splice(clauses_path: str, order: List[str], lo: int, hi: int, new_articles: List[Article],
+            replaced: Dict[str, Tuple[ArticleRecord, ClauseRecord]]) -> Iterator:
+    """
+    Streams the old records with articles order[lo:hi] swapped for `new_articles`.
+    The replaced clauses are collected into `replaced` for the diff.
+    """
+    index, header, skipping = -1, None, False
+    for record in read_records(clauses_path):
+        if isinstance(record, ArticleRecord):
+            index += 1
+            if index >= len(order) or record.article_id != order[index]:
+                raise ManifestMismatch(f"article {record.article_id} at position {index}")
+            if index == lo:
+                yield from article_records(new_articles)
+            header, skipping = record, lo <= index < hi
+        if skipping:
+            if isinstance(record, ClauseRecord):
+                replaced[record.clause_id] = (header, record)
+            continue
+        yield record
+    if index + 1 != len(order):
+        raise ManifestMismatch(f"{index + 1} articles in stream, {len(order)} in manifest")
+    if lo == len(order):
+        yield from article_records(new_articles)
+
+
+def reingest(pdf_path: str = GDPR_PDF_PATH, clauses_path: str = GDPR_CLAUSES_PATH,
+             manifest_path: str = GDPR_MANIFEST_PATH, diff_path: Optional[str] = GDPR_DIFF_PATH,
+             full: bool = False) -> IngestResult:
+    """
+    Brings the clause stream up to date with the PDF and returns what changed.
+    Falls back to a full parse without a usable manifest or when the page count changed.
+    """
+    hashes = page_hashes(pdf_path)
+    manifest = None if full else load_manifest(manifest_path)
+    full = manifest is None or len(manifest.page_hashes) != len(hashes) or not os.path.exists(clauses_path)
+    changed = list(range(len(hashes))) if full else [p for p, (a, b) in enumerate(zip(manifest.page_hashes, hashes)) if a != b]
+
+    if not changed:
+        return IngestResult(full=False, pages_total=len(hashes), pages_changed=0, pages_parsed=0,
+                            articles_reparsed=0, diff=ClauseDiff())
+
+    start = 0 if full else _restart_page(manifest, changed)
+    spans: Dict[str, List[int]] = {}
+    pages = _PageCounter(iter_page_blocks(pdf_path, workers=INGEST_WORKERS if full else 1, start=start))
+    new_articles: List[Article] = []
+    resync_id = None
+    for article in assemble_articles(pages, first_page=start, spans=spans):
+        new_articles.append(article)
+        page = start + pages.count - 1
+        if not full and not pages.done and page > changed[-1]:
+            # Yielded at a header on an unchanged page past the last change: the rest matches the old parse
+            resync_id = next(reversed(spans))
+            break
+
+    old_entries = {} if full else manifest.articles
+    order = list(old_entries)
+    lo = next((i for i, aid in enumerate(order) if old_entries[aid].first_page >= start), len(order))
+    if resync_id is not None and (resync_id not in old_entries or old_entries[resync_id].first_page != spans[resync_id][0]):
+        return reingest(pdf_path, clauses_path, manifest_path, diff_path, full=True)
+    hi = order.index(resync_id) if resync_id is not None else len(order)
+
+    replaced: Dict[str, Tuple[ArticleRecord, ClauseRecord]] = {}
+    try:
+        if full:
+            if os.path.exists(clauses_path):
+                for header, clause in iter_titled_clauses(clauses_path):
+                    replaced[clause.clause_id] = (header, clause)
+            write_jsonl(article_records(new_articles), clauses_path)
+        else:
+            write_jsonl(_splice(clauses_path, order, lo, hi, new_articles, replaced), clauses_path)
+    except ManifestMismatch:
+        return reingest(pdf_path, clauses_path, manifest_path, diff_path, full=True)
+
+    new_entries = {a.article_id: ArticleEntry(hash=article_hash(a), first_page=spans[a.article_id][0],
+                                              last_page=spans[a.article_id][1]) for a in new_articles}
+    unchanged = [aid for aid, entry in new_entries.items() if aid in old_entries and old_entries[aid].hash == entry.hash]
+    diff = diff_clauses(replaced, new_articles, unchanged)
+
+    articles = {aid: old_entries[aid] for aid in order[:lo]}
+    articles.update(new_entries)
+    articles.update({aid: old_entries[aid] for aid in order[hi:]})
+    _write_model(IngestManifest(source=pdf_path, page_hashes=hashes, articles=articles), manifest_path)
+    if diff_path and not diff.is_empty():
+        diff.seq = append_diff(diff, diff_path)
+
+    return IngestResult(full=full, pages_total=len(hashes), pages_changed=len(changed), pages_parsed=pages.count,
+                        articles_reparsed=len(new_articles), diff=diff)
+
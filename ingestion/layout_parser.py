@@ -1,64 +1,132 @@
+import os
 import re
 import fitz
 from datetime import datetime
-from schemas import Article, Clause, LegalDocument
-from semantic_parser import classify_clause
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple
+from ingestion.schemas import Article, Clause, LegalDocument
+from ingestion.semantic_parser import classify_clause
+from ingestion.utils import hash_text
 
 ARTICLE_RE = re.compile(r"^Article\s+(\d+)$", re.IGNORECASE)
-PARA_RE = re.compile(r"^(\d+)\.\s+") 
-
-def parse_gdpr_pdf(path: str) -> LegalDocument:
-    doc = fitz.open(path)
-    articles = []
-    current_article = None
-
-    for page in doc:
-        blocks = page.get_text("blocks")
-        for i, block in enumerate(blocks):
-            text = block[4].strip()
-            if not text or len(text) < 2: 
+PARA_RE = re.compile(r"^(\d+)\.\s+")
+
+# Page extraction workers (1 = in-process, no pool)
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "1"))
+# Pages per worker task; contiguous shards keep each worker's file access sequential
+PAGES_PER_SHARD = int(os.getenv("INGEST_PAGES_PER_SHARD", "16"))
+
+
+def extract_pages(path: str, start: int, stop: int) -> List[List[str]]:
+    """Stripped text blocks for pages [start, stop). Top-level so process pools can pickle it."""
+    pages = []
+    with fitz.open(path) as doc:
+        for page_no in range(start, stop):
+            pages.append([block[4].strip() for block in doc[page_no].get_text("blocks")])
+    return pages
+
+
+def page_hashes(path: str) -> List[str]:
+    """
+    Content hash per page, taken from the raw content streams: about 10x
+    cheaper than text extraction, so unchanged pages are never extracted.
+    """
+    with fitz.open(path) as doc:
+        return [hash_text(page.read_contents().decode("latin-1")) for page in doc]
+
+
+def iter_page_blocks(path: str, workers: int = INGEST_WORKERS, pages_per_shard: int = PAGES_PER_SHARD,
+                     start: int = 0) -> Iterator[List[str]]:
+    """
+    Yields each page's text blocks in page order, from page `start`. With
+    workers > 1, page shards are extracted in a process pool; results are
+    consumed in shard order, so the stream is identical to the sequential one.
+    """
+    with fitz.open(path) as doc:
+        page_count = len(doc)
+    shards = [(s, min(s + pages_per_shard, page_count)) for s in range(start, page_count, pages_per_shard)]
+
+    if workers <= 1:
+        for start, stop in shards:
+            yield from extract_pages(path, start, stop)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(extract_pages, path, start, stop) for start, stop in shards]
+        for future in futures:
+            yield from future.result()
+
+
+class _OpenClause:
+    """Clause under construction: continuation blocks are collected, joined and classified once."""
+    __slots__ = ("clause_id", "article_id", "parts")
+
+    def __init__(self, clause_id: str, article_id: str, text: str):
+        self.clause_id = clause_id
+        self.article_id = article_id
+        self.parts = [text]
+
+    def close(self) -> Clause:
+        text = "\n".join(self.parts)
+        return Clause(clause_id=self.clause_id, text=text, parent_article=self.article_id, clause_type=classify_clause(text))
+
+
+def assemble_articles(pages: Iterable[List[str]], first_page: int = 0, spans: Optional[dict] = None) -> Iterator[Article]:
+    """
+    Article state machine over the page stream. Articles and clauses continue
+    across page boundaries; an article header's title is the next non-empty
+    block, even when it starts the next page. If `spans` is given, it records
+    article_id -> [header page, last page with article text] (pages counted
+    from `first_page`).
+    """
+    current: Optional[Article] = None
+    clauses: List[_OpenClause] = []
+    awaiting_title = False
+
+    def finish() -> Article:
+        current.clauses = [c.close() for c in clauses]
+        return current
+
+    for page_no, blocks in enumerate(pages, start=first_page):
+        for text in blocks:
+            if not text or len(text) < 2:
                 continue
 
             # 1. Detect Article Header
             art_match = ARTICLE_RE.match(text)
             if art_match:
-                if current_article:
-                    articles.append(current_article)
-                
-                art_id = art_match.group(1)
-                
-                # LOOK-AHEAD: Capture the title from the next block
-                title = ""
-                if i + 1 < len(blocks):
-                    title = blocks[i+1][4].strip()
-                
-                current_article = Article(article_id=art_id, title=title, clauses=[])
+                finished = finish() if current else None
+                current, clauses = Article(article_id=art_match.group(1), title="", clauses=[]), []
+                awaiting_title = True
+                if spans is not None:
+                    spans[current.article_id] = [page_no, page_no]
+                if finished:
+                    yield finished
                 continue
+            if current and spans is not None:
+                spans[current.article_id][1] = page_no
 
-            # 2. Skip title block if already consumed
-            if current_article and text == current_article.title:
+            # 2. The block after the header is its title
+            if awaiting_title:
+                current.title, awaiting_title = text, False
+                continue
+            if current and text == current.title:
                 continue
 
             # 3. Detect Clauses / Paragraphs
-            if current_article:
+            if current:
                 para_match = PARA_RE.match(text)
                 if para_match:
-                    p_num = para_match.group(1)
-                    # Correct integration of Semantic Classification
-                    current_article.clauses.append(Clause(
-                        clause_id=f"{current_article.article_id}-{p_num}",
-                        text=text,
-                        parent_article=current_article.article_id,
-                        clause_type=classify_clause(text)  # <--- Semantic tag applied here
-                    ))
-                elif current_article.clauses:
-                    # Append sub-points or continuation text
-                    current_article.clauses[-1].text += f"\n{text}"
-                    # Re-classify in case a continuation adds an "OBLIGATION" keyword like 'shall'
-                    current_article.clauses[-1].clause_type = classify_clause(current_article.clauses[-1].text)
+                    clauses.append(_OpenClause(f"{current.article_id}-{para_match.group(1)}", current.article_id, text))
+                elif clauses:
+                    # Sub-points or continuation text
+                    clauses[-1].parts.append(text)
 
     # Append the very last article found
-    if current_article:
-        articles.append(current_article)
-        
-    return LegalDocument(source=path, articles=articles, parsed_at=datetime.now(), article_count=len(articles))
\ No newline at end of file
+    if current:
+        yield finish()
+
+
+def parse_gdpr_pdf(path: str, workers: int = INGEST_WORKERS) -> LegalDocument:
+    articles = list(assemble_articles(iter_page_blocks(path, workers=workers)))
+    return LegalDocument(source=path, articles=articles, parsed_at=datetime.now(), article_count=len(articles))
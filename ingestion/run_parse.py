@@ -1,33 +1,47 @@
-import json
-from datetime import datetime, timezone
-from layout_parser import parse_gdpr_pdf
-
-doc = parse_gdpr_pdf("data/raw/CELEX_32016R0679_EN_TXT.pdf")
-
-output = {
-    "source": doc.source,
-    "parsed_at": datetime.now(timezone.utc).isoformat(),
-    "article_count": len(doc.articles),
-    "articles": [article.model_dump() for article in doc.articles]
-}
-
-
-# Replace the old json.dump logic with this:
-with open("data/processed/gdpr_structured.json", "w", encoding="utf-8") as f:
-    # model_dump_json() handles dates, enums, and complex types automatically
-    f.write(doc.model_dump_json(indent=4))
-
-print("✅ Structured data successfully saved to data/processed/gdpr_structured.json")
-# Add this to the end of your run_parse.py
-import json
-import os
-
-# 1. Ensure the directory exists
-os.makedirs("data/processed", exist_ok=True)
-
-# 2. Use ONLY the Pydantic-native save method
-with open("data/processed/gdpr_structured.json", "w", encoding="utf-8") as f:
-    # This single line handles the whole document AND the datetime/enum issues
-    f.write(doc.model_dump_json(indent=4))
-
-print("✅ Structured data successfully saved to data/processed/gdpr_structured.json")
\ No newline at end of file
+# Run from project root: python -m ingestion.run_parse [--full] [--json]
+# Only pages whose content hash changed since the last run are reparsed (--full reparses everything).
+# INGEST_WORKERS=n parses pages in parallel on full runs; --json also writes the legacy structured document.
+# The compiled corpus (retrieval/corpus.py) is rebuilt whenever the clause stream changes; a running
+# backend applies the saved clause diff to its live index on its next GDPR request.
+import sys
+import time
+from ingestion.clause_stream import GDPR_CLAUSES_PATH, GDPR_PDF_PATH, read_records
+from ingestion.incremental import GDPR_DIFF_PATH, reingest
+from retrieval.corpus import GDPR_CORPUS_PATH, corpus_is_stale, write_corpus
+
+LEGACY_JSON_PATH = "data/processed/gdpr_structured.json"
+
+
+def write_legacy_json(jsonl_path: str, json_path: str):
+    """Rebuilds the single-document JSON from the stream (this one materializes the document)."""
+    from datetime import datetime
+    from ingestion.clause_stream import ArticleRecord
+    from ingestion.schemas import Article, Clause, LegalDocument
+
+    articles = []
+    for record in read_records(jsonl_path):
+        if isinstance(record, ArticleRecord):
+            articles.append(Article(article_id=record.article_id, title=record.title, clauses=[]))
+        else:
+            articles[-1].clauses.append(Clause(**record.model_dump(exclude={"type"})))
+    doc = LegalDocument(source=GDPR_PDF_PATH, articles=articles, parsed_at=datetime.now(), article_count=len(articles))
+    with open(json_path, "w", encoding="utf-8") as f:
+        f.write(doc.model_dump_json(indent=4))
+
+
+if __name__ == "__main__":
+    started = time.perf_counter()
+    result = reingest(GDPR_PDF_PATH, GDPR_CLAUSES_PATH, full="--full" in sys.argv)
+    diff = result.diff
+    mode = "full parse" if result.full else "incremental"
+    print(f"✅ {mode}: {result.pages_changed}/{result.pages_total} pages changed, {result.pages_parsed} parsed, "
+          f"{result.articles_reparsed} articles rebuilt in {time.perf_counter() - started:.2f}s")
+    print(f"   Clause diff: +{len(diff.added)} ~{len(diff.changed)} -{len(diff.removed)} -> {GDPR_DIFF_PATH}")
+
+    if not diff.is_empty() or corpus_is_stale(GDPR_CORPUS_PATH, GDPR_CLAUSES_PATH):
+        size = write_corpus(read_records(GDPR_CLAUSES_PATH), GDPR_CORPUS_PATH)
+        print(f"✅ Corpus compiled to {GDPR_CORPUS_PATH} ({size / 1024:.0f} KB)")
+
+    if "--json" in sys.argv:
+        write_legacy_json(GDPR_CLAUSES_PATH, LEGACY_JSON_PATH)
+        print(f"✅ Structured data saved to {LEGACY_JSON_PATH}")
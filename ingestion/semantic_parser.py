@@ -1,4 +1,4 @@
-from schemas import ClauseType
+from ingestion.schemas import ClauseType
 
 def classify_clause(text: str) -> ClauseType:
     t = text.lower()
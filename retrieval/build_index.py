@@ -1,32 +1,10 @@
-import json
-from indexer import ClauseIndexer
+# Absolute imports (run from project root: python -m retrieval.build_index)
+from retrieval.indexer import ClauseIndexer
+from retrieval.corpus import load_corpus
 
-# Load the structured GDPR data you saved in Step 1.3
-with open("data/processed/gdpr_structured.json", "r", encoding="utf-8") as f:
-    data = json.load(f)
-
-# Inside build_index.py
-texts_to_embed = []
-metadatas = []
-
-indexer = ClauseIndexer()
-
-for article in data["articles"]:
-    article_title = article.get("title", "GDPR")
-    for clause in article["clauses"]:
-        # Title Injection for Article 25 hits
-        enriched_text = f"Article {article['article_id']} - {article_title}: {clause['text']}"
-        texts_to_embed.append(enriched_text)
-        
-        # KEY: This dictionary MUST contain 'article_id'
-        metadatas.append({
-            "article_id": str(article["article_id"]),
-            "clause_id": clause["clause_id"],
-            "clause_type": clause.get("clause_type", "other"),
-            "text": clause["text"]
-        })
-
-indexer.build(texts_to_embed, metadatas)
+# Compiled corpus from ingestion/run_parse.py; each text carries its article
+# title (title injection for Article 25 hits), metadata keeps 'article_id'
+indexer = ClauseIndexer.from_corpus(load_corpus())
 
 
 
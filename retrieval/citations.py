@@ -0,0 +1,113 @@
+# retrieval/citations.py
+"""
+Citation grammar shared by retrieval, validation and evaluation.
+
+One compiled pattern extracts every citation form we care about in a single
+pass over the text:
+- article references:    'Article 25', 'Art. 17(3)(b)', 'Section 5'
+- GDPR subsection tokens: '17(3)(b)', '83(2)(c)', '6(1)'
+- CCPA sections:          '§1798.140(v)(1)', '1798.105'
+"""
+import re
+from typing import List, Optional, Set, Tuple
+from pydantic import BaseModel, Field
+
+CITATION_RE = re.compile(
+    r"(?P<ccpa>§?\s?1798\.\d+(?:\([a-zA-Z0-9]+\))*)"
+    r"|(?P<unit>\b(?:Articles?|Art\.?|Section))\s*(?P<unit_id>\d{1,3})(?P<unit_tail>(?:\(\d{1,2}\))?(?:\([a-z]{1,2}\))?)"
+    r"|(?P<sub>(?<![\w.])\d{1,3}\(\d{1,2}\)(?:\([a-z]{1,2}\))?)",
+    re.IGNORECASE
+)
+
+# CCPA section with at least one parenthesised point, e.g. '1798.140(v)(1)'
+CCPA_SECTION_RE = re.compile(r"1798\.\d+(?:\([a-zA-Z0-9]+\))+")
+
+SUBSECTION_RE = re.compile(r"^(\d{1,3})\((\d{1,2})\)(?:\(([a-z]{1,2})\))?$")
+# A point label opening a line. Inline '(x)' in the corpus are cross-references
+# ('point (c) of Article 6(1)'), not points of the paragraph itself.
+POINT_RE = re.compile(r"^[ \t]*\(([a-z]{1,2})\)\s", re.MULTILINE)
+
+
+class CitationSet(BaseModel):
+    """
+    Normalized citations found in a piece of text.
+    `tokens` keeps document order (with repeats); the sets are deduplicated.
+    """
+    tokens: List[str] = Field(default_factory=list)
+    articles: Set[str] = Field(default_factory=set)
+    paragraphs: Set[str] = Field(default_factory=set)
+    subsections: Set[str] = Field(default_factory=set)
+    ccpa: Set[str] = Field(default_factory=set)
+
+    def count(self, prefix: str, points: Optional[str] = None) -> int:
+        """Counts point-level tokens under `prefix` (e.g. '83(2)'), optionally limited to a letter range."""
+        n = 0
+        for t in self.tokens:
+            if t.startswith(prefix + "(") and t.count("(") == 2:
+                letter = t[len(prefix) + 1:-1]
+                if points is None or letter in points:
+                    n += 1
+        return n
+
+
+def normalize_subsection(article: str, paragraph: Optional[str], point: Optional[str]) -> str:
+    token = str(int(article))
+    if paragraph:
+        token += f"({int(paragraph)})"
+        if point:
+            token += f"({point.lower()})"
+    return token
+
+
+def split_subsection(token: str) -> Optional[Tuple[str, Optional[str], Optional[str]]]:
+    """'17(3)(b)' -> ('17', '3', 'b'); None if the token is not a subsection."""
+    m = SUBSECTION_RE.match(token.strip().lower())
+    if not m:
+        return None
+    return m.group(1), m.group(2), m.group(3)
+
+
+def clause_citation_tokens(article_id: str, clause_id: str, text: str) -> List[str]:
+    """
+    Tokens a numbered paragraph answers to: '17(3)' plus '17(3)(b)' per point.
+    Empty when the clause id carries no paragraph number.
+    """
+    para = str(clause_id).rsplit("-", 1)[-1]
+    if not para.isdigit():
+        return []
+    base = f"{int(article_id)}({int(para)})"
+    return [base] + [f"{base}({point})" for point in dict.fromkeys(POINT_RE.findall(text or ""))]
+
+
+def _add(cites: CitationSet, token: str):
+    cites.tokens.append(token)
+    parts = split_subsection(token)
+    if parts and parts[2]:
+        cites.subsections.add(token)
+    elif parts:
+        cites.paragraphs.add(token)
+
+
+def parse_citations(text: str) -> CitationSet:
+    """
+    Extracts all normalized citation tokens from `text` in a single pass.
+    """
+    cites = CitationSet()
+    if not text:
+        return cites
+    for m in CITATION_RE.finditer(text):
+        if m.group("ccpa"):
+            section = m.group("ccpa").lstrip("§").strip()
+            cites.ccpa.add(section)
+            cites.tokens.append(section)
+        elif m.group("unit"):
+            art = str(int(m.group("unit_id")))
+            cites.articles.add(art)
+            tail = m.group("unit_tail")
+            if tail:
+                _add(cites, art + tail.lower())
+            else:
+                cites.tokens.append(art)
+        else:
+            _add(cites, m.group("sub").lower())
+    return cites
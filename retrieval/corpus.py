@@ -0,0 +1,246 @@
+# retrieval/corpus.py
+"""
+Compiled clause corpus.
+
+One binary file holds the regulation as columns: UTF-8 string heaps with
+offset arrays (article ids and titles, clause ids and texts), a clause type
+code per clause, and an article -> first-clause offset table, so any
+article is two array reads away. The file is memory-mapped and strings are
+decoded only when accessed; every process shares the same pages.
+
+Layout: MAGIC | u32 header length | JSON header (section name -> dtype,
+offset, count) | 8-byte aligned sections.
+"""
+import os
+import json
+import mmap
+import struct
+import logging
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from ingestion.clause_stream import ArticleRecord, ClauseRecord, GDPR_CLAUSES_PATH, Record, read_records
+from ingestion.schemas import ClauseType
+
+GDPR_CORPUS_PATH = "data/processed/gdpr_corpus.bin"
+
+log = logging.getLogger("compliance.retrieval")
+
+MAGIC = b"CLCORP01"
+CLAUSE_TYPES = list(ClauseType)
+_TYPE_CODES = {t: i for i, t in enumerate(CLAUSE_TYPES)}
+
+
+def clause_item(article_id: str, title: Optional[str], clause: dict, title_in_text: bool = True) -> tuple[str, dict]:
+    """
+    The (text to embed, metadata) pair every index is built from. Title
+    injection helps article-level hits such as Article 25.
+    """
+    text = f"Article {article_id} - {title or 'GDPR'}: {clause['text']}" if title_in_text else clause["text"]
+    return text, {
+        "article_id": article_id,
+        "clause_id": clause["clause_id"],
+        "clause_type": clause["clause_type"],
+        "text": clause["text"],
+    }
+
+
+class _StringColumn:
+    """Accumulates strings into one UTF-8 heap plus an offset array."""
+    def __init__(self):
+        self.heap = bytearray()
+        self.offsets = [0]
+
+    def append(self, value: Optional[str]):
+        self.heap += (value or "").encode("utf-8")
+        self.offsets.append(len(self.heap))
+
+
+def compile_corpus(records: Iterable[Record]) -> bytes:
+    """Compiles a record stream (article header, then its clauses) into the binary format."""
+    article_ids, titles, clause_ids, texts = _StringColumn(), _StringColumn(), _StringColumn(), _StringColumn()
+    clause_start, clause_types, clause_article = [], [], []
+
+    for record in records:
+        if isinstance(record, ArticleRecord):
+            article_ids.append(record.article_id)
+            titles.append(record.title)
+            clause_start.append(len(clause_types))
+        else:
+            clause_ids.append(record.clause_id)
+            texts.append(record.text)
+            clause_types.append(_TYPE_CODES[record.clause_type])
+            clause_article.append(len(clause_start) - 1)
+    clause_start.append(len(clause_types))
+
+    sections = {
+        "article_id_offsets": np.asarray(article_ids.offsets, dtype="<u4"),
+        "article_id_heap": np.frombuffer(bytes(article_ids.heap), dtype=np.uint8),
+        "title_offsets": np.asarray(titles.offsets, dtype="<u4"),
+        "title_heap": np.frombuffer(bytes(titles.heap), dtype=np.uint8),
+        "clause_start": np.asarray(clause_start, dtype="<u4"),
+        "clause_id_offsets": np.asarray(clause_ids.offsets, dtype="<u4"),
+        "clause_id_heap": np.frombuffer(bytes(clause_ids.heap), dtype=np.uint8),
+        "text_offsets": np.asarray(texts.offsets, dtype="<u8"),
+        "text_heap": np.frombuffer(bytes(texts.heap), dtype=np.uint8),
+        "clause_type": np.asarray(clause_types, dtype=np.uint8),
+        "clause_article": np.asarray(clause_article, dtype="<u4"),
+    }
+
+    table, offset = {}, 0
+    for name, array in sections.items():
+        table[name] = [array.dtype.str, offset, int(array.size)]
+        offset += (array.nbytes + 7) // 8 * 8
+    header = json.dumps({
+        "articles": len(clause_start) - 1,
+        "clauses": len(clause_types),
+        "clause_types": [t.value for t in CLAUSE_TYPES],
+        "sections": table,
+    }).encode("utf-8")
+    prefix = MAGIC + struct.pack("<I", len(header)) + header
+    prefix += b"\0" * (-len(prefix) % 8)
+
+    out = bytearray(prefix)
+    for array in sections.values():
+        out += array.tobytes()
+        out += b"\0" * (-array.nbytes % 8)
+    return bytes(out)
+
+
+def write_corpus(records: Iterable[Record], path: str = GDPR_CORPUS_PATH) -> int:
+    """Compiles `records` to `path` (atomically). Returns the file size."""
+    data = compile_corpus(records)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return len(data)
+
+
+class Corpus:
+    """Read-only view over a compiled corpus buffer (an mmap, or bytes)."""
+    def __init__(self, buffer, source: str = ""):
+        if bytes(buffer[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{source or 'buffer'} is not a compiled corpus")
+        (header_len,) = struct.unpack_from("<I", buffer, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(bytes(buffer[start:start + header_len]))
+        base = start + header_len + (-(start + header_len) % 8)
+
+        self.source = source
+        self._buffer = buffer
+        self.clause_types = [ClauseType(t) for t in header["clause_types"]]
+        for name, (dtype, offset, count) in header["sections"].items():
+            setattr(self, f"_{name}", np.frombuffer(buffer, dtype=np.dtype(dtype), count=count, offset=base + offset))
+
+        self.article_ids: List[str] = [self._string("article_id", i) for i in range(header["articles"])]
+        self.article_index: Dict[str, int] = {aid: row for row, aid in enumerate(self.article_ids)}
+
+    def _string(self, column: str, i: int) -> str:
+        offsets, heap = getattr(self, f"_{column}_offsets"), getattr(self, f"_{column}_heap")
+        return heap[int(offsets[i]):int(offsets[i + 1])].tobytes().decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self._clause_type)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._buffer)
+
+    def title(self, row: int) -> str:
+        return self._string("title", row)
+
+    def clause(self, i: int) -> dict:
+        return {
+            "clause_id": self._string("clause_id", i),
+            "text": self._string("text", i),
+            "parent_article": self.article_ids[int(self._clause_article[i])],
+            "clause_type": self.clause_types[int(self._clause_type[i])].value,
+        }
+
+    def clause_rows(self, article_id: str) -> range:
+        row = self.article_index.get(str(article_id))
+        if row is None:
+            return range(0)
+        return range(int(self._clause_start[row]), int(self._clause_start[row + 1]))
+
+    def article(self, article_id: str) -> Optional[dict]:
+        """O(1): the article's clause rows come straight from the offset table."""
+        row = self.article_index.get(str(article_id))
+        if row is None:
+            return None
+        return {
+            "article_id": self.article_ids[row],
+            "title": self.title(row),
+            "clauses": [self.clause(i) for i in self.clause_rows(article_id)],
+        }
+
+    def articles(self) -> Iterator[dict]:
+        for article_id in self.article_ids:
+            yield self.article(article_id)
+
+    def items(self, title_in_text: bool = True) -> Iterator[tuple[str, dict]]:
+        """(text, metadata) pairs for ClauseIndexer.build_stream, in document order."""
+        for row, article_id in enumerate(self.article_ids):
+            title = self.title(row)
+            for i in self.clause_rows(article_id):
+                yield clause_item(article_id, title, self.clause(i), title_in_text)
+
+    def records(self) -> Iterator[Record]:
+        for article in self.articles():
+            yield ArticleRecord(article_id=article["article_id"], title=article["title"])
+            for clause in article["clauses"]:
+                yield ClauseRecord(**clause)
+
+
+def open_corpus(path: str) -> Corpus:
+    """Memory-maps a compiled corpus file."""
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return Corpus(buffer, source=path)
+
+
+def _mtime_ns(path: Optional[str]) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns if path else None
+    except FileNotFoundError:
+        return None
+
+
+def corpus_is_stale(path: str = GDPR_CORPUS_PATH, source: str = GDPR_CLAUSES_PATH) -> bool:
+    """True if the compiled corpus at `path` is missing or older than its `source` stream."""
+    compiled, streamed = _mtime_ns(path), _mtime_ns(source)
+    return compiled is None or (streamed is not None and streamed > compiled)
+
+
+@lru_cache(maxsize=8)
+def _warn_stale(path: str, source: str, source_mtime_ns: int):
+    # Once per source version, not once per request
+    log.warning("corpus_stale", extra={"path": path, "source": source, "action": "compiled in memory; run ingestion.run_parse"})
+
+
+@lru_cache(maxsize=8)
+def _load(path: str, mtime_ns: int) -> Corpus:
+    if path.endswith(".bin"):
+        return open_corpus(path)
+    # Clause stream or legacy structured JSON: compile in memory
+    return Corpus(compile_corpus(read_records(path)), source=path)
+
+
+def load_corpus(path: str = GDPR_CORPUS_PATH, source: str = GDPR_CLAUSES_PATH) -> Corpus:
+    """
+    The one loader for the regulation text. A .bin path is memory-mapped
+    unless it is missing or older than `source`, in which case `source` is
+    compiled in memory: only ingestion/run_parse.py writes the .bin, never a
+    request-time reader. .jsonl/.json paths are compiled in memory. Cached
+    per path until the file changes.
+    """
+    if path.endswith(".bin") and corpus_is_stale(path, source):
+        if _mtime_ns(source) is None:
+            raise FileNotFoundError(path)
+        _warn_stale(path, source, _mtime_ns(source))
+        path = source
+    return _load(path, os.stat(path).st_mtime_ns)
@@ -0,0 +1,63 @@
+# retrieval/fusion.py
+"""
+Rank fusion and adaptive retrieval depth.
+
+Kept free of the embedding stack so the analyst (and evaluation scripts)
+can apply the cutoff without importing torch/faiss.
+"""
+
+def reciprocal_rank_fusion(ranked_lists, rrf_k: int = 60, weights=None) -> list[tuple[int, float]]:
+    """
+    Fuses several ranked lists of document positions.
+    Returns [(position, score)] sorted by descending fused score.
+    """
+    weights = weights or [1.0] * len(ranked_lists)
+    scores = {}
+    for ranking, weight in zip(ranked_lists, weights):
+        for rank, idx in enumerate(ranking, start=1):
+            scores[idx] = scores.get(idx, 0.0) + weight / (rrf_k + rank)
+    return sorted(scores.items(), key=lambda x: x[1], reverse=True)
+
+
+def adaptive_cutoff(results: list[dict], max_k: int, min_k: int = 1,
+                    rel_threshold: float = 0.75, max_drop: float = 0.35) -> list[dict]:
+    """
+    Keeps results while they stay close to the best hit.
+
+    Stops at the first result scoring below `rel_threshold` x top score, or
+    dropping more than `max_drop` relative to its predecessor (a score gap).
+    Results are compared on 'relevance' when present (hybrid_search: best
+    BM25 / dense score relative to that list's top hit), since fused RRF
+    scores are too flat for either rule to fire; otherwise on 'score'.
+
+    Defaults come from evaluation/retrieval_budget.py on the golden dataset
+    (retrieval_budget.json): 0.75 is the highest threshold that keeps
+    expected-article recall at the fixed-k level (18% fewer prompt tokens);
+    0.85 and above start dropping expected articles. Measured on citations +
+    BM25 only; re-run with the embedding model before tightening further.
+    Explicitly cited provisions ('direct') are always kept and do not count
+    towards `max_k`. Unscored results (e.g. test doubles) are returned as-is.
+    """
+    if not results or any('score' not in r for r in results):
+        return results[:max_k]
+
+    direct = [r for r in results if r.get('direct')]
+    ranked = [r for r in results if not r.get('direct')]
+    if not ranked:
+        return direct
+
+    def value(r: dict) -> float:
+        return r.get('relevance', r['score'])
+
+    top = max(value(r) for r in ranked)
+    kept = [ranked[0]]
+    for prev, item in zip(ranked, ranked[1:]):
+        if len(kept) >= max_k:
+            break
+        if len(kept) >= min_k:
+            if value(item) < rel_threshold * top:
+                break
+            if value(prev) > 0 and (value(prev) - value(item)) / value(prev) > max_drop:
+                break
+        kept.append(item)
+    return direct + kept
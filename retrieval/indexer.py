@@ -1,71 +1,286 @@
+import os
+import re
+import copy
+import time
+import logging
+from contextlib import contextmanager
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional
 import faiss
 import numpy as np
 import torch
 from sentence_transformers import SentenceTransformer
 from rank_bm25 import BM25Okapi
 
+from retrieval.citations import parse_citations, split_subsection, clause_citation_tokens
+from retrieval.fusion import reciprocal_rank_fusion
+from retrieval.corpus import GDPR_CORPUS_PATH, Corpus, clause_item, load_corpus
+
+# Plain stdlib logger: records join the 'compliance' pipeline once the app configures it,
+# without retrieval importing agent
+log = logging.getLogger("compliance.retrieval")
+
+# Clauses embedded per encoder call when building from a stream
+ENCODE_BATCH_SIZE = int(os.getenv("ENCODE_BATCH_SIZE", "256"))
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+def tokenize(text: str) -> list[str]:
+    """
+    BM25 tokenizer: lowercase words plus intact citation tokens, so
+    '17(3)(b)' stays one term even inside 'under 17(3)(b)?'.
+    """
+    tokens = WORD_RE.findall(text.lower())
+    tokens.extend(parse_citations(text).tokens)
+    return tokens
+
+
+def clause_items(path: str = GDPR_CORPUS_PATH, title_in_text: bool = True) -> Iterator[tuple[str, dict]]:
+    """(text to embed, metadata) pairs for every clause of a corpus (.bin, or a .jsonl/.json it compiles)."""
+    return load_corpus(path).items(title_in_text)
+
+
+def diff_items(diff, title_in_text: bool = True) -> Iterator[tuple[str, dict]]:
+    """(text, metadata) pairs for the added and changed clauses of an ingestion ClauseDiff."""
+    for change in [*diff.added, *diff.changed]:
+        clause = change.clause.model_dump(mode="json")
+        yield clause_item(change.article.article_id, change.article.title, clause, title_in_text)
+
+class _NullSpan:
+    def set_attribute(self, key, value):
+        pass
+
+
+@contextmanager
+def _null_span(name: str, **attributes):
+    yield _NullSpan()
+
+
 class ClauseIndexer:
+    # Instrumentation hooks, installed by the agent layer via instrument():
+    # span(name, **attributes) is a context manager yielding an object with set_attribute,
+    # on_search(queries, seconds) records each hybrid search call.
+    span: Callable = staticmethod(_null_span)
+    on_search: Optional[Callable[[int, float], None]] = None
+
     def __init__(self, model_name="all-MiniLM-L6-v2"):
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        print(f"🚀 Embedding Device: {self.device}")
+        log.info("embedding_device", extra={"device": self.device})
         
         try:
             self.model = SentenceTransformer(model_name, device=self.device)
         except Exception as e:
-            print(f"⚠️ Failed to load embedding model ({model_name}): {e}")
+            log.warning("embedding_model_unavailable", extra={"model_name": model_name, "error": str(e)[:500]})
             self.model = None
 
         self.index = None
         self.metadata = []
         self.bm25 = None # Sparse index
+        self.citation_lookup = {} # Exact index: '17', '17(3)', '17(3)(b)' -> clause positions
+
+    @classmethod
+    def instrument(cls, span: Optional[Callable] = None, on_search: Optional[Callable[[int, float], None]] = None):
+        """Installs tracing / metrics hooks for every indexer (retrieval does not import the agent layer)."""
+        if span is not None:
+            cls.span = staticmethod(span)
+        cls.on_search = staticmethod(on_search) if on_search is not None else None
+
+    @classmethod
+    def from_corpus(cls, corpus: Corpus = None, title_in_text: bool = True, **kwargs) -> "ClauseIndexer":
+        """Indexer over every clause of the compiled corpus (default: load_corpus())."""
+        indexer = cls(**kwargs)
+        indexer.build_stream((corpus or load_corpus()).items(title_in_text))
+        return indexer
 
     def build(self, texts: list[str], metadata: list[dict]):
-        self.metadata = metadata
-        
-        # 1. Dense (Semantic) Indexing on GPU
-        embeddings = self.model.encode(texts, convert_to_numpy=True, show_progress_bar=True)
-        dim = embeddings.shape[1]
-        self.index = faiss.IndexFlatL2(dim)
-        self.index.add(embeddings.astype(np.float32))
-
-        # 2. Sparse (Keyword) Indexing on CPU
-        # We tokenize by splitting on whitespace and removing casing
-        tokenized_corpus = [t.lower().split() for t in texts]
-        self.bm25 = BM25Okapi(tokenized_corpus)
-
-    def hybrid_search(self, query: str, k=5):
-        # 1. Dense Search (GPU-powered meaning search)
+        self.build_stream(zip(texts, metadata))
+
+    def build_stream(self, items: Iterable[tuple[str, dict]], batch_size: int = ENCODE_BATCH_SIZE):
+        """
+        Builds all three indexes from (text, metadata) pairs, e.g. clause_items(path).
+        Texts are embedded batch by batch and dropped; only metadata and BM25 tokens are kept.
+        """
+        self.metadata = []
+        self.index = None
+        self.tokenized_corpus = []
+        self._add_items(items, batch_size)
+
+        if not self.metadata:
+            raise ValueError("No clauses to index")
         if self.index is None:
+            log.warning("dense_index_disabled", extra={"fallback": "citations+bm25"})
+        self.bm25 = BM25Okapi(self.tokenized_corpus)
+
+        # 3. Exact Citation Index
+        self._build_citation_lookup()
+
+    def _add_items(self, items: Iterable[tuple[str, dict]], batch_size: int):
+        items = iter(items)
+        while batch := list(islice(items, batch_size)):
+            texts = [text for text, _ in batch]
+            # 1. Dense (Semantic) Indexing on GPU (skipped when the embedding model failed to load)
+            if self.model is not None:
+                embeddings = self.model.encode(texts, convert_to_numpy=True, show_progress_bar=False)
+                if self.index is None:
+                    self.index = faiss.IndexFlatL2(embeddings.shape[1])
+                self.index.add(embeddings.astype(np.float32))
+
+            # 2. Sparse (Keyword) Indexing on CPU
+            # Words are lowercased; citation tokens are kept intact
+            self.tokenized_corpus.extend(tokenize(t) for t in texts)
+            self.metadata.extend(meta for _, meta in batch)
+
+    def apply_changes(self, upserts: Iterable[tuple[str, dict]], removed: Iterable[str] = (),
+                      batch_size: int = ENCODE_BATCH_SIZE) -> int:
+        """
+        Incremental update from an ingestion diff, e.g. apply_changes(diff_items(diff), diff.removed).
+        Removed and replaced clauses (by clause_id) are dropped from the flat index, only the
+        upserted texts are embedded; BM25 and the citation index are rebuilt from the kept tokens.
+        Returns the number of clauses embedded.
+        """
+        upserts = list(upserts)
+        stale = set(removed) | {meta["clause_id"] for _, meta in upserts}
+        drop = [i for i, meta in enumerate(self.metadata) if meta.get("clause_id") in stale]
+        if drop:
+            # IndexFlat.remove_ids compacts in order, so positions stay aligned with metadata
+            if self.index is not None:
+                self.index.remove_ids(np.array(drop, dtype=np.int64))
+            keep = set(range(len(self.metadata))) - set(drop)
+            self.metadata = [m for i, m in enumerate(self.metadata) if i in keep]
+            self.tokenized_corpus = [t for i, t in enumerate(self.tokenized_corpus) if i in keep]
+
+        self._add_items(upserts, batch_size)
+        self.bm25 = BM25Okapi(self.tokenized_corpus)
+        self._build_citation_lookup()
+        return len(upserts)
+
+    def with_changes(self, upserts: Iterable[tuple[str, dict]], removed: Iterable[str] = ()) -> "ClauseIndexer":
+        """
+        Copy of this indexer with apply_changes applied. The copy shares the
+        embedding model but not the indexes, so this one keeps serving
+        searches until the caller swaps the copy in.
+        """
+        patched = copy.copy(self)
+        patched.index = faiss.clone_index(self.index) if self.index is not None else None
+        patched.metadata = list(self.metadata)
+        patched.tokenized_corpus = list(self.tokenized_corpus)
+        patched.apply_changes(upserts, removed)
+        return patched
+
+    def _build_citation_lookup(self):
+        self.citation_lookup = {}
+        for idx, item in enumerate(self.metadata):
+            if not isinstance(item, dict) or 'article_id' not in item:
+                continue
+            art_id = str(item['article_id'])
+            self.citation_lookup.setdefault(art_id, []).append(idx)
+            for token in clause_citation_tokens(art_id, item.get('clause_id', ''), item.get('text', '')):
+                self.citation_lookup.setdefault(token, []).append(idx)
+
+    def lookup_citations(self, query: str) -> list[int]:
+        """
+        O(1) lookup of provisions the query names explicitly. Point-level
+        tokens fall back to their paragraph, then to the whole article.
+        """
+        hits = []
+        for token in parse_citations(query).tokens:
+            parts = split_subsection(token)
+            candidates = [token]
+            if parts:
+                art, para, _ = parts
+                candidates += [f"{art}({para})", art]
+            for key in candidates:
+                if key in self.citation_lookup:
+                    hits.extend(self.citation_lookup[key])
+                    break
+        return list(dict.fromkeys(hits))
+
+    def hybrid_search(self, query: str, k=5, rrf_k: int = 60):
+        """
+        Dense + BM25 retrieval fused with reciprocal-rank fusion.
+        Returns up to k scored results (copies of the metadata with a 'score'),
+        preceded by any explicitly cited provisions (marked 'direct').
+        """
+        return self.hybrid_search_many([query], k=k, rrf_k=rrf_k)[0]
+
+    def hybrid_search_many(self, queries: list[str], k=5, rrf_k: int = 60) -> list[list[dict]]:
+        """
+        Batched hybrid_search: one embedding pass and one FAISS search for all
+        queries. k is an int or a per-query list.
+        """
+        if self.bm25 is None:
             raise RuntimeError("Index not built. Call build() first with texts and metadata.")
-        
-        q_emb = self.model.encode([query], convert_to_numpy=True)
-        distances, dense_ids = self.index.search(np.array([q_emb[0]]).astype(np.float32), k)
-        # Ensure we have a flat list of Python integers
-        dense_hits = [int(i) for i in dense_ids[0]] 
+        if not queries:
+            return []
+        with self.span("retrieval.hybrid_search", **{"retrieval.queries": len(queries)}) as search_span:
+            started = time.perf_counter()
+            ks = k if isinstance(k, list) else [k] * len(queries)
+
+            # Fuse over a wider candidate pool than we return
+            fetch_k = min(len(self.metadata), max(max(ks) * 4, 20))
+
+            # 1. Dense Search (GPU-powered meaning search), vectorized over the batch.
+            # Without an embedding model the fusion runs on citations + BM25 only.
+            if self.index is not None:
+                q_embs = self.model.encode(queries, convert_to_numpy=True)
+                dense_dists, dense_ids = self.index.search(np.asarray(q_embs, dtype=np.float32), fetch_k)
+            else:
+                dense_dists = dense_ids = [[] for _ in queries]
+
+            results = [
+                self._fuse(query, row, dists, query_k, fetch_k, rrf_k)
+                for query, row, dists, query_k in zip(queries, dense_ids, dense_dists, ks)
+            ]
+            if self.on_search is not None:
+                self.on_search(len(queries), time.perf_counter() - started)
+            search_span.set_attribute("retrieval.hits", sum(len(r) for r in results))
+            return results
+
+    def _fuse(self, query: str, dense_row, dense_dists, k: int, fetch_k: int, rrf_k: int) -> list[dict]:
+        # 0. Exact Citation Lookup (explicitly named provisions first)
+        direct_hits = self.lookup_citations(query)
+
+        # Ensure we have a flat list of Python integers (FAISS pads with -1)
+        dense_hits = [int(i) for i in dense_row if i >= 0]
+        # Squared L2 -> cosine for unit-length embeddings (all-MiniLM-L6-v2 normalises)
+        dense_sims = {int(i): max(0.0, 1.0 - float(d) / 2) for i, d in zip(dense_row, dense_dists) if i >= 0}
 
         # 2. Sparse Search (Keyword overlap search)
-        tokenized_query = query.lower().split()
+        tokenized_query = tokenize(query)
         sparse_scores = self.bm25.get_scores(tokenized_query) if self.bm25 else np.zeros(len(self.metadata))
-        # Get indices of top k results
-        sparse_hits = np.argsort(sparse_scores)[-k:].tolist()
+        # Best first; documents without any keyword overlap are not evidence
+        sparse_hits = [int(i) for i in np.argsort(sparse_scores)[::-1][:fetch_k] if sparse_scores[i] > 0]
+
+        # 3. Reciprocal Rank Fusion (cited provisions get their own, double-weighted list)
+        fused = reciprocal_rank_fusion([direct_hits, dense_hits, sparse_hits], rrf_k=rrf_k, weights=[2.0, 1.0, 1.0])
+        direct_set = set(direct_hits)
+
+        # RRF scores are nearly flat (1/(rrf_k + rank)), so each hit also carries its best
+        # component score relative to that component's top hit, for adaptive_cutoff
+        sparse_top = float(sparse_scores.max()) if len(sparse_scores) else 0.0
+        dense_top = max(dense_sims.values(), default=0.0)
 
-        # 3. Merge Indices (Deduplicated)
-        # Combine both lists and remove duplicates while keeping order
-        combined_indices = list(dict.fromkeys(dense_hits + sparse_hits))
+        def relevance(idx: int) -> float:
+            sparse = float(sparse_scores[idx]) / sparse_top if sparse_top > 0 else 0.0
+            dense = dense_sims.get(idx, 0.0) / dense_top if dense_top > 0 else 0.0
+            return round(max(sparse, dense), 4)
         
         # 4. Critical Metadata Recovery
         results = []
-        for idx in combined_indices:
+        for idx, score in fused:
             # SAFETY: Ensure the index is within range and is a dictionary
             if idx < len(self.metadata):
                 item = self.metadata[idx]
                 if isinstance(item, dict) and 'article_id' in item:
-                    results.append(item)
+                    results.append({**item, "score": round(score, 6), "relevance": relevance(idx), "direct": idx in direct_set})
                 else:
                     # If this triggers, your metadata was built as strings, not dicts
-                    print(f"⚠️ Warning: Metadata at index {idx} is invalid type: {type(item)}")
+                    log.warning("invalid_metadata", extra={"index": int(idx), "type": type(item).__name__})
             
-        return results[:k]
+        # Cited provisions do not consume the semantic budget
+        direct = [r for r in results if r["direct"]]
+        ranked = [r for r in results if not r["direct"]]
+        return direct + ranked[:k]
 
     def get_full_article(self, article_id: str):
         # Filter all metadata for the same article_id
@@ -0,0 +1,28 @@
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import governance.audit as audit
+import governance.review_queue as review_queue
+from agent.search_cache import SearchCache
+
+
+@pytest.fixture(autouse=True)
+def isolated_governance_stores(tmp_path, monkeypatch):
+    """
+    Audit vault, review queue and approved-answer cache under tmp_path.
+    The defaults (AUDIT_ENABLED / REVIEW_QUEUE_ENABLED on, cwd-relative
+    paths) would otherwise write every analyzed test query into data/.
+    """
+    store = audit.AuditStore(path=str(tmp_path / "audit.sqlite"))
+    cache = SearchCache(path=None, name="response")
+    monkeypatch.setattr(audit, "_STORE", store)
+    monkeypatch.setattr(review_queue, "_RESPONSE_CACHE", cache)
+    monkeypatch.setattr(review_queue, "_QUEUE", review_queue.ReviewQueue(
+        path=str(tmp_path / "review.sqlite"), response_cache=cache))
+    yield
+    store.close()
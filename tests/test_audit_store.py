@@ -0,0 +1,69 @@
+import os
+import sys
+import sqlite3
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from governance.audit import AuditStore, AuditRecord
+
+STATUSES = ["auto_approved", "review_required", "blocked"]
+
+
+def make_store(tmp):
+    store = AuditStore(path=os.path.join(tmp, "audit.sqlite"), batch_size=128, flush_interval_s=0.05)
+    for i in range(1000):
+        store.append(AuditRecord(
+            domain="GDPR" if i % 2 else "CCPA", status=STATUSES[i % 3], risk_level="low",
+            confidence=0.9, query=f"query {i}", citations=["Article 17"], model="fake-large", latency_s=0.1
+        ))
+    store.flush()
+    return store
+
+
+def test_group_commit_and_keyset_pages():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = make_store(tmp)
+        assert store.written == 1000
+        assert store.batches < 100  # many records per transaction
+
+        seen, cursor = [], None
+        while True:
+            page = store.query(status="review_required", before_id=cursor, limit=100)
+            seen.extend(r.id for r in page.records)
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+        assert len(seen) == len(set(seen)) == 333
+        assert seen == sorted(seen, reverse=True)
+        assert store.query(domain="GDPR", status="blocked", limit=500).records[0].citations == ["Article 17"]
+        assert store.counts() == {"auto_approved": 334, "review_required": 333, "blocked": 333}
+
+        plan = store._reader.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM audit_log WHERE status = ? AND id < ? ORDER BY id DESC LIMIT 50",
+            ("blocked", 500)
+        ).fetchall()
+        assert "idx_audit_status" in str(plan)
+        store.close()
+
+
+def test_rows_are_append_only():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = make_store(tmp)
+        db = sqlite3.connect(store.path)
+        for statement in ("UPDATE audit_log SET status = 'auto_approved'", "DELETE FROM audit_log"):
+            try:
+                db.execute(statement)
+            except sqlite3.IntegrityError as e:
+                assert "append-only" in str(e)
+            else:
+                raise AssertionError(f"{statement} should be rejected")
+        db.close()
+        store.close()
+
+
+if __name__ == "__main__":
+    test_group_commit_and_keyset_pages()
+    test_rows_are_append_only()
+    print("✅ audit store tests passed")
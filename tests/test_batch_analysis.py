@@ -0,0 +1,88 @@
+import os
+import sys
+import time
+import threading
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent.analyst import ComplianceAgent, AnalysisResult
+from retrieval.indexer import ClauseIndexer, tokenize
+
+
+class HashEncoder:
+    """Deterministic bag-of-words embeddings; counts encode() calls."""
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, texts, convert_to_numpy=True, show_progress_bar=False):
+        self.calls += 1
+        out = np.zeros((len(texts), 64), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for tok in tokenize(text):
+                out[row, hash(tok) % 64] += 1.0
+        return out
+
+
+def test_batched_search_matches_single_queries():
+    texts = [
+        "Article 17 - Right to erasure: the data subject shall have the right to erasure of personal data",
+        "Article 33 - Notification: the controller shall notify a personal data breach within 72 hours",
+        "Article 6 - Lawfulness: processing shall be lawful only if consent is given",
+    ]
+    metadata = [
+        {"article_id": "17", "clause_id": "17-1", "text": texts[0]},
+        {"article_id": "33", "clause_id": "33-1", "text": texts[1]},
+        {"article_id": "6", "clause_id": "6-1", "text": texts[2]},
+    ]
+    indexer = ClauseIndexer.__new__(ClauseIndexer)
+    indexer.model = HashEncoder()
+    indexer.index = None
+    indexer.build(texts, metadata)
+    indexer.model.calls = 0
+
+    queries = ["breach notification deadline", "right to erasure", "consent"]
+    batch = indexer.hybrid_search_many(queries, k=[1, 2, 1])
+    assert indexer.model.calls == 1
+    assert batch[0][0]["article_id"] == "33" and len(batch[0]) == 1
+    assert batch == [indexer.hybrid_search(q, k=k) for q, k in zip(queries, [1, 2, 1])]
+
+
+def test_analyze_many_dedupes_and_runs_concurrently():
+    class BatchIndexer:
+        batches = []
+
+        def hybrid_search_many(self, queries, k):
+            self.batches.append(list(queries))
+            return [[{"article_id": "17", "score": 1.0}] for _ in queries]
+
+    agent = ComplianceAgent.__new__(ComplianceAgent)
+    agent.domain, agent.model_tier, agent.indexer = "GDPR", "Tier 1", BatchIndexer()
+
+    calls, lock = [], threading.Lock()
+
+    def fake_logic(query, tier, retrieved=None):
+        with lock:
+            calls.append((query, retrieved))
+        time.sleep(0.1)
+        # Each item carries its own ticket: concurrent analyses must not overwrite each other's
+        return AnalysisResult(result=f"answer: {query}", review_ticket=f"ticket: {query}")
+
+    agent._analyze_logic = fake_logic
+    queries = ["Right to erasure?", "right  to erasure? ", "Hello", "Breach deadline?"]
+
+    start = time.perf_counter()
+    items = list(agent.analyze_many(queries, max_concurrency=3))
+    assert time.perf_counter() - start < 0.25
+
+    assert sorted(i["index"] for i in items) == [0, 1, 2, 3]
+    assert len(calls) == 3
+    # Small talk skips retrieval; everything else was searched in one batch
+    assert agent.indexer.batches == [["Right to erasure?", "Breach deadline?"]]
+    assert dict(calls)["Hello"] is None
+    by_index = {i["index"]: i["result"] for i in items}
+    assert by_index[0] == by_index[1] == "answer: Right to erasure?"
+    assert {i["index"]: i["review_ticket"] for i in items} == {
+        0: "ticket: Right to erasure?", 1: "ticket: Right to erasure?", 2: "ticket: Hello", 3: "ticket: Breach deadline?"
+    }
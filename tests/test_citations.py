@@ -0,0 +1,72 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent.citations import get_citation_index
+from retrieval.citations import parse_citations, clause_citation_tokens, CCPA_SECTION_RE
+from agent.fines import assess_fine
+from evaluation.run_eval import check_citation_match
+
+
+def test_single_pass_extracts_all_forms():
+    cites = parse_citations(
+        "Under Article 17(3)(b) and Art. 6(1)(c), mitigation counts (83(2)(c)); see Article 25 and §1798.140(v)(1)."
+    )
+    assert cites.subsections == {"17(3)(b)", "6(1)(c)", "83(2)(c)"}
+    assert {"17", "6", "25"} <= cites.articles
+    assert cites.ccpa == {"1798.140(v)(1)"}
+
+
+def test_counts_keep_repeats():
+    cites = parse_citations("83(2)(c) mitigation, 83(2)(c) again and 83(2)(f) cooperation; 83(4)(a) tier")
+    assert cites.count("83(2)", points="abcdefghijk") == 3
+
+
+def test_corpus_index_knows_real_points():
+    index = get_citation_index()
+    assert index.built_from_corpus
+    assert callable(index.from_corpus)
+    assert index.is_valid("17(3)(b)") and index.is_valid("83(2)(k)") and index.is_valid("4(1)")
+    assert not index.is_valid("17(3)(z)") and not index.is_valid("17(9)") and not index.is_valid("250(1)")
+    # Article 4 definitions are '(n)' items, not numbered paragraphs: never flagged
+    assert index.is_valid("4(11)") and index.is_valid("4(1)")
+    assert not index.unknown({"4(11)", "4(26)", "17(1)(a)"})
+    assert not index.unknown(assess_fine("A processor ignored the order of the supervisory authority. What fine applies?").subsections())
+
+
+def test_eval_match_and_ccpa_rewrite():
+    assert check_citation_match("See Art. 25(1) for design duties.", {"unit_type": "Article", "unit_id": "25"})
+    assert not check_citation_match("See Article 250.", {"unit_type": "Article", "unit_id": "25"})
+    assert CCPA_SECTION_RE.sub("1798.140(ae)", "Defined in 1798.140(v)(1).") == "Defined in 1798.140(ae)."
+
+
+def test_indexer_direct_lookup_resolves_cited_provisions():
+    import json
+    from retrieval.indexer import ClauseIndexer, tokenize
+
+    with open("data/processed/gdpr_structured.json", "r", encoding="utf-8") as f:
+        data = json.load(f)
+    indexer = ClauseIndexer.__new__(ClauseIndexer)
+    indexer.metadata = [
+        {"article_id": a["article_id"], "clause_id": c["clause_id"], "text": c["text"]}
+        for a in data["articles"] for c in a["clauses"]
+    ]
+    indexer._build_citation_lookup()
+
+    hits = indexer.lookup_citations("does 17(3)(b) apply to tax records?")
+    assert [indexer.metadata[i]["clause_id"] for i in hits] == ["17-3"]
+    article_hits = indexer.lookup_citations("Article 25 obligations")
+    assert {indexer.metadata[i]["article_id"] for i in article_hits} == {"25"}
+    assert "17(3)(b)" in tokenize("does 17(3)(b) apply?")
+
+    # Retrieval lookup and the validation whitelist share one point grammar
+    point_keys = {k for k in indexer.citation_lookup if k.count("(") == 2}
+    assert point_keys <= get_citation_index().valid
+
+
+def test_point_grammar_skips_cross_references():
+    text = "the information referred to in points (b), (c) and (d) of Article 33(3):\n(a)  first;\n (e)  second"
+    assert clause_citation_tokens("34", "34-2", text) == ["34(2)", "34(2)(a)", "34(2)(e)"]
+    assert clause_citation_tokens("17", "17-intro", "(a) x") == []
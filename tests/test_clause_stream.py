@@ -0,0 +1,60 @@
+import os
+import sys
+import tempfile
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ingestion.clause_stream import ArticleRecord, ClauseRecord, GDPR_CLAUSES_PATH, read_records, write_jsonl
+from retrieval.context_builder import ContextBuilder
+from retrieval.indexer import ClauseIndexer, clause_items, tokenize
+
+LEGACY_PATH = "data/processed/gdpr_structured.json"
+
+
+class HashEncoder:
+    """Deterministic bag-of-words embeddings (no model download)."""
+    def encode(self, texts, convert_to_numpy=True, show_progress_bar=False):
+        out = np.zeros((len(texts), 64), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for tok in tokenize(text):
+                out[row, hash(tok) % 64] += 1.0
+        return out
+
+
+def test_jsonl_round_trip_matches_legacy_document():
+    def generate():
+        yield from read_records(LEGACY_PATH)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "clauses.jsonl")
+        lines = write_jsonl(generate(), path)
+        records = list(read_records(path))
+    assert lines == len(records) == 471
+    assert isinstance(records[0], ArticleRecord) and isinstance(records[1], ClauseRecord)
+    assert records == list(read_records(GDPR_CLAUSES_PATH))
+
+
+def test_context_builder_reads_article_spans():
+    legacy, streamed = ContextBuilder(LEGACY_PATH), ContextBuilder(GDPR_CLAUSES_PATH)
+    assert len(streamed.article_map) == len(legacy.article_map) == 99
+    for article_id in ("1", "4", "17", "25", "99", "100"):
+        assert streamed.expand_article_by_id(article_id) == legacy.expand_article_by_id(article_id)
+
+
+def test_indexer_builds_from_stream_in_batches():
+    indexer = ClauseIndexer.__new__(ClauseIndexer)
+    indexer.model = HashEncoder()
+    indexer.build_stream(clause_items(GDPR_CLAUSES_PATH), batch_size=50)
+    assert indexer.index.ntotal == len(indexer.metadata) == 372
+    assert indexer.metadata[0]["article_id"] == "1" and "clause_type" in indexer.metadata[0]
+    hits = indexer.hybrid_search("right to erasure under Article 17(1)", k=3)
+    assert hits[0]["article_id"] == "17"
+
+
+if __name__ == "__main__":
+    test_jsonl_round_trip_matches_legacy_document()
+    test_context_builder_reads_article_spans()
+    test_indexer_builds_from_stream_in_batches()
+    print("✅ clause stream tests passed")
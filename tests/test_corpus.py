@@ -0,0 +1,74 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ingestion.clause_stream import read_records
+from retrieval.corpus import Corpus, compile_corpus, corpus_is_stale, load_corpus, write_corpus
+
+CLAUSES_PATH = "data/processed/gdpr_clauses.jsonl"
+LEGACY_PATH = "data/processed/gdpr_structured.json"
+
+
+def test_compiled_corpus_round_trips_the_document():
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp:  # the mmap stays cached
+        path = os.path.join(tmp, "corpus.bin")
+        write_corpus(read_records(CLAUSES_PATH), path)
+        corpus = load_corpus(path)
+        assert list(corpus.records()) == list(read_records(CLAUSES_PATH))
+
+        with open(LEGACY_PATH, "r", encoding="utf-8") as f:
+            legacy = {a["article_id"]: a for a in json.load(f)["articles"]}
+        assert corpus.article_ids == list(legacy) and len(corpus) == 372
+        for article_id in ("4", "17", "83"):
+            article = corpus.article(article_id)
+            assert article["title"] == legacy[article_id]["title"]
+            assert [c["text"] for c in article["clauses"]] == [c["text"] for c in legacy[article_id]["clauses"]]
+        assert corpus.article("100") is None and list(corpus.clause_rows("4")) == []
+
+
+def test_loader_compiles_once_and_caches():
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp:  # the mmap stays cached
+        path = os.path.join(tmp, "gdpr_corpus.bin")
+        first = load_corpus(path, source=CLAUSES_PATH)  # missing: compiled from the clause stream in memory
+        assert not os.path.exists(path)  # readers never write the artifact
+        assert load_corpus(path, source=CLAUSES_PATH) is first
+        assert isinstance(load_corpus(LEGACY_PATH), Corpus)  # legacy JSON compiles in memory
+
+        text, meta = next(first.items())
+        assert text.startswith("Article 1 - Subject-matter and objectives: 1.")
+        assert meta == {"article_id": "1", "clause_id": "1-1", "clause_type": "other", "text": meta["text"]}
+
+
+def test_stale_binary_is_not_served():
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp:  # the mmap stays cached
+        path, source = os.path.join(tmp, "gdpr_corpus.bin"), os.path.join(tmp, "gdpr_clauses.jsonl")
+        shutil.copy(CLAUSES_PATH, source)
+        write_corpus(read_records(source), path)
+        os.utime(source, ns=(os.stat(path).st_mtime_ns - 10**9,) * 2)
+        assert not corpus_is_stale(path, source) and load_corpus(path, source).source == path
+
+        # The stream changes after compilation (e.g. a hand edit): the .bin must not win
+        with open(source, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"type": "article", "article_id": "100", "title": "Amendment"}) + "\n")
+        os.utime(source, ns=(os.stat(path).st_mtime_ns + 10**9,) * 2)
+        assert corpus_is_stale(path, source)
+        corpus = load_corpus(path, source)
+        assert corpus.source == source and corpus.article_ids[-1] == "100"
+
+
+def test_empty_stream_compiles():
+    corpus = Corpus(compile_corpus([]))
+    assert len(corpus) == 0 and corpus.article_ids == []
+
+
+if __name__ == "__main__":
+    test_compiled_corpus_round_trips_the_document()
+    test_loader_compiles_once_and_caches()
+    test_stale_binary_is_not_served()
+    test_empty_stream_compiles()
+    print("✅ corpus tests passed")
@@ -0,0 +1,58 @@
+import io
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ingestion.dynamic_loader import ArticleRow, ClauseRow, DynamicLoader
+from ingestion.schemas import ClauseType
+
+LAW_TEXT = """Preamble text for the act.
+
+  Section 1. Definitions
+Personal data means any information relating to a person.
+The controller shall keep records.
+  Article 2 x-rays are mentioned in this long line, which is content rather than a header because it runs past the limit.
+Chapter IV
+Data shall not be sold to third parties.
+Marketing without consent is prohibited.
+A fine of up to 4% may be imposed.
+Section 5
+"""
+
+
+def test_rows_and_classification():
+    rows = list(DynamicLoader.iter_records(LAW_TEXT))
+    assert rows[0] == ArticleRow("Intro", "Preamble / Introduction")
+    assert rows[1] == ClauseRow("Intro-1", "Preamble text for the act.", "Intro", ClauseType.OTHER)
+    assert rows[2] == ArticleRow("Section-1. Definitions", "Section 1. Definitions")
+
+    types = {row.text: row.clause_type for row in rows if isinstance(row, ClauseRow)}
+    assert types["The controller shall keep records."] == ClauseType.OBLIGATION
+    # "shall not" must win over "shall"
+    assert types["Data shall not be sold to third parties."] == ClauseType.PROHIBITION
+    assert types["Marketing without consent is prohibited."] == ClauseType.PROHIBITION
+    assert types["A fine of up to 4% may be imposed."] == ClauseType.PENALTY
+    assert any(text.startswith("Article 2 x-rays") for text in types)
+
+    document = DynamicLoader.parse_text(LAW_TEXT, "Act", "https://example.org/act")
+    assert [a.article_id for a in document.articles] == ["Intro", "Section-1. Definitions", "Chapter-IV", "Section-5"]
+    assert document.article_count == 4 and document.articles[-1].clauses == []
+    assert [c.clause_id for c in document.articles[1].clauses] == ["Section-1. Definitions-1", "Section-1. Definitions-2", "Section-1. Definitions-3"]
+
+
+def test_chunked_and_file_sources_match_whole_text():
+    expected = DynamicLoader.parse_text(LAW_TEXT, "Act", "u").model_dump(exclude={"parsed_at"})
+    for size in (1, 7, 64):
+        chunks = [LAW_TEXT[i:i + size] for i in range(0, len(LAW_TEXT), size)]
+        streamed = DynamicLoader.parse_stream(chunks, "Act", "u", batch_size=2)
+        assert streamed.model_dump(exclude={"parsed_at"}) == expected, size
+    from_file = DynamicLoader.parse_stream(io.StringIO(LAW_TEXT.replace("\n", "\r\n")), "Act", "u")
+    assert from_file.model_dump(exclude={"parsed_at"}) == expected
+
+
+if __name__ == "__main__":
+    test_rows_and_classification()
+    test_chunked_and_file_sources_match_whole_text()
+    print("✅ dynamic loader tests passed")
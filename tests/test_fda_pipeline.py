@@ -0,0 +1,91 @@
+import os
+import sys
+import json
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent.fda_pipeline import FDARetriever, LocalFDACorpus
+from agent.search_cache import OfflineSearchClient
+from agent.tavily_search import LawsuitSearcher
+
+
+def offline_searcher(latency_s):
+    searcher = LawsuitSearcher.__new__(LawsuitSearcher)
+    searcher.client = OfflineSearchClient(latency_s=latency_s)
+    return searcher
+
+
+def slow_fetcher(delay_s):
+    def fetch(url):
+        time.sleep(delay_s)
+        return f"Full extracted page text for {url}"
+    return fetch
+
+
+def test_sources_fan_out_concurrently(tmp_path):
+    corpus_path = tmp_path / "fda.json"
+    corpus_path.write_text(json.dumps({
+        "title": "21 CFR Part 820",
+        "articles": [{"article_id": "820.30", "title": "Design controls", "clauses": [
+            {"clause_id": "820.30-1", "text": "Each manufacturer of a medical device shall establish design controls."}
+        ]}]
+    }))
+    retriever = FDARetriever(offline_searcher(0.1), corpus=LocalFDACorpus(str(corpus_path)),
+                             fetcher=slow_fetcher(0.1), deadline_s=5)
+
+    start = time.perf_counter()
+    context = retriever.retrieve("medical device design controls")
+    elapsed = time.perf_counter() - start
+
+    # Serial: 3 searches + 9 fetches at 0.1s each
+    assert elapsed < 0.6
+    assert retriever.searcher.client.calls == 3
+    assert "Local: 820.30" in context
+    assert context.count("Full extracted page text") == 9
+
+
+def test_deadline_returns_snippets_without_waiting_for_fetches():
+    retriever = FDARetriever(offline_searcher(0.0), corpus=LocalFDACorpus("missing.json"),
+                             fetcher=slow_fetcher(2.0), deadline_s=0.3)
+    start = time.perf_counter()
+    context = retriever.retrieve("infant formula recall")
+    assert time.perf_counter() - start < 1.0
+    assert "Offline search stand-in content" in context
+    assert "Full extracted page text" not in context
+
+
+def test_merge_dedupes_urls_and_content():
+    class FixedClient:
+        client = True
+
+        def search(self, query, max_results, prefix):
+            return {"results": [
+                {"title": "Case A", "url": "https://www.fda.gov/case-a/", "content": "Same ruling text", "score": 0.9},
+                {"title": "Case A mirror", "url": "https://mirror.example.com/a", "content": "Same ruling text", "score": 0.5},
+            ]}
+
+    retriever = FDARetriever(FixedClient(), corpus=LocalFDACorpus("missing.json"),
+                             fetcher=lambda url: None, deadline_s=2)
+    context = retriever.retrieve("drug labeling lawsuit")
+    assert context.count("Same ruling text") == 1
+
+
+def test_researcher_fetches_candidates_in_parallel():
+    from agent.researcher import LegalResearcher
+
+    class Client:
+        def search(self, **params):
+            return {"results": [
+                {"title": "Blog", "url": "https://blog.example.com/law", "content": "snippet"},
+                {"title": "Official", "url": "https://www.ecfr.gov/part-11", "content": "snippet"},
+            ]}
+
+    researcher = LegalResearcher.__new__(LegalResearcher)
+    researcher.client, researcher.deadline_s = Client(), 5
+    researcher.fetcher = lambda url: (time.sleep(0.2), "x" * 600)[1]
+    start = time.perf_counter()
+    result = researcher.find_regulation_text("21 CFR Part 11", "US")
+    assert time.perf_counter() - start < 0.35
+    assert result["title"] == "Official"
@@ -0,0 +1,76 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent.analyst import ComplianceAgent
+from agent.repair import (
+    RepairStats, apply_deterministic_fixes, build_repair_model, merge_repair
+)
+from agent.schemas import ComplianceResponse, ReasoningMapEntry, RiskLevel
+
+QUERY = "A company notified the authority after a breach. What fine applies?"
+
+
+def _response(**overrides):
+    data = dict(
+        summary="Cooperation counts under 83(2)(f) and mitigation under 83(2)(c).",
+        legal_basis="Article 83",
+        scope_limitation="N/A",
+        risk_analysis="Fine exposure.",
+        risk_level=RiskLevel.LOW,
+        confidence_score=0.9,
+        reasoning_map=[ReasoningMapEntry(
+            fact="notified the authority",
+            legal_meaning="cooperation with the supervisory authority",
+            gdpr_subsection="83(2)(f)",
+            justification="Cooperation with the authority is a factor."
+        )]
+    )
+    data.update(overrides)
+    return ComplianceResponse(**data)
+
+
+def test_issues_carry_rules_and_fields():
+    agent = ComplianceAgent.__new__(ComplianceAgent)
+    issues = agent._collect_validation_issues(_response(), QUERY)
+    by_rule = {i.rule: i for i in issues}
+    assert by_rule["0d"].fields == ["reasoning_map"] and by_rule["0d"].mode == "append"
+    assert by_rule["D1"].fix == {"risk_level": "medium"}
+
+
+def test_risk_fix_is_deterministic():
+    agent = ComplianceAgent.__new__(ComplianceAgent)
+    response = _response()
+    remaining = apply_deterministic_fixes(response, agent._collect_validation_issues(response, QUERY))
+    assert response.risk_level == RiskLevel.MEDIUM
+    assert all(i.fix is None for i in remaining)
+
+
+def test_append_merge_keeps_existing_entries():
+    agent = ComplianceAgent.__new__(ComplianceAgent)
+    response = _response()
+    issues = [i for i in agent._collect_validation_issues(response, QUERY) if i.rule == "0d"]
+    Patch = build_repair_model(issues)
+    assert set(Patch.model_fields) == {"reasoning_map"}
+    patch = Patch(reasoning_map=[ReasoningMapEntry(
+        fact="after a breach",
+        legal_meaning="actions to mitigate damage to data subjects",
+        gdpr_subsection="83(2)(c)",
+        justification="Mitigation of harm to data subjects."
+    )])
+    merged = merge_repair(response, patch, issues)
+    assert [e.gdpr_subsection for e in merged.reasoning_map] == ["83(2)(f)", "83(2)(c)"]
+    assert merged.summary == response.summary
+
+
+def test_stats_report_retry_rates_and_savings():
+    stats = RepairStats()
+    agent = ComplianceAgent.__new__(ComplianceAgent)
+    stats.record_validation(agent._collect_validation_issues(_response(), QUERY))
+    stats.record_validation([])
+    stats.record_repair(deterministic=1, used_llm=True, repair_tokens=300, full_regen_tokens=2000, resolved=True)
+    snap = stats.snapshot()
+    assert snap["retry_rate_by_rule"]["D1"] == 0.5
+    assert snap["tokens_saved_estimate"] == 1700
@@ -0,0 +1,94 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent.analyst import ComplianceAgent
+from agent.fines import assess_fine
+from agent.schemas import ComplianceResponse, RiskLevel
+from agent.router import is_penalty_query
+
+
+def _assembled(query):
+    assessment = assess_fine(query)
+    return assessment, ComplianceResponse(
+        summary=assessment.render_summary(),
+        legal_basis=assessment.legal_basis(),
+        scope_limitation="N/A",
+        risk_analysis="Fine exposure.",
+        risk_level=assessment.risk_level(),
+        confidence_score=assessment.confidence,
+        references=assessment.references(),
+        reasoning_map=assessment.reasoning_map()
+    )
+
+
+def test_processor_flip_uses_controller_tier():
+    a = assess_fine("A processor starts using data for its own marketing purposes without instruction. What fine tier applies?")
+    assert a.tier == "83(5)"
+    assert a.role_note and "28(10)" in a.role_note
+
+
+def test_privacy_by_design_is_lower_tier():
+    a = assess_fine("What is the maximum fine if I fail to implement Privacy by Design?")
+    assert a.tier == "83(4)"
+    assert "10 000 000" in a.cap
+
+
+def test_risk_level_follows_tier():
+    assert assess_fine("What is the maximum fine if I fail to implement Privacy by Design?").risk_level() == RiskLevel.MEDIUM
+    assert assess_fine("A processor starts using data for its own marketing purposes without instruction. What fine tier applies?").risk_level() == RiskLevel.HIGH
+
+
+def test_general_penalty_question_takes_retrieval_path():
+    query = "What fines can a supervisory authority impose?"
+    a = assess_fine(query)
+    assert a.tier is None
+    assert not a.is_actionable
+    assert a.risk_level() is None
+    agent = ComplianceAgent.__new__(ComplianceAgent)
+    assert agent._needs_retrieval(query)
+
+
+class _RecordingContext:
+    def __init__(self):
+        self.expanded = []
+
+    def expand_article_by_id(self, aid):
+        self.expanded.append(aid)
+        return f"Article {aid}"
+
+
+def test_fine_context_always_includes_article_83():
+    agent = ComplianceAgent.__new__(ComplianceAgent)
+    agent.context_builder = _RecordingContext()
+    agent._fine_context(assess_fine("What is the maximum fine if I fail to implement Privacy by Design?"))
+    assert agent.context_builder.expanded[0] == "83"
+    assert len(agent.context_builder.expanded) > 1
+
+
+def test_mitigation_factors_follow_semantic_split():
+    a = assess_fine("A company suffered a breach but notified the authority, informed data subjects, and cooperated. What factors would reduce the fine?")
+    letters = {f.factor for f in a.factors}
+    assert {"c", "f"} <= letters
+    assert "h" not in letters
+
+
+def test_deterministic_summary_passes_validation():
+    query = "A company suffered a breach but notified the authority, informed data subjects, and cooperated. What factors would reduce the fine?"
+    _, response = _assembled(query)
+    validator = ComplianceAgent.__new__(ComplianceAgent)
+    assert validator._validate_response(response, query) is None
+
+
+def test_penalty_router_ignores_define():
+    assert is_penalty_query("What fine applies?")
+    assert not is_penalty_query("Define personal data")
+
+
+def test_penalty_router_matches_verb_forms():
+    assert is_penalty_query("Could we be fined for missing the 72-hour breach notification?")
+    assert is_penalty_query("Is the authority fining processors for this?")
+    assert is_penalty_query("Administrative fines for unlawful transfers")
+    assert not is_penalty_query("How do we define financial data?")
@@ -0,0 +1,158 @@
+import os
+import sys
+import shutil
+import tempfile
+import fitz
+import numpy as np
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ingestion.clause_stream import last_diff_seq, pending_diff, read_records
+from ingestion.incremental import reingest
+from retrieval.indexer import ClauseIndexer, clause_items, diff_items, tokenize
+
+PDF_PATH = "data/raw/CELEX_32016R0679_EN_TXT.pdf"
+AMENDED_PAGE = 42  # Article 17 (right to erasure) starts here
+
+
+class HashEncoder:
+    """Deterministic bag-of-words embeddings (no model download)."""
+    def encode(self, texts, convert_to_numpy=True, show_progress_bar=False):
+        out = np.zeros((len(texts), 64), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for tok in tokenize(text):
+                out[row, hash(tok) % 64] += 1.0
+        return out
+
+
+def amend(pdf_path: str, page: int = AMENDED_PAGE,
+          sentence: str = "Amended: erasure requests shall be logged in the quokka register."):
+    """Appends a sentence to one page, as a consolidated-text update would."""
+    with fitz.open(pdf_path) as doc:
+        doc[page].insert_text((72, 800), sentence)
+        doc.save(f"{pdf_path}.new")
+    os.replace(f"{pdf_path}.new", pdf_path)
+
+
+def run(tmp: str, name: str, **kwargs):
+    return reingest(os.path.join(tmp, "source.pdf"), os.path.join(tmp, f"{name}.jsonl"),
+                    os.path.join(tmp, f"{name}.manifest.json"), None, **kwargs)
+
+
+def test_only_changed_pages_are_reparsed():
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copy(PDF_PATH, os.path.join(tmp, "source.pdf"))
+        first = run(tmp, "stream")
+        assert first.full and len(first.diff.added) == 372
+
+        unchanged = run(tmp, "stream")
+        assert unchanged.pages_parsed == 0 and unchanged.diff.is_empty()
+
+        old_records = list(read_records(os.path.join(tmp, "stream.jsonl")))
+        amend(os.path.join(tmp, "source.pdf"))
+        update = run(tmp, "stream")
+        assert not update.full and update.pages_changed == 1
+        assert update.pages_parsed <= 3 and update.articles_reparsed <= 3
+        assert [c.clause.clause_id for c in update.diff.changed] == ["17-1"]
+        assert not update.diff.added and not update.diff.removed
+
+        # The spliced stream is exactly what a full parse of the amended PDF produces
+        reference = run(tmp, "reference", full=True)
+        assert reference.full
+        spliced = list(read_records(os.path.join(tmp, "stream.jsonl")))
+        assert spliced == list(read_records(os.path.join(tmp, "reference.jsonl")))
+        assert sum(a != b for a, b in zip(old_records, spliced)) == 1
+
+
+def test_indexer_applies_only_the_diff():
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copy(PDF_PATH, os.path.join(tmp, "source.pdf"))
+        run(tmp, "stream")
+        indexer = ClauseIndexer.__new__(ClauseIndexer)
+        indexer.model = HashEncoder()
+        indexer.build_stream(clause_items(os.path.join(tmp, "stream.jsonl")))
+
+        amend(os.path.join(tmp, "source.pdf"))
+        diff = run(tmp, "stream").diff
+        assert indexer.apply_changes(diff_items(diff), diff.removed) == 1
+        assert indexer.index.ntotal == len(indexer.metadata) == len(indexer.tokenized_corpus) == 372
+
+        fresh = ClauseIndexer.__new__(ClauseIndexer)
+        fresh.model = HashEncoder()
+        fresh.build_stream(clause_items(os.path.join(tmp, "stream.jsonl")))
+        key = lambda m: m["clause_id"]
+        assert sorted(indexer.metadata, key=key) == sorted(fresh.metadata, key=key)
+        best = int(np.argmax(indexer.bm25.get_scores(tokenize("quokka"))))
+        assert indexer.metadata[best]["clause_id"] == "17-1" and "quokka" in indexer.metadata[best]["text"]
+
+
+
+def test_saved_diff_patches_a_copy_of_the_live_index():
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf, stream, manifest, diff_path = (os.path.join(tmp, name) for name in
+                                            ("source.pdf", "stream.jsonl", "stream.manifest.json", "stream.diff.jsonl"))
+        shutil.copy(PDF_PATH, pdf)
+        reingest(pdf, stream, manifest, diff_path)
+        live = ClauseIndexer.__new__(ClauseIndexer)
+        live.model = HashEncoder()
+        live.build_stream(clause_items(stream))
+        before = list(live.metadata)
+
+        amend(pdf)
+        reingest(pdf, stream, manifest, diff_path)
+        diff = pending_diff(diff_path, after=1)  # entry 1 is the initial full parse
+        patched = live.with_changes(diff_items(diff), diff.removed)
+
+        assert live.metadata == before and live.index.ntotal == len(before)  # still serving the old text
+        assert patched.index.ntotal == len(patched.metadata) == len(before)
+        best = int(np.argmax(patched.bm25.get_scores(tokenize("quokka"))))
+        assert "quokka" in patched.metadata[best]["text"]
+        assert not any("quokka" in m["text"] for m in live.metadata)
+
+
+
+def test_back_to_back_reingests_reach_the_live_index(monkeypatch):
+    import backend.main as backend
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf, stream, manifest, diff_path = (os.path.join(tmp, name) for name in
+                                            ("source.pdf", "stream.jsonl", "stream.manifest.json", "stream.diff.jsonl"))
+        shutil.copy(PDF_PATH, pdf)
+        reingest(pdf, stream, manifest, diff_path)
+        live = ClauseIndexer.__new__(ClauseIndexer)
+        live.model = HashEncoder()
+        live.build_stream(clause_items(stream))
+        monkeypatch.setattr(backend, "GDPR_DIFF_PATH", diff_path)
+        monkeypatch.setattr(backend, "GDPR_INDEXER", live)
+        monkeypatch.setattr(backend, "GDPR_DIFF_SEQ", last_diff_seq(diff_path))
+        monkeypatch.setattr(backend, "GDPR_DIFF_MTIME", os.stat(diff_path).st_mtime_ns)
+
+        # Two runs before the backend looks again, then one that changes nothing
+        amend(pdf)
+        reingest(pdf, stream, manifest, diff_path)
+        amend(pdf, page=AMENDED_PAGE + 40, sentence="Amended: the wombat clause applies.")
+        reingest(pdf, stream, manifest, diff_path)
+        assert reingest(pdf, stream, manifest, diff_path).diff.is_empty()
+        assert last_diff_seq(diff_path) == 3
+
+        backend.refresh_gdpr_indexer()
+        patched = backend.GDPR_INDEXER
+        assert patched is not live and backend.GDPR_DIFF_SEQ == 3
+        texts = {m["clause_id"]: m["text"] for m in patched.metadata}
+        assert any("quokka" in t for t in texts.values()) and any("wombat" in t for t in texts.values())
+
+        fresh = ClauseIndexer.__new__(ClauseIndexer)
+        fresh.model = HashEncoder()
+        fresh.build_stream(clause_items(stream))
+        assert texts == {m["clause_id"]: m["text"] for m in fresh.metadata}
+
+
+if __name__ == "__main__":
+    test_only_changed_pages_are_reparsed()
+    test_indexer_applies_only_the_diff()
+    test_saved_diff_patches_a_copy_of_the_live_index()
+    with pytest.MonkeyPatch.context() as mp:
+        test_back_to_back_reingests_reach_the_live_index(mp)
+    print("✅ incremental ingestion tests passed")
@@ -0,0 +1,55 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent.key_pool import KeyPool, keys_from_env, get_clients
+from agent.scheduler import RateScheduler
+
+MODEL = "llama-3.1-8b-instant"
+
+
+def drain(pool, scheduler, requests):
+    """Sends requests best-key-first with no queueing; returns grants per key."""
+    granted = {k: 0 for k in pool.keys}
+    for _ in range(requests):
+        for key in pool.order(MODEL, 100):
+            if scheduler.acquire("groq", MODEL, key, 100, max_wait_s=0.0):
+                granted[key] += 1
+                break
+    return granted
+
+
+def test_throughput_scales_with_keys(monkeypatch):
+    monkeypatch.setenv("LLM_RPM", "5")
+    monkeypatch.setenv("LLM_TPM", "100000")
+    single = RateScheduler()
+    assert sum(drain(KeyPool("groq", ["k1"], scheduler=single), single, 30).values()) == 5
+
+    pooled = RateScheduler()
+    granted = drain(KeyPool("groq", ["k1", "k2", "k3"], scheduler=pooled), pooled, 30)
+    assert granted == {"k1": 5, "k2": 5, "k3": 5}
+
+
+def test_balances_by_quota_and_error_rate(monkeypatch):
+    monkeypatch.setenv("LLM_TPM", "1000")
+    scheduler = RateScheduler()
+    pool = KeyPool("groq", ["k1", "k2"], scheduler=scheduler)
+
+    scheduler.acquire("groq", MODEL, "k1", 600)
+    assert pool.order(MODEL, 100)[0] == "k2"  # more remaining quota
+
+    for _ in range(3):
+        pool.record("k2", ok=False)
+    assert pool.order(MODEL, 100)[0] == "k1"  # k2 recently erroring
+
+
+def test_keys_from_env_and_client_cache(monkeypatch):
+    monkeypatch.setenv("GROQ_API_KEYS", "gsk_a, gsk_b,,")
+    monkeypatch.setenv("GROQ_API_KEY", "gsk_a")
+    assert keys_from_env("groq") == ["gsk_a", "gsk_b"]
+
+    base, client = get_clients("openrouter", "sk-or-test")
+    assert "openrouter.ai" in str(base.base_url)
+    assert get_clients("openrouter", "sk-or-test")[0] is base
@@ -0,0 +1,36 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ingestion.layout_parser import assemble_articles, parse_gdpr_pdf
+from ingestion.schemas import ClauseType
+
+PDF_PATH = "data/raw/CELEX_32016R0679_EN_TXT.pdf"
+
+
+def test_articles_stitch_across_pages():
+    pages = [
+        ["Preamble text", "Article 5"],
+        ["Principles relating to processing", "1.   Personal data shall be:", "(a) processed lawfully"],
+        ["(b) not kept longer", "Article 6", "Lawfulness", "1.   Processing shall not be lawful unless consent is given."],
+    ]
+    art5, art6 = assemble_articles(pages)
+    assert art5.title == "Principles relating to processing"  # title on the page after the header
+    assert art5.clauses[0].text == "1.   Personal data shall be:\n(a) processed lawfully\n(b) not kept longer"
+    assert art5.clauses[0].clause_type == ClauseType.OBLIGATION
+    assert art6.clauses[0].clause_id == "6-1" and art6.clauses[0].clause_type == ClauseType.PROHIBITION
+
+
+def test_parallel_parse_matches_sequential():
+    sequential = parse_gdpr_pdf(PDF_PATH, workers=1)
+    parallel = parse_gdpr_pdf(PDF_PATH, workers=2)
+    assert sequential.article_count == parallel.article_count == 99
+    assert sequential.articles == parallel.articles
+
+
+if __name__ == "__main__":
+    test_articles_stitch_across_pages()
+    test_parallel_parse_matches_sequential()
+    print("✅ layout parser tests passed")
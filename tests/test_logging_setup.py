@@ -0,0 +1,64 @@
+import os
+import sys
+import json
+import time
+import threading
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent.logging_setup import configure_logging, get_logger, set_request_id
+
+
+def read_records(request_id, expected, timeout_s=5.0):
+    """Polls the rotating file until the background writer has flushed `expected` records."""
+    path = configure_logging().handlers[0].baseFilename
+    deadline = time.time() + timeout_s
+    while time.time() < deadline:
+        with open(path, "r", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if request_id in line]
+        if len(records) >= expected:
+            return records
+        time.sleep(0.05)
+    raise AssertionError(f"only {len(records)} records for {request_id}")
+
+
+def test_records_are_json_with_request_id_and_extras():
+    log = get_logger("test")
+    rid = set_request_id()
+    log.info("llm_attempt", extra={"model": "fake-large", "attempt": 2})
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        log.exception("stage_failed")
+
+    first, second = read_records(rid, 2)
+    assert first["msg"] == "llm_attempt" and first["model"] == "fake-large" and first["attempt"] == 2
+    assert first["logger"] == "compliance.test" and first["level"] == "INFO"
+    assert second["level"] == "ERROR" and "ValueError: boom" in second["exc"]
+
+
+def test_request_ids_stay_with_their_thread():
+    log = get_logger("test")
+
+    def worker(rid):
+        set_request_id(rid)
+        for i in range(20):
+            log.info("tick", extra={"owner": rid, "i": i})
+
+    rids = [f"req-thread-{n}-{time.time_ns()}" for n in range(4)]
+    threads = [threading.Thread(target=worker, args=(rid,)) for rid in rids]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    for rid in rids:
+        records = read_records(rid, 20)
+        assert all(r["request_id"] == r["owner"] == rid for r in records)
+
+
+if __name__ == "__main__":
+    test_records_are_json_with_request_id_and_extras()
+    test_request_ids_stay_with_their_thread()
+    print("✅ logging tests passed")
@@ -0,0 +1,58 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent.metrics import Counter, Histogram, Registry, CACHE_REQUESTS
+from agent.search_cache import SearchCache
+
+
+def test_exposition_format():
+    registry = Registry()
+    decisions = Counter("t_decisions_total", "Decisions.", ["status"], registry=registry)
+    latency = Histogram("t_latency_seconds", "Latency.", ["model"], buckets=[0.1, 1.0], registry=registry)
+
+    decisions.labels("auto_approved").inc()
+    decisions.labels("auto_approved").inc(2)
+    latency.labels("m1").observe(0.05)
+    latency.labels("m1").observe(0.5)
+    latency.labels("m1").observe(5)
+
+    text = registry.render()
+    assert "# TYPE t_decisions_total counter" in text
+    assert 't_decisions_total{status="auto_approved"} 3' in text
+    assert "# TYPE t_latency_seconds histogram" in text
+    # Buckets are cumulative and end with +Inf == count
+    assert 't_latency_seconds_bucket{model="m1",le="0.1"} 1' in text
+    assert 't_latency_seconds_bucket{model="m1",le="1"} 2' in text
+    assert 't_latency_seconds_bucket{model="m1",le="+Inf"} 3' in text
+    assert 't_latency_seconds_count{model="m1"} 3' in text
+    assert 't_latency_seconds_sum{model="m1"} 5.55' in text
+
+
+def test_label_arity_is_checked():
+    counter = Counter("t_arity_total", "Arity.", ["a", "b"], registry=None)
+    try:
+        counter.labels("only-one")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for missing label")
+
+
+def test_search_cache_reports_hits_and_misses():
+    hits, misses = CACHE_REQUESTS.value("search", "hit"), CACHE_REQUESTS.value("search", "miss")
+    cache = SearchCache(path=None)
+    cache.get("k")
+    cache.set("k", {"results": []})
+    cache.get("k")
+    assert CACHE_REQUESTS.value("search", "hit") == hits + 1
+    assert CACHE_REQUESTS.value("search", "miss") == misses + 1
+
+
+if __name__ == "__main__":
+    test_exposition_format()
+    test_label_arity_is_checked()
+    test_search_cache_reports_hits_and_misses()
+    print("✅ metrics tests passed")
@@ -1,63 +1,88 @@
 import sys
 import os
 import json
-import time
-from dotenv import load_dotenv
-import phoenix as px
+import numpy as np
+import pytest
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from agent.analyst import ComplianceAgent
-from retrieval.indexer import ClauseIndexer
+from agent.tracing import init_tracing, estimate_cost, span, NOOP_SPAN
+from retrieval.indexer import ClauseIndexer, tokenize
 
-# Load env variables
-load_dotenv()
 
-def test_trace_generation():
+class HashEncoder:
+    """Deterministic bag-of-words embeddings (no model download)."""
+    def encode(self, texts, convert_to_numpy=True, show_progress_bar=False):
+        out = np.zeros((len(texts), 64), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for tok in tokenize(text):
+                out[row, hash(tok) % 64] += 1.0
+        return out
+
+
+def test_cost_estimate():
+    assert estimate_cost("llama-3.1-8b-instant", 1_000_000, 0) == 0.05
+    assert estimate_cost("unknown-model", 5000, 5000) == 0.0
+
+
+def test_trace_generation(monkeypatch):
     print("🚀 Starting Observability Verification...")
-    
-    # 1. Launch Phoenix (headless mode)
+    # Offline provider: spans must not depend on network access
+    monkeypatch.setenv("LLM_PROVIDER", "fake")
     try:
-        session = px.launch_app()
-        print(f"✅ Phoenix launched at {session.url}")
-    except Exception as e:
-        print(f"⚠️ Phoenix launch warning: {e}")
-
-    # 2. Initialize Agent
-    data_path = "data/processed/gdpr_structured.json"
-    if not os.path.exists(data_path):
-        print("⚠️ Data file not found.")
+        from opentelemetry import trace
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+    except ImportError:
+        print("⚠️ opentelemetry-sdk not installed; skipping span export check.")
+        with span("noop") as s:
+            assert s is NOOP_SPAN or not s.is_recording()
         return
 
+    exporter = InMemorySpanExporter()
+    assert init_tracing(sample_rate=1.0, exporter=exporter)
+
+    data_path = "data/processed/gdpr_structured.json"
     print("📂 Loading GDPR Data...")
     with open(data_path, "r", encoding="utf-8") as f:
         gdpr_doc = json.load(f)
 
     texts, metadata = [], []
-    for article in gdpr_doc['articles'][:3]: 
+    for article in gdpr_doc['articles'][:3]:
         title, art_id = article['title'], article['article_id']
         for clause in article['clauses']:
             texts.append(f"Article {art_id} - {title}: {clause['text']}")
             metadata.append({"article_id": art_id, "clause_id": clause['clause_id'], "text": clause['text']})
-            
-    indexer = ClauseIndexer()
+
+    indexer = ClauseIndexer.__new__(ClauseIndexer)
+    indexer.model = HashEncoder()
+    indexer.index = None
     indexer.build(texts, metadata)
     agent = ComplianceAgent(indexer, data_path)
-    
-    # 3. Simulate Query
-    query = "What is the fine for non-compliance?"
+
+    query = "What are the principles relating to processing of personal data?"
     print(f"❓ sending Query: '{query}'")
-    
-    # This should trigger the @trace decorators
-    response = agent.analyze(query)
-    
-    print("\n✅ Verification SUCCESS: Agent responded.")
-    print(f"Summary: {response.summary[:50]}...")
-    
-    # Wait for trace to flush
-    time.sleep(2)
-    print("✅ Trace flushed (theoretical). Check UI.")
+    agent.analyze(query)
+    trace.get_tracer_provider().force_flush()
+
+    spans = {s.name: s for s in exporter.get_finished_spans()}
+    print(f"✅ Spans exported: {sorted(spans)}")
+    assert {"compliance.analyze", "retrieval.hybrid_search", "llm.attempt", "compliance.validate"} <= set(spans)
+
+    root = spans["compliance.analyze"]
+    assert root.attributes["compliance.domain"] == "GDPR"
+    assert "governance.status" in root.attributes
+
+    attempt = spans["llm.attempt"]
+    assert attempt.parent.span_id == root.context.span_id
+    assert attempt.attributes["llm.model_name"].startswith("fake-")
+    assert attempt.attributes["llm.key_alias"] != "fake-key-1"  # hashed alias, never the key
+    assert attempt.attributes["llm.token_count.total"] > 0
+    assert "llm.cost.usd" in attempt.attributes
+
 
 if __name__ == "__main__":
-    test_trace_generation()
+    test_cost_estimate()
+    with pytest.MonkeyPatch.context() as mp:
+        test_trace_generation(mp)
@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent.scheduler import RateScheduler, parse_retry_after, key_id
+
+
+def test_queues_within_budget_then_sheds(monkeypatch):
+    monkeypatch.setenv("LLM_RPM", "600")  # 10 requests/s refill, burst of 600
+    monkeypatch.setenv("LLM_TPM", "6000")  # 100 tokens/s refill
+    scheduler = RateScheduler(max_wait_s=0.5)
+
+    first = scheduler.acquire("groq", "llama-3.1-8b-instant", "gsk_a", tokens=6000)
+    assert first.queue_wait_s == 0.0
+
+    # Bucket is empty: 20 tokens need ~0.2s of refill -> queued, not shed
+    start = time.perf_counter()
+    queued = scheduler.acquire("groq", "llama-3.1-8b-instant", "gsk_a", tokens=20)
+    assert 0.1 < queued.queue_wait_s <= 0.5
+    assert time.perf_counter() - start >= queued.queue_wait_s - 0.01
+
+    # 1000 tokens would need ~10s -> shed so the caller can fail over
+    assert scheduler.acquire("groq", "llama-3.1-8b-instant", "gsk_a", tokens=1000) is None
+    # Other keys have their own budget
+    assert scheduler.acquire("groq", "llama-3.1-8b-instant", "gsk_b", tokens=1000).queue_wait_s == 0.0
+
+    snap = scheduler.snapshot()
+    assert snap["granted"] == 3 and snap["shed"] == 1
+
+
+def test_settle_refunds_unused_tokens(monkeypatch):
+    monkeypatch.setenv("LLM_TPM", "600")
+    scheduler = RateScheduler(max_wait_s=0.0)
+    ticket = scheduler.acquire("groq", "gemma2-9b-it", "gsk_a", tokens=600)
+    assert scheduler.acquire("groq", "gemma2-9b-it", "gsk_a", tokens=300) is None
+    scheduler.settle(ticket, used_tokens=200)
+    assert scheduler.acquire("groq", "gemma2-9b-it", "gsk_a", tokens=300) is not None
+
+
+def test_reservation_uses_completion_average_and_refunds(monkeypatch):
+    monkeypatch.setenv("LLM_TPM", "6000")
+    scheduler = RateScheduler(max_wait_s=0.0)
+    model = ("groq", "llama-3.1-8b-instant")
+    assert scheduler.completion_estimate(*model, cap=4096) == 512
+    assert scheduler.completion_estimate(*model, cap=256) == 256
+
+    ticket = scheduler.acquire(*model, "gsk_a", tokens=3000 + 512)
+    scheduler.settle(ticket, used_tokens=3100, completion_tokens=100)
+    assert scheduler.completion_estimate(*model, cap=4096) == 100
+    scheduler.settle(ticket, used_tokens=6000, completion_tokens=5000)  # already settled: ignored
+    assert scheduler.completion_estimate(*model, cap=4096) == 100
+
+    # A failed call gives its reservation back, so the next one is not shed
+    failed = scheduler.acquire(*model, "gsk_a", tokens=2800)
+    assert scheduler.acquire(*model, "gsk_a", tokens=2800) is None
+    scheduler.refund(failed)
+    assert scheduler.acquire(*model, "gsk_a", tokens=2800) is not None
+
+
+def test_429_cools_the_slot_down():
+    scheduler = RateScheduler(max_wait_s=1.0)
+    ticket = scheduler.acquire("openrouter", "google/gemini-2.0-flash-001", "sk-or-a", tokens=10)
+    scheduler.penalize(ticket, parse_retry_after("Rate limit reached. Please try again in 7.5s."))
+    assert scheduler.acquire("openrouter", "google/gemini-2.0-flash-001", "sk-or-a", tokens=10) is None
+    assert scheduler.snapshot()["cooling_down"] == [f"openrouter/google/gemini-2.0-flash-001/{key_id('sk-or-a')}"]
+    assert parse_retry_after("try again in 1m30.5s") == 90.5
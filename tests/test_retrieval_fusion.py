@@ -0,0 +1,42 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from retrieval.fusion import reciprocal_rank_fusion, adaptive_cutoff
+
+
+def test_rrf_rewards_agreement():
+    fused = reciprocal_rank_fusion([[1, 2, 3], [3, 1, 4]])
+    assert [idx for idx, _ in fused][:2] == [1, 3]
+
+
+def test_cutoff_stops_at_score_gap_and_keeps_direct_hits():
+    results = [
+        {"article_id": "17", "score": 0.05, "direct": True},
+        {"article_id": "25", "score": 0.032},
+        {"article_id": "5", "score": 0.030},
+        {"article_id": "40", "score": 0.012},
+        {"article_id": "41", "score": 0.011},
+    ]
+    kept = adaptive_cutoff(results, max_k=6)
+    assert [r["article_id"] for r in kept] == ["17", "25", "5"]
+
+
+def test_cutoff_reads_relevance_over_flat_rrf_scores():
+    # RRF scores barely move with rank; the per-list relevance carries the gap
+    results = [
+        {"article_id": "25", "score": 0.0164, "relevance": 1.0},
+        {"article_id": "5", "score": 0.0161, "relevance": 0.9},
+        {"article_id": "40", "score": 0.0159, "relevance": 0.6},
+        {"article_id": "41", "score": 0.0156, "relevance": 0.58},
+    ]
+    assert [r["article_id"] for r in adaptive_cutoff(results, max_k=6)] == ["25", "5"]
+    flat = [{k: v for k, v in r.items() if k != "relevance"} for r in results]
+    assert len(adaptive_cutoff(flat, max_k=6)) == 4
+
+
+def test_unscored_results_fall_back_to_fixed_k():
+    results = [{"article_id": "83"}, {"article_id": "34"}, {"article_id": "1"}]
+    assert adaptive_cutoff(results, max_k=2) == results[:2]
@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent.search_cache import SearchCache, CachedSearchClient, OfflineSearchClient
+
+
+def test_identical_queries_hit_cache(tmp_path):
+    backend = OfflineSearchClient(latency_s=0.05)
+    client = CachedSearchClient(backend, SearchCache(path=str(tmp_path / "cache.sqlite")))
+
+    first = client.search(query="Peanut  allergen recall", search_depth="advanced", max_results=3)
+    start = time.perf_counter()
+    second = client.search(query="peanut allergen recall ", search_depth="advanced", max_results=3)
+    assert time.perf_counter() - start < 0.05
+    assert first == second and backend.calls == 1
+
+    # Different parameters are a different search
+    client.search(query="peanut allergen recall", search_depth="basic", max_results=3)
+    assert backend.calls == 2
+
+
+def test_cache_persists_and_expires(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    CachedSearchClient(OfflineSearchClient(), SearchCache(path=path)).search(query="fda warning letter")
+
+    backend = OfflineSearchClient()
+    CachedSearchClient(backend, SearchCache(path=path)).search(query="fda warning letter")
+    assert backend.calls == 0
+
+    expired = CachedSearchClient(backend, SearchCache(path=path, ttl_s=0))
+    time.sleep(0.01)
+    expired.search(query="fda warning letter")
+    assert backend.calls == 1
+
+
+def test_size_limit_evicts_least_recent(tmp_path):
+    cache = SearchCache(path=str(tmp_path / "cache.sqlite"), max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.set(key, {"results": [key]})
+        time.sleep(0.01)
+
+    reopened = SearchCache(path=cache.path, max_entries=2)
+    assert reopened.get("a") is None
+    assert reopened.get("c") == {"results": ["c"]}
+
+
+def test_reads_do_not_wait_on_sqlite_writes(tmp_path):
+    import threading
+
+    cache = SearchCache(path=str(tmp_path / "cache.sqlite"))
+    cache.set("memory", {"results": ["m"]})
+    cache.set("disk", {"results": ["d"]})
+    cache._memory.pop("disk")
+
+    results = {}
+    # A slow commit holds the writer; memory and SQLite reads still complete
+    with cache._write_lock:
+        reader = threading.Thread(target=lambda: results.update(memory=cache.get("memory"), disk=cache.get("disk")))
+        reader.start()
+        reader.join(timeout=2)
+        assert not reader.is_alive()
+    assert results == {"memory": {"results": ["m"]}, "disk": {"results": ["d"]}}
+    assert cache.stats()["hits"] == 2
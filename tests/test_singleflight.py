@@ -0,0 +1,96 @@
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent.singleflight import SingleFlight, request_key
+
+
+def test_identical_concurrent_requests_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    def analysis():
+        calls.append(1)
+        time.sleep(0.2)
+        return "shared answer"
+
+    key = request_key("What is Article 17?", "GDPR", "Tier 1")
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        outcomes = list(pool.map(lambda _: flight.do(key, analysis), range(10)))
+
+    assert len(calls) == 1
+    assert all(result == "shared answer" for result, _ in outcomes)
+    assert sum(shared for _, shared in outcomes) == 9
+    assert flight.snapshot() == {"requests": 10, "coalesced": 9, "coalesce_ratio": 0.9, "in_flight": 0}
+
+
+def test_errors_propagate_and_keys_are_scoped():
+    flight = SingleFlight()
+
+    def failing():
+        time.sleep(0.1)
+        raise RuntimeError("provider down")
+
+    key = request_key("breach deadline", "GDPR", "Tier 1")
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(flight.do, key, failing) for _ in range(3)]
+    assert all(isinstance(f.exception(), RuntimeError) for f in futures)
+
+    # Finished calls are not cached; tier and domain are part of the key
+    assert flight.do(key, lambda: "ok") == ("ok", False)
+    assert request_key("  Breach   DEADLINE", "GDPR", "Tier 1") == key
+    assert request_key("breach deadline", "GDPR", "Tier 3") != key
+
+
+def test_async_followers_do_not_hold_executor_threads():
+    flight = SingleFlight()
+    calls = []
+
+    def analysis():
+        calls.append(1)
+        time.sleep(0.3)
+        return "shared answer"
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=2))
+        key = request_key("What is Article 17?", "GDPR", "Tier 1")
+        burst = [asyncio.create_task(flight.do_async(key, analysis)) for _ in range(10)]
+        await asyncio.sleep(0.05)
+        # Nine waiting followers must leave the second worker free
+        started = time.perf_counter()
+        await asyncio.to_thread(lambda: None)
+        unrelated_wait = time.perf_counter() - started
+        return await asyncio.gather(*burst), unrelated_wait
+
+    outcomes, unrelated_wait = asyncio.run(main())
+
+    assert unrelated_wait < 0.2
+    assert len(calls) == 1
+    assert all(result == "shared answer" for result, _ in outcomes)
+    assert sum(shared for _, shared in outcomes) == 9
+    assert flight.snapshot()["in_flight"] == 0
+
+
+def test_async_followers_get_the_result_when_the_leader_is_cancelled():
+    flight = SingleFlight()
+
+    def analysis():
+        time.sleep(0.2)
+        return "shared answer"
+
+    async def main():
+        key = request_key("What is Article 17?", "GDPR", "Tier 1")
+        leader = asyncio.create_task(flight.do_async(key, analysis))
+        await asyncio.sleep(0.05)
+        follower = asyncio.create_task(flight.do_async(key, analysis))
+        await asyncio.sleep(0)
+        leader.cancel()  # e.g. the leader's client disconnected
+        return await follower
+
+    assert asyncio.run(main()) == ("shared answer", True)
@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+import threading
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent.timing import StageClock, StageStats, start_timings, record_stage, server_timing
+from evaluation.load_test import parse_server_timing, percentile, summarize
+
+
+def test_stage_clock_records_into_request_scope():
+    timings = start_timings()
+    clock = StageClock()
+    time.sleep(0.02)
+    clock.lap("retrieval")
+    clock.lap("generation")
+    record_stage("queue_wait", 0.5)
+
+    assert timings["retrieval"] >= 0.02
+    assert set(timings) == {"retrieval", "generation", "queue_wait"}
+
+    # Other threads have their own (empty) scope
+    seen = []
+    thread = threading.Thread(target=lambda: (record_stage("retrieval", 1.0), seen.append(start_timings())))
+    thread.start()
+    thread.join()
+    assert timings["retrieval"] < 1.0 and seen == [{}]
+
+    parsed = parse_server_timing(server_timing(timings))
+    assert abs(parsed["queue_wait"] - 0.5) < 1e-3
+
+
+def test_histograms_and_percentiles():
+    stats = StageStats(buckets=[0.1, 1.0])
+    for seconds in (0.05, 0.5, 0.7, 3.0):
+        stats.record("generation", seconds)
+    snap = stats.snapshot()["generation"]
+    assert snap["count"] == 4
+    assert snap["buckets"] == {"le_0.1": 1, "le_1.0": 2, "le_inf": 1}
+
+    latencies = [i / 100 for i in range(1, 101)]
+    assert percentile(latencies, 50) == 0.5 and percentile(latencies, 99) == 0.99
+    assert summarize(latencies)["count"] == 100
@@ -0,0 +1,54 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent.router import classify_query
+from agent.tiers import TierStats, resolve_tier, PROVIDER_TIERS
+
+
+def test_query_classes():
+    assert classify_query("hello") == "general"
+    assert classify_query("What fine applies to a breach?") == "penalty"
+    assert classify_query("What is personal data?") == "definition"
+
+
+def test_explicit_tier_is_honoured():
+    assert resolve_tier("openrouter", "Tier 3", "penalty").models == PROVIDER_TIERS["openrouter"]["Tier 3"].models
+    assert resolve_tier("openrouter", "unknown", "penalty").name == "Tier 1"
+
+
+def test_auto_picks_cheapest_proven_tier():
+    stats = TierStats()
+    # Without evidence (and no exploration) auto falls back to Tier 1
+    assert resolve_tier("groq", "auto", "definition", stats=stats, explore_rate=0).name == "Tier 1"
+    for _ in range(5):
+        stats.record("Tier 3", "definition", 0.2, passed=True)
+        stats.record("Tier 3", "penalty", 0.2, passed=False)
+    assert resolve_tier("groq", "auto", "definition", stats=stats, explore_rate=0).name == "Tier 3"
+    assert resolve_tier("groq", "auto", "penalty", stats=stats, explore_rate=0).name == "Tier 1"
+    assert resolve_tier("groq", "auto", "general", stats=stats).name == "Tier 3"
+    assert stats.snapshot()["Tier 3"]["pass_rate_by_class"] == {"definition": 1.0, "penalty": 0.0}
+
+
+def test_small_talk_is_local_and_word_bounded():
+    from agent.router import is_general_query
+    from agent.smalltalk import SmallTalkResponder, clear_small_talk_cache
+
+    assert is_general_query("hi there")
+    assert not is_general_query("What is this?")
+    assert not is_general_query("help me with Article 17 erasure")
+
+    clear_small_talk_cache()
+    calls = []
+    llm_call = lambda p: calls.append(p) or "Hi!"
+    responder = SmallTalkResponder("GDPR", "99 articles", llm_call=llm_call)
+    assert "99 articles" in SmallTalkResponder("GDPR", "99 articles").respond("what can you do?")
+    responder.respond("hello")
+    responder.respond("hey")
+    # A new responder (one per request in the backend) reuses the process-wide cache
+    assert SmallTalkResponder("GDPR", "99 articles", llm_call=llm_call).respond("hi") == "Hi!"
+    assert len(calls) == 1
+    SmallTalkResponder("FDA", "Tavily", llm_call=llm_call).respond("hi")
+    assert len(calls) == 2
@@ -6,6 +6,7 @@ from dotenv import load_dotenv
 sys.path.append(os.path.abspath("."))
 
 from agent.analyst import ComplianceAgent
+from retrieval.corpus import GDPR_CORPUS_PATH
 from retrieval.indexer import ClauseIndexer
 
 # Load env
@@ -15,7 +16,7 @@ def test_erasure_reasoning():
     print("🚦 Starting Local Reasoning Test...")
     
     # Mock Indexer (or load real one if exists)
-    if os.path.exists("data/processed/gdpr_structured.json"):
+    if os.path.exists("data/processed/gdpr_clauses.jsonl"):
         # sys.path.append("c:/Users/AKHILESHWAR/Scripts_UoS/Projects/Agentic-Compliance-Analyst")
         from backend.main import get_gdpr_indexer
         indexer = get_gdpr_indexer() # Use the one from backend logic
@@ -23,7 +24,7 @@ def test_erasure_reasoning():
         print("❌ Data not found. Cannot run integration test.")
         return
 
-    agent = ComplianceAgent(indexer=indexer, data_path="data/processed/gdpr_structured.json", domain="GDPR")
+    agent = ComplianceAgent(indexer=indexer, data_path=GDPR_CORPUS_PATH, domain="GDPR")
     
     query = "Can I refuse a request to erase all data if I need to keep transaction records for tax purposes?"
     print(f"\n📝 Query: {query}")
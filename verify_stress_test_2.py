@@ -6,6 +6,7 @@ from dotenv import load_dotenv
 sys.path.append(os.path.abspath("."))
 
 from agent.analyst import ComplianceAgent
+from retrieval.corpus import GDPR_CORPUS_PATH
 
 # Load env
 load_dotenv(".env")
@@ -24,7 +25,7 @@ def test_fine_mitigation_reasoning():
     indexer = MockIndexer()
     print("✅ Mock Indexer initialized.")
 
-    agent = ComplianceAgent(indexer=indexer, data_path="data/processed/gdpr_structured.json", domain="GDPR")
+    agent = ComplianceAgent(indexer=indexer, data_path=GDPR_CORPUS_PATH, domain="GDPR")
     
     query = "A company suffered a breach but notified the authority, informed subjects, and cooperated. What factors would reduce the fine?"
     print(f"\n📝 Query: {query}")